@@ -2,28 +2,35 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from email import encoders
-import statistics as stats_module
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import logging
-import smtplib
-import ssl
+import time
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.event import async_track_point_in_time, async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_state_change_event,
+    async_track_time_change,
+)
+from homeassistant.util import slugify
 import homeassistant.util.dt as dt_util
 
-from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.history import state_changes_during_period
-
 from .const import (
     ALARM_PRIORITY_CRITICAL,
     ALARM_PRIORITY_OFF,
@@ -31,13 +38,29 @@ from .const import (
     ALARM_TRIGGER_AND_QUICKLY,
     ALARM_TRIGGER_OFF,
     ALARM_TRIGGER_QUICKLY_ONLY,
+    AGGREGATE_DAY,
+    AGGREGATE_HOUR,
+    ATTR_AGGREGATE,
     ATTR_AMOUNT,
     ATTR_CATEGORY,
+    ATTR_COMPRESS,
+    ATTR_CURSOR,
+    ATTR_DATE,
     ATTR_DESCRIPTION,
+    ATTR_END,
     ATTR_EVENT_ID,
+    ATTR_EVENT_TYPE,
+    ATTR_EVENTS,
+    ATTR_INCLUDE_EVENTS,
+    ATTR_LIMIT,
+    ATTR_MEAL,
+    ATTR_MINUTES_AGO,
     ATTR_NOTE,
+    ATTR_PATH,
     ATTR_SUBJECT_NAME,
+    ATTR_SUBJECTS,
     ATTR_PRODUCT,
+    ATTR_START,
     ATTR_TIMESTAMP,
     CONF_ALARM_CRITICAL_LOW,
     CONF_ALARM_FALLING_MIN_STATUS,
@@ -53,16 +76,22 @@ from .const import (
     CONF_ALARM_VERY_LOW,
     CONF_GLUCOSE_SENSOR,
     CONF_NOTIFY_TARGETS,
+    CONF_SMTP_ATTACHMENT_FORMAT,
     CONF_SMTP_ENABLED,
     CONF_SMTP_ENCRYPTION,
     CONF_SMTP_HOST,
+    CONF_SMTP_MAX_MESSAGE_KB,
     CONF_SMTP_PASSWORD,
     CONF_SMTP_PORT,
     CONF_SMTP_RECIPIENTS,
     CONF_SMTP_SENDER,
     CONF_SMTP_SENDER_NAME,
     CONF_SMTP_USERNAME,
+    CONF_PURGE_ARCHIVED_DAYS,
+    CONF_SAVE_DELAY,
+    CONF_STORAGE_BACKEND,
     CONF_SUBJECT_NAME,
+    CONF_SUMMARIZE_AFTER_YEARS,
     DEFAULT_ALARM_CRITICAL_LOW,
     DEFAULT_ALARM_FALLING_MIN_STATUS,
     DEFAULT_ALARM_FALLING_PRIORITY,
@@ -75,18 +104,30 @@ from .const import (
     DEFAULT_ALARM_RISING_TRIGGERS,
     DEFAULT_ALARM_VERY_HIGH,
     DEFAULT_ALARM_VERY_LOW,
-    DEFAULT_CRITICAL_LOW_THRESHOLD,
-    DEFAULT_HIGH_THRESHOLD,
-    DEFAULT_LOW_THRESHOLD,
+    DEFAULT_ATTACHMENT_FORMAT,
+    DEFAULT_EXPORT_DIR,
     DEFAULT_NOTIFY_TARGETS,
-    DEFAULT_VERY_HIGH_THRESHOLD,
+    DEFAULT_PURGE_ARCHIVED_DAYS,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SMTP_MAX_MESSAGE_KB,
+    DEFAULT_STORAGE_BACKEND,
+    DEFAULT_SUMMARIZE_AFTER_YEARS,
     DOMAIN,
     EVENT_TYPE_FEEDING,
     EVENT_TYPE_INSULIN,
     PLATFORMS,
+    REPORT_MAX_DAYS,
+    REPORT_PERIOD_MONTH,
+    REPORT_PERIOD_WEEK,
+    SERVICE_COMPACT_EVENTS,
     SERVICE_DELETE_EVENT,
+    SERVICE_EXPORT,
+    SERVICE_GENERATE_REPORT,
+    SERVICE_IMPORT_EVENTS,
     SERVICE_LOG_FEEDING,
     SERVICE_LOG_INSULIN,
+    SERVICE_LOG_ROUND,
+    SERVICE_QUERY_EVENTS,
     SERVICE_SEND_DAILY_REPORT,
     STATUS_CRITICAL_LOW,
     STATUS_HIGH,
@@ -95,10 +136,28 @@ from .const import (
     STATUS_NORMAL,
     STATUS_VERY_HIGH,
     STATUS_VERY_LOW,
+    QUERY_DEFAULT_LIMIT,
+    QUERY_MAX_LIMIT,
+    STORAGE_BACKEND_SQLITE,
 )
+from .attachments import build_attachment_batches
 from .coordinator import GlucoFarmerConfigEntry, GlucoFarmerCoordinator
-from .dashboard import async_update_dashboard
-from .store import GlucoFarmerStore
+from .dashboard import async_cancel_dashboard_update, schedule_dashboard_update
+from .export import (
+    READINGS_HEADER,
+    async_export_readings,
+    export_file_name,
+    reading_row,
+    write_events,
+)
+from .importer import ImportValidationError, build_import_records, resolve_config_path
+from .outbox import MailOutbox
+from .query import aggregate, decode_cursor, paginate
+from .report import async_build_daily_report, render_daily_report
+from .retention import CompactionStats, YearlySummaries, async_compact_events
+from .rollups import build_period_report, get_daily_rollups, period_bounds
+from .store import MAX_TIMESTAMP, EventRecord, GlucoFarmerStore, StoreChange
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -128,12 +187,64 @@ SERVICE_DELETE_EVENT_SCHEMA = vol.Schema(
     }
 )
 
-# Maximum weight (minutes) for the last valid reading before a data gap.
-# Mirrors coordinator._GAP_CAP_MINUTES -- one Dexcom transmission cycle.
-_GAP_CAP_MINUTES = 5.0
+SERVICE_IMPORT_EVENTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_EVENTS, "source"): vol.All(cv.ensure_list, [dict]),
+            vol.Exclusive(ATTR_PATH, "source"): cv.string,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_EVENTS, ATTR_PATH),
+)
+
+SERVICE_LOG_ROUND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_EVENT_TYPE): vol.In([EVENT_TYPE_FEEDING, EVENT_TYPE_INSULIN]),
+        vol.Optional(ATTR_SUBJECTS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MEAL): cv.string,
+        vol.Optional(ATTR_AMOUNT): vol.Coerce(float),
+        vol.Optional(ATTR_CATEGORY): cv.string,
+        vol.Optional(ATTR_PRODUCT): cv.string,
+        vol.Optional(ATTR_MINUTES_AGO, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+SERVICE_QUERY_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SUBJECTS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_EVENT_TYPE): vol.In([EVENT_TYPE_FEEDING, EVENT_TYPE_INSULIN]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_CATEGORY): cv.string,
+        vol.Optional(ATTR_PRODUCT): cv.string,
+        vol.Optional(ATTR_CURSOR): cv.string,
+        vol.Optional(ATTR_LIMIT, default=QUERY_DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=QUERY_MAX_LIMIT)
+        ),
+        vol.Optional(ATTR_AGGREGATE): vol.In([AGGREGATE_HOUR, AGGREGATE_DAY]),
+    }
+)
+
+SERVICE_GENERATE_REPORT_SCHEMA = vol.Schema(
+    {
+        vol.Exclusive(ATTR_DATE, "report_range"): cv.date,
+        vol.Exclusive(ATTR_START, "report_range"): cv.date,
+        vol.Optional(ATTR_END): cv.date,
+        vol.Optional(ATTR_SUBJECTS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+SERVICE_EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Optional(ATTR_SUBJECTS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_PATH, default=DEFAULT_EXPORT_DIR): cv.string,
+        vol.Optional(ATTR_INCLUDE_EVENTS, default=True): cv.boolean,
+        vol.Optional(ATTR_COMPRESS, default=False): cv.boolean,
+    }
+)
 
-# Alarm tracking per subject
-_alarm_state: dict[str, dict[str, bool]] = {}
 # High glucose delay tracking
 _high_glucose_since: dict[str, datetime | None] = {}
 HIGH_GLUCOSE_DELAY = timedelta(minutes=5)
@@ -142,6 +253,7 @@ HIGH_GLUCOSE_DELAY = timedelta(minutes=5)
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the GlucoFarmer integration."""
     hass.data.setdefault(DOMAIN, {})
+    async_register_websocket_commands(hass)
     return True
 
 
@@ -151,11 +263,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: GlucoFarmerConfigEntry)
 
     # Initialize shared store (one per HA instance)
     if "store" not in hass.data[DOMAIN]:
-        store = GlucoFarmerStore(hass)
+        store = GlucoFarmerStore(
+            hass, _get_storage_backend(hass), _get_save_delay(hass)
+        )
         await store.async_load()
         hass.data[DOMAIN]["store"] = store
+
+        outbox = MailOutbox(hass, lambda: _get_smtp_config(hass))
+        await outbox.async_load()
+        hass.data[DOMAIN]["outbox"] = outbox
+
+        @callback
+        def _invalidate_report_cache(change: StoreChange) -> None:
+            """Drop the cached report when events of its day change."""
+            cache = hass.data[DOMAIN].get("report_cache")
+            if cache is not None and cache[0] in change.dates:
+                hass.data[DOMAIN].pop("report_cache")
+
+        store.async_subscribe(_invalidate_report_cache)
+        get_daily_rollups(hass).async_track_store(store)
     else:
         store = hass.data[DOMAIN]["store"]
+    await store.async_load_subject(entry.data[CONF_SUBJECT_NAME])
 
     # Create coordinator and load persisted thresholds before first data refresh
     # so zone stats are computed with the correct thresholds from the start.
@@ -163,16 +292,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: GlucoFarmerConfigEntry)
     await coordinator.async_load_thresholds()
     await coordinator.async_config_entry_first_refresh()
     entry.runtime_data = coordinator
+    entry.async_on_unload(store.async_subscribe(coordinator.async_handle_store_change))
 
     # Listen for Dexcom sensor state changes for immediate refresh
     @callback
-    def _handle_dexcom_update(_event: Any) -> None:
+    def _handle_dexcom_update(event: Any) -> None:
+        if (new_state := event.data.get("new_state")) is not None:
+            coordinator.async_add_glucose_state(new_state)
         hass.async_create_task(coordinator.async_request_refresh())
 
     unsub_dexcom = async_track_state_change_event(
         hass, [coordinator.glucose_sensor_id], _handle_dexcom_update
     )
     entry.async_on_unload(unsub_dexcom)
+    await coordinator.async_seed_from_recorder()
 
     # Register services (once)
     if not hass.services.has_service(DOMAIN, SERVICE_LOG_INSULIN):
@@ -180,14 +313,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: GlucoFarmerConfigEntry)
 
     # Set up alarm monitoring
     subject_name = entry.data[CONF_SUBJECT_NAME]
-    _alarm_state.setdefault(subject_name, {
-        "low_notified": False,
-        "critical_low_notified": False,
-        "high_notified": False,
-        "no_data_notified": False,
-        "falling_notified": False,
-        "rising_notified": False,
-    })
     _high_glucose_since.setdefault(subject_name, None)
 
     unsub = coordinator.async_add_listener(
@@ -200,10 +325,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: GlucoFarmerConfigEntry)
         hass.data[DOMAIN]["last_report_date"] = ""
         _schedule_daily_report(hass)
 
+    # Nightly event retention (once per DOMAIN, 03:30)
+    if "compaction_unsub" not in hass.data[DOMAIN]:
+
+        @callback
+        def _run_compaction(_now: datetime) -> None:
+            hass.async_create_task(_async_run_compaction(hass))
+
+        hass.data[DOMAIN]["compaction_unsub"] = async_track_time_change(
+            hass, _run_compaction, hour=3, minute=30, second=0
+        )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Auto-generate/update dashboard
-    await async_update_dashboard(hass)
+    # Auto-generate/update dashboard (deferred until HA has started, then debounced)
+    schedule_dashboard_update(hass)
 
     # Regenerate dashboard when options change (e.g. new presets)
     entry.async_on_unload(
@@ -223,25 +359,35 @@ async def _async_options_updated(
 async def async_unload_entry(hass: HomeAssistant, entry: GlucoFarmerConfigEntry) -> bool:
     """Unload a config entry."""
     subject_name = entry.data[CONF_SUBJECT_NAME]
-    _alarm_state.pop(subject_name, None)
     _high_glucose_since.pop(subject_name, None)
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok and "store" in hass.data.get(DOMAIN, {}):
+        await hass.data[DOMAIN]["store"].async_release_subject(subject_name)
 
-    # Clean up shared data if no more entries
+    # Clean up shared data if no more entries (disabled ones are never set up)
     remaining = [
         e
         for e in hass.config_entries.async_entries(DOMAIN)
-        if e.entry_id != entry.entry_id
+        if e.entry_id != entry.entry_id and e.disabled_by is None
     ]
     if not remaining:
+        async_cancel_dashboard_update(hass)
         if "daily_report_unsub" in hass.data[DOMAIN]:
             hass.data[DOMAIN]["daily_report_unsub"]()
+        if "compaction_unsub" in hass.data[DOMAIN]:
+            hass.data[DOMAIN]["compaction_unsub"]()
+        if "outbox" in hass.data[DOMAIN]:
+            await hass.data[DOMAIN]["outbox"].async_close()
+        if "entity_index" in hass.data[DOMAIN]:
+            hass.data[DOMAIN]["entity_index"].async_close()
+        if "store" in hass.data[DOMAIN]:
+            await hass.data[DOMAIN]["store"].async_close()
         hass.data.pop(DOMAIN, None)
 
     # Update dashboard to remove the unloaded subject
     if remaining:
-        await async_update_dashboard(hass)
+        schedule_dashboard_update(hass)
 
     return unload_ok
 
@@ -261,8 +407,6 @@ def _register_services(hass: HomeAssistant) -> None:
             note=call.data.get(ATTR_NOTE),
         )
         _LOGGER.info("Logged insulin event %s", event_id)
-        # Refresh coordinators to update daily totals
-        await _refresh_coordinator_for_subject(hass, call.data[ATTR_SUBJECT_NAME])
 
     async def handle_log_feeding(call: ServiceCall) -> None:
         """Handle log_feeding service call."""
@@ -275,7 +419,6 @@ def _register_services(hass: HomeAssistant) -> None:
             timestamp=call.data.get(ATTR_TIMESTAMP),
         )
         _LOGGER.info("Logged feeding event %s", event_id)
-        await _refresh_coordinator_for_subject(hass, call.data[ATTR_SUBJECT_NAME])
 
     async def handle_delete_event(call: ServiceCall) -> None:
         """Handle delete_event service call."""
@@ -283,10 +426,6 @@ def _register_services(hass: HomeAssistant) -> None:
         deleted = await store.async_delete_event(call.data[ATTR_EVENT_ID])
         if deleted:
             _LOGGER.info("Deleted event %s", call.data[ATTR_EVENT_ID])
-            # Refresh all coordinators
-            for entry in hass.config_entries.async_entries(DOMAIN):
-                if hasattr(entry, "runtime_data") and entry.runtime_data:
-                    await entry.runtime_data.async_request_refresh()
         else:
             _LOGGER.warning("Event %s not found", call.data[ATTR_EVENT_ID])
 
@@ -300,6 +439,245 @@ def _register_services(hass: HomeAssistant) -> None:
         DOMAIN, SERVICE_DELETE_EVENT, handle_delete_event, schema=SERVICE_DELETE_EVENT_SCHEMA
     )
 
+    async def handle_import_events(call: ServiceCall) -> ServiceResponse:
+        """Import a batch of events (list or CSV under /config) with one save."""
+        store: GlucoFarmerStore = hass.data[DOMAIN]["store"]
+        known_subjects = {
+            entry.data[CONF_SUBJECT_NAME]
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.data.get(CONF_SUBJECT_NAME)
+        }
+        try:
+            records = await hass.async_add_executor_job(
+                build_import_records,
+                hass.config.config_dir,
+                call.data.get(ATTR_EVENTS),
+                call.data.get(ATTR_PATH),
+                known_subjects,
+            )
+        except ImportValidationError as err:
+            raise ServiceValidationError(f"Import rejected: {err}") from err
+        except OSError as err:
+            raise ServiceValidationError(f"Cannot read import file: {err}") from err
+
+        await store.async_add_events(records)
+        subjects = sorted({r.subject_name for r in records})
+        _LOGGER.info("Imported %d events for %s", len(records), ", ".join(subjects))
+        return {"imported": len(records), "subjects": subjects}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_EVENTS,
+        handle_import_events,
+        schema=SERVICE_IMPORT_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_log_round(call: ServiceCall) -> ServiceResponse:
+        """Log one feeding or insulin round for many subjects with one save.
+
+        Feeding BE per subject comes from the meal definition (fixed or per kg,
+        as in the meal select) unless a fixed amount is given. Subjects without
+        the requested meal are skipped.
+        """
+        store: GlucoFarmerStore = hass.data[DOMAIN]["store"]
+        event_type = call.data[ATTR_EVENT_TYPE]
+        meal = call.data.get(ATTR_MEAL)
+        amount = call.data.get(ATTR_AMOUNT)
+        product = call.data.get(ATTR_PRODUCT)
+        if event_type == EVENT_TYPE_FEEDING and meal is None and amount is None:
+            raise ServiceValidationError("A feeding round needs a meal or an amount")
+        if event_type == EVENT_TYPE_INSULIN and (amount is None or not product):
+            raise ServiceValidationError("An insulin round needs an amount and a product")
+
+        wanted = set(call.data.get(ATTR_SUBJECTS, []))
+        timestamp = (
+            datetime.now() - timedelta(minutes=call.data[ATTR_MINUTES_AGO])
+        ).isoformat()
+        category = call.data.get(ATTR_CATEGORY) or meal or "other"
+
+        records: list[EventRecord] = []
+        skipped: list[str] = []
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            coordinator: GlucoFarmerCoordinator | None = getattr(entry, "runtime_data", None)
+            if coordinator is None:
+                continue
+            subject_name = coordinator.subject_name
+            if wanted and subject_name not in wanted:
+                continue
+            if event_type == EVENT_TYPE_FEEDING:
+                be = amount if amount is not None else coordinator.compute_meal_be(meal)
+                if not be:
+                    skipped.append(subject_name)
+                    continue
+                records.append(EventRecord.create(
+                    EVENT_TYPE_FEEDING, subject_name, be, timestamp, category=category,
+                ))
+            else:
+                records.append(EventRecord.create(
+                    EVENT_TYPE_INSULIN, subject_name, amount, timestamp, product=product,
+                ))
+
+        await store.async_add_events(records)
+        _LOGGER.info(
+            "Logged %s round for %d subjects (%d skipped)",
+            event_type, len(records), len(skipped),
+        )
+        return {
+            "logged": {r.subject_name: r.amount for r in records},
+            "skipped": skipped,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LOG_ROUND,
+        handle_log_round,
+        schema=SERVICE_LOG_ROUND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_query_events(call: ServiceCall) -> ServiceResponse:
+        """Return filtered events one page at a time, or aggregated per hour/day.
+
+        Filtering runs against the store's per-subject timestamp index (or the
+        SQLite backend for older ranges). A page starts at the cursor and
+        reads one event more than the limit, so callers never pull the full
+        list.
+        """
+        store: GlucoFarmerStore = hass.data[DOMAIN]["store"]
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        filters = (
+            call.data.get(ATTR_SUBJECTS),
+            _to_store_timestamp(start) if start is not None else "",
+            _to_store_timestamp(end) if end is not None else MAX_TIMESTAMP,
+            call.data.get(ATTR_EVENT_TYPE),
+            call.data.get(ATTR_CATEGORY),
+            call.data.get(ATTR_PRODUCT),
+        )
+
+        if ATTR_AGGREGATE in call.data:
+            events = await store.async_query_events(*filters)
+            return {"buckets": aggregate(events, call.data[ATTR_AGGREGATE])}
+
+        after = None
+        if ATTR_CURSOR in call.data:
+            after = decode_cursor(call.data[ATTR_CURSOR])
+            if after is None:
+                raise ServiceValidationError("Invalid cursor")
+        limit = call.data[ATTR_LIMIT]
+        events = await store.async_query_events(*filters, after=after, limit=limit + 1)
+        page, next_cursor = paginate(events, limit)
+        return {
+            "events": [e.to_dict() for e in page],
+            "next_cursor": next_cursor,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_EVENTS,
+        handle_query_events,
+        schema=SERVICE_QUERY_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def handle_compact_events(_call: ServiceCall) -> ServiceResponse:
+        """Run event retention now and return its stats."""
+        stats = await _async_run_compaction(hass)
+        return stats.as_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPACT_EVENTS,
+        handle_compact_events,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_generate_report(call: ServiceCall) -> ServiceResponse:
+        """Regenerate daily reports for past days without sending them."""
+        yesterday = dt_util.now().date() - timedelta(days=1)
+        if ATTR_DATE in call.data:
+            first = last = call.data[ATTR_DATE]
+        else:
+            last = call.data.get(ATTR_END, yesterday)
+            first = call.data.get(ATTR_START, last)
+        if last > yesterday:
+            raise ServiceValidationError("Reports can only be generated for finished days")
+        if first > last:
+            raise ServiceValidationError("start must not be after end")
+        if (last - first).days >= REPORT_MAX_DAYS:
+            raise ServiceValidationError(
+                f"At most {REPORT_MAX_DAYS} days can be generated per call"
+            )
+        subjects = call.data.get(ATTR_SUBJECTS)
+        return {
+            "days": await _async_generate_reports(
+                hass, first, last, set(subjects) if subjects else None
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GENERATE_REPORT,
+        handle_generate_report,
+        schema=SERVICE_GENERATE_REPORT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def handle_export(call: ServiceCall) -> ServiceResponse:
+        """Export readings (per subject) and events of a date range to CSV files.
+
+        Readings are streamed from the recorder one day at a time and written
+        as they are read, so long ranges never sit in memory.
+        """
+        first, last = call.data[ATTR_START], call.data[ATTR_END]
+        if first > last:
+            raise ServiceValidationError("start must not be after end")
+        compress = call.data[ATTR_COMPRESS]
+        try:
+            directory = resolve_config_path(hass.config.config_dir, call.data[ATTR_PATH])
+        except ImportValidationError as err:
+            raise ServiceValidationError(f"Export rejected: {err}") from err
+
+        entries = [
+            entry for entry in hass.config_entries.async_entries(DOMAIN)
+            if ATTR_SUBJECTS not in call.data
+            or entry.data.get(CONF_SUBJECT_NAME) in call.data[ATTR_SUBJECTS]
+        ]
+        files: list[dict[str, Any]] = []
+        try:
+            for entry in entries:
+                subject_name = entry.data[CONF_SUBJECT_NAME]
+                path = directory / export_file_name(subject_name, first, last, compress)
+                rows = await async_export_readings(
+                    hass, path, entry.data[CONF_GLUCOSE_SENSOR], first, last, compress
+                )
+                files.append({"path": str(path), "subject": subject_name, "rows": rows})
+
+            if call.data[ATTR_INCLUDE_EVENTS]:
+                store: GlucoFarmerStore = hass.data[DOMAIN]["store"]
+                events = await store.async_query_events(
+                    [entry.data[CONF_SUBJECT_NAME] for entry in entries],
+                    first.isoformat(),
+                    (last + timedelta(days=1)).isoformat(),
+                )
+                path = directory / export_file_name("events", first, last, compress)
+                rows = await hass.async_add_executor_job(write_events, path, events, compress)
+                files.append({"path": str(path), "subject": None, "rows": rows})
+        except OSError as err:
+            raise ServiceValidationError(f"Cannot write export file: {err}") from err
+
+        _LOGGER.info("Exported %s to %s", first.isoformat(), directory)
+        return {"files": files}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        handle_export,
+        schema=SERVICE_EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
     async def handle_send_daily_report(_call: ServiceCall) -> None:
         """Manually trigger the daily report (for testing)."""
         domain_data = hass.data.get(DOMAIN, {})
@@ -311,15 +689,11 @@ def _register_services(hass: HomeAssistant) -> None:
     )
 
 
-async def _refresh_coordinator_for_subject(hass: HomeAssistant, subject_name: str) -> None:
-    """Refresh the coordinator for a specific subject."""
-    for entry in hass.config_entries.async_entries(DOMAIN):
-        if (
-            entry.data.get(CONF_SUBJECT_NAME) == subject_name
-            and hasattr(entry, "runtime_data")
-            and entry.runtime_data
-        ):
-            await entry.runtime_data.async_request_refresh()
+def _to_store_timestamp(value: datetime) -> str:
+    """Convert a service datetime to the store's naive local ISO form."""
+    if value.tzinfo is not None:
+        value = dt_util.as_local(value).replace(tzinfo=None)
+    return value.isoformat()
 
 
 _FALLING_TRENDS = {"falling_slightly", "falling", "falling_quickly"}
@@ -375,9 +749,7 @@ def _check_alarms(hass: HomeAssistant, coordinator: GlucoFarmerCoordinator) -> N
     subject_name = coordinator.subject_name
     status = coordinator.data.glucose_status
     glucose = coordinator.data.glucose_value
-    state = _alarm_state.get(subject_name)
-    if state is None:
-        return
+    state = coordinator.alarm_state
 
     opts = coordinator.config_entry.options
     now = datetime.now()
@@ -558,6 +930,61 @@ async def _send_notification(
             _LOGGER.debug("Notify service 'notify.%s' not available", service)
 
 
+def _get_storage_backend(hass: HomeAssistant) -> str:
+    """Return the event storage backend (global setting, like SMTP).
+
+    SQLite is used as soon as any subject entry selects it; otherwise the
+    default JSON store. Only read when the shared store is created, so a
+    change takes effect after a restart.
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.options.get(CONF_STORAGE_BACKEND) == STORAGE_BACKEND_SQLITE:
+            return STORAGE_BACKEND_SQLITE
+    return DEFAULT_STORAGE_BACKEND
+
+
+def _get_save_delay(hass: HomeAssistant) -> int:
+    """Return the write-behind delay for event saves (global, first entry wins)."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if CONF_SAVE_DELAY in entry.options:
+            return entry.options[CONF_SAVE_DELAY]
+    return DEFAULT_SAVE_DELAY
+
+
+def _get_retention(hass: HomeAssistant) -> tuple[int, int]:
+    """Return (purge archived after days, summarize after years), first entry wins."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if CONF_PURGE_ARCHIVED_DAYS in entry.options:
+            return (
+                entry.options[CONF_PURGE_ARCHIVED_DAYS],
+                entry.options.get(CONF_SUMMARIZE_AFTER_YEARS, DEFAULT_SUMMARIZE_AFTER_YEARS),
+            )
+    return DEFAULT_PURGE_ARCHIVED_DAYS, DEFAULT_SUMMARIZE_AFTER_YEARS
+
+
+async def _async_run_compaction(hass: HomeAssistant) -> CompactionStats:
+    """Apply the retention policy; keeps the last stats in hass.data."""
+    domain_data = hass.data[DOMAIN]
+    purge_days, summarize_years = _get_retention(hass)
+    now = datetime.now()
+    purge_before = (
+        (now - timedelta(days=purge_days)).isoformat() if purge_days else None
+    )
+    # Whole calendar years that ended at least M years ago (M=1 in 2026 rolls
+    # up 2024 and earlier), so each yearly summary is written once
+    summarize_before = (
+        f"{now.year - summarize_years:04d}-01-01" if summarize_years else None
+    )
+    if "summaries" not in domain_data:
+        domain_data["summaries"] = YearlySummaries(hass)
+    stats = await async_compact_events(
+        hass, domain_data["store"], domain_data["summaries"],
+        purge_before, summarize_before,
+    )
+    domain_data["compaction_stats"] = stats
+    return stats
+
+
 def _get_smtp_config(hass: HomeAssistant) -> dict | None:
     """Return SMTP config from the first entry that has smtp_enabled=True.
 
@@ -584,6 +1011,12 @@ def _get_smtp_config(hass: HomeAssistant) -> dict | None:
             "username": opts.get(CONF_SMTP_USERNAME, ""),
             "password": opts.get(CONF_SMTP_PASSWORD, ""),
             "recipients": recipients,
+            "attachment_format": opts.get(
+                CONF_SMTP_ATTACHMENT_FORMAT, DEFAULT_ATTACHMENT_FORMAT
+            ),
+            "max_message_kb": int(
+                opts.get(CONF_SMTP_MAX_MESSAGE_KB, DEFAULT_SMTP_MAX_MESSAGE_KB)
+            ),
         }
     return None
 
@@ -592,83 +1025,79 @@ def _build_csv(readings: list[tuple[datetime, float]]) -> str:
     """Build a semicolon-separated CSV string from glucose readings.
 
     Returns a plain UTF-8 string. Caller should encode with utf-8-sig
-    (adds BOM) for Excel compatibility.
-    Two timestamp columns:
-    - Timestamp: ISO 8601 with timezone offset (for automated processing)
-    - Datum_Uhrzeit: German date format without offset (for Excel)
+    (adds BOM) for Excel compatibility. Columns as in export.reading_row.
     """
-    lines = ["Timestamp;Datum_Uhrzeit;Glukose_mgdL"]
+    lines = [";".join(READINGS_HEADER)]
     for ts, value in sorted(readings, key=lambda x: x[0]):
-        local_ts = dt_util.as_local(ts)
-        iso_ts = local_ts.isoformat(timespec="seconds")
-        de_ts = local_ts.strftime("%d.%m.%Y %H:%M:%S")
-        lines.append(f"{iso_ts};{de_ts};{int(round(value))}")
+        lines.append(";".join(reading_row(ts, value)))
     return "\n".join(lines)
 
 
-async def _send_daily_report_email(
+async def _send_report_email(
     hass: HomeAssistant,
     smtp_config: dict,
     subject_line: str,
     body: str,
     attachments: list[tuple[str, str]],
 ) -> None:
-    """Send daily report email with CSV file attachments via smtplib.
+    """Queue a report email with CSV file attachments in the outbox.
 
-    Runs the blocking SMTP call in an executor thread so the HA event loop
-    is not blocked. Errors are logged but do not propagate -- the persistent
-    notification is always created regardless of email success.
+    The messages are rendered in an executor thread; the outbox persists
+    them and sends them with retries (see outbox.py). Errors are logged but
+    do not propagate -- the persistent notification is always created
+    regardless of email success.
+
+    Attachments are encoded, optionally compressed (one zip or gzip per
+    subject) and split across several emails when the report exceeds the
+    configured maximum message size.
 
     Args:
         attachments: List of (filename, csv_content_str) tuples.
                      Content is encoded as UTF-8 with BOM for Excel.
     """
-    def _do_send() -> None:
-        msg = MIMEMultipart()
-        msg["From"] = f"{smtp_config['sender_name']} <{smtp_config['sender']}>"
-        msg["To"] = ", ".join(smtp_config["recipients"])
-        msg["Subject"] = subject_line
-        msg.attach(MIMEText(body, "plain", "utf-8"))
-
-        for filename, csv_content in attachments:
-            part = MIMEBase("application", "octet-stream")
-            part.set_payload(csv_content.encode("utf-8-sig"))
-            encoders.encode_base64(part)
-            part.add_header(
-                "Content-Disposition",
-                "attachment",
-                filename=filename,
-            )
-            msg.attach(part)
-
-        host = smtp_config["host"]
-        port = smtp_config["port"]
-        if smtp_config["encryption"] == "tls":
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(host, port, context=context) as server:
-                server.login(smtp_config["username"], smtp_config["password"])
-                server.sendmail(
-                    smtp_config["sender"],
-                    smtp_config["recipients"],
-                    msg.as_string(),
-                )
-        else:  # starttls
-            with smtplib.SMTP(host, port) as server:
-                server.starttls()
-                server.login(smtp_config["username"], smtp_config["password"])
-                server.sendmail(
-                    smtp_config["sender"],
-                    smtp_config["recipients"],
-                    msg.as_string(),
+    def _render() -> list[str]:
+        batches = build_attachment_batches(
+            attachments,
+            smtp_config["attachment_format"],
+            smtp_config["max_message_kb"] * 1024,
+            body,
+            f"{slugify(subject_line)}.zip",
+        )
+        messages = []
+        for number, batch in enumerate(batches, start=1):
+            msg = MIMEMultipart()
+            msg["From"] = f"{smtp_config['sender_name']} <{smtp_config['sender']}>"
+            msg["To"] = ", ".join(smtp_config["recipients"])
+            if len(batches) == 1:
+                msg["Subject"] = subject_line
+                msg.attach(MIMEText(body, "plain", "utf-8"))
+            else:
+                msg["Subject"] = f"{subject_line} ({number}/{len(batches)})"
+                msg.attach(MIMEText(
+                    body if number == 1 else f"Attachments, part {number} of {len(batches)}",
+                    "plain", "utf-8",
+                ))
+
+            for filename, payload in batch:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(payload)
+                encoders.encode_base64(part)
+                part.add_header(
+                    "Content-Disposition",
+                    "attachment",
+                    filename=filename,
                 )
+                msg.attach(part)
+            messages.append(msg.as_string())
+        return messages
 
     try:
-        await hass.async_add_executor_job(_do_send)
-        _LOGGER.info(
-            "Daily report email sent to %s", smtp_config["recipients"]
+        messages = await hass.async_add_executor_job(_render)
+        await hass.data[DOMAIN]["outbox"].async_enqueue(
+            subject_line, smtp_config["sender"], smtp_config["recipients"], messages
         )
     except Exception as err:
-        _LOGGER.error("Failed to send daily report email: %s", err)
+        _LOGGER.error("Failed to queue report email: %s", err)
 
 
 @callback
@@ -681,7 +1110,7 @@ def _schedule_daily_report(hass: HomeAssistant) -> None:
 
     @callback
     def _fire(_now: Any) -> None:
-        hass.async_create_task(_send_daily_report(hass))
+        hass.async_create_task(_async_run_scheduled_reports(hass))
         _schedule_daily_report(hass)
 
     if "daily_report_unsub" in hass.data.get(DOMAIN, {}):
@@ -693,12 +1122,142 @@ def _schedule_daily_report(hass: HomeAssistant) -> None:
     _LOGGER.debug("Daily report scheduled for %s", next_run.isoformat())
 
 
+async def _async_run_scheduled_reports(hass: HomeAssistant) -> None:
+    """Send the daily report, then the weekly (Mondays) and monthly (1st) ones.
+
+    The summaries are built from the daily rollups, so they run after the
+    daily report has stored yesterday's.
+    """
+    await _send_daily_report(hass)
+    today = dt_util.now().date()
+    if today.weekday() == 0:
+        await _send_period_report(hass, REPORT_PERIOD_WEEK)
+    if today.day == 1:
+        await _send_period_report(hass, REPORT_PERIOD_MONTH)
+
+
+async def _async_deliver_report(
+    hass: HomeAssistant,
+    title: str,
+    text: str,
+    notification_id: str,
+    attachments: list[tuple[str, str]],
+) -> None:
+    """Send a report via notify, persistent notification and SMTP (if set up)."""
+    # Send via email notify service
+    try:
+        await hass.services.async_call(
+            "notify",
+            "notify",
+            {
+                "title": title,
+                "message": text,
+            },
+        )
+        _LOGGER.info("%s sent successfully", title)
+    except Exception:
+        _LOGGER.debug("Could not send %s via notify service", title)
+
+    # Also create persistent notification (unique per report so old ones are preserved)
+    await hass.services.async_call(
+        "persistent_notification",
+        "create",
+        {
+            "message": text,
+            "title": title,
+            "notification_id": notification_id,
+        },
+    )
+
+    # Send email with CSV attachments
+    smtp_config = _get_smtp_config(hass)
+    if smtp_config:
+        await _send_report_email(hass, smtp_config, title, text, attachments)
+
+
+async def _send_period_report(hass: HomeAssistant, period: str) -> None:
+    """Send the weekly or monthly summary for the last full period."""
+    domain_data = hass.data.get(DOMAIN)
+    if domain_data is None:
+        return
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if not entries:
+        return
+
+    started = time.monotonic()
+    start, end = period_bounds(period, dt_util.now().date())
+    rollups = await get_daily_rollups(hass).async_load()
+    report_text, csv_text = build_period_report(
+        period, start, end,
+        [entry.data.get(CONF_SUBJECT_NAME, "Unknown") for entry in entries],
+        rollups,
+    )
+    label = "weekly" if period == REPORT_PERIOD_WEEK else "monthly"
+    _LOGGER.info(
+        "GlucoFarmer %s report for %s built in %.1f ms",
+        label, start.isoformat(), (time.monotonic() - started) * 1000,
+    )
+
+    await _async_deliver_report(
+        hass,
+        f"GlucoFarmer {label} report - {start.isoformat()}",
+        report_text,
+        f"glucofarmer_{label}_report_{start.isoformat()}",
+        [(f"glucofarmer_{label}_{start.isoformat()}.csv", csv_text)],
+    )
+
+
+async def _async_generate_reports(
+    hass: HomeAssistant,
+    first: date,
+    last: date,
+    subject_names: set[str] | None,
+) -> list[dict[str, Any]]:
+    """Build the daily reports of first..last (inclusive), one day at a time.
+
+    Glucose statistics come from the stored rollups where available and from
+    the recorder otherwise; event totals are always re-read, so corrected
+    events show up. The resulting rollups are stored for the period reports.
+    """
+    store: GlucoFarmerStore = hass.data[DOMAIN]["store"]
+    rollup_store = get_daily_rollups(hass)
+    rollups = await rollup_store.async_load()
+    started = time.monotonic()
+    results: list[dict[str, Any]] = []
+    updated: dict[str, dict[str, dict[str, Any]]] = {}
+    day = first
+    while day <= last:
+        day_str = day.isoformat()
+        cached = {
+            name: days[day_str] for name, days in rollups.items() if day_str in days
+        }
+        sections, _, subject_rollups = await async_build_daily_report(
+            hass, store, day_str,
+            dt_util.start_of_local_day(day),
+            dt_util.start_of_local_day(day + timedelta(days=1)),
+            subject_names, cached,
+        )
+        updated[day_str] = subject_rollups
+        results.append({
+            "date": day_str,
+            "report": render_daily_report(hass, day_str, sections),
+            "subjects": subject_rollups,
+        })
+        day += timedelta(days=1)
+    await rollup_store.async_set_days(updated)
+    _LOGGER.info(
+        "GlucoFarmer reports for %s to %s generated in %.1f ms",
+        first.isoformat(), last.isoformat(), (time.monotonic() - started) * 1000,
+    )
+    return results
+
+
 async def _send_daily_report(hass: HomeAssistant) -> None:
     """Send daily report for the previous day.
 
-    Runs at midnight (00:00-00:01). Computes all statistics retrospectively
-    from persistent store data for the previous day -- no dependency on
-    in-memory coordinator state that may have been reset.
+    Runs at 00:05. Glucose statistics were accumulated during the day by the
+    coordinators; subjects without them fall back to the recorder (see
+    report.py). Event totals come from the persistent store.
     """
     now = datetime.now()
     today_str = now.strftime("%Y-%m-%d")
@@ -723,229 +1282,34 @@ async def _send_daily_report(hass: HomeAssistant) -> None:
         now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
     ).astimezone()
     yesterday_end = yesterday_start + timedelta(days=1)
-    recorder_instance = get_instance(hass)
-
-    # Build report
-    lines = [
-        f"GlucoFarmer daily report - {yesterday}",
-        "=" * 60,
-        "",
-    ]
-    # Collect readings per subject for CSV attachments
-    subject_readings: dict[str, list[tuple[datetime, float]]] = {}
-
-    for entry in entries:
-        subject_name = entry.data.get(CONF_SUBJECT_NAME, "Unknown")
-        glucose_sensor_id = entry.data.get(CONF_GLUCOSE_SENSOR, "")
-
-        # Get thresholds from coordinator (if running) or use defaults
-        coordinator: GlucoFarmerCoordinator | None = getattr(
-            entry, "runtime_data", None
-        )
-        if coordinator is not None:
-            crit_low = coordinator.critical_low_threshold
-            low = coordinator.low_threshold
-            high = coordinator.high_threshold
-            very_high = coordinator.very_high_threshold
-        else:
-            crit_low = DEFAULT_CRITICAL_LOW_THRESHOLD
-            low = DEFAULT_LOW_THRESHOLD
-            high = DEFAULT_HIGH_THRESHOLD
-            very_high = DEFAULT_VERY_HIGH_THRESHOLD
-
-        # Get yesterday's events from persistent store
-        insulin_events = store.get_events_for_date(
-            subject_name, yesterday, EVENT_TYPE_INSULIN
-        )
-        feeding_events = store.get_events_for_date(
-            subject_name, yesterday, EVENT_TYPE_FEEDING
+    # Reuse the report already built for this day (manual resend) unless
+    # its events (see _invalidate_report_cache) or the thresholds changed
+    # since. The current glucose lines are rendered fresh either way.
+    thresholds = dict(domain_data.get("thresholds", {}))
+    cache = domain_data.get("report_cache")
+    if cache is not None and cache[:2] == (yesterday, thresholds):
+        _, _, sections, subject_readings = cache
+    else:
+        started = time.monotonic()
+        sections, subject_readings, subject_rollups = await async_build_daily_report(
+            hass, store, yesterday, yesterday_start, yesterday_end
         )
-
-        # Get yesterday's readings from HA Recorder.
-        # Gap markers (unknown/unavailable) are retained as None values --
-        # they are essential for accurate time-weighting and completeness.
-        all_entries: list[tuple[datetime, float | None]] = []
-        if recorder_instance is not None and glucose_sensor_id:
-            states_dict = await recorder_instance.async_add_executor_job(
-                state_changes_during_period,
-                hass, yesterday_start, yesterday_end, glucose_sensor_id,
-            )
-            for state in states_dict.get(glucose_sensor_id, []):
-                try:
-                    entry_value: float | None = float(state.state)
-                except (ValueError, TypeError):
-                    s = state.state.lower() if state.state else ""
-                    if s in {"low", "niedrig"}:
-                        entry_value = crit_low - 1
-                    elif s in {"high", "hoch"}:
-                        entry_value = very_high + 1
-                    else:
-                        entry_value = None  # unknown/unavailable -- gap marker
-                all_entries.append((state.last_changed, entry_value))
-
-        # Numeric readings only (for CSV, completeness, min/max/median)
-        readings = [(ts, v) for ts, v in all_entries if v is not None]
-        subject_readings[subject_name] = readings
-
-        if not readings:
-            lines.append(f"{subject_name}: No readings recorded for {yesterday}")
-            lines.append("")
-            continue
-
-        # Unweighted stats (min, max, median -- time-weighting not critical here)
-        values = [v for _, v in readings]
-        glucose_min = int(round(min(values)))
-        glucose_max = int(round(max(values)))
-        glucose_median = round(stats_module.median(values), 1)
-
-        # Time-weighted zone percentages, mean and SD.
-        # Weight per reading = time until next event (no cap for stable glucose),
-        # capped at _GAP_CAP_MINUTES when the immediately following event is a gap marker.
-        zone_weights = [0.0, 0.0, 0.0, 0.0, 0.0]
-        weighted_readings: list[tuple[float, float]] = []  # (weight, value)
-        covered_minutes = 0.0
-
-        for i, (ts, value) in enumerate(all_entries):
-            if value is None:
-                continue  # gap marker -- contributes no zone time
-
-            if i + 1 < len(all_entries):
-                boundary_ts, next_val = all_entries[i + 1]
-                has_gap_next = next_val is None
-            else:
-                boundary_ts = yesterday_end
-                has_gap_next = False
-
-            duration_min = (boundary_ts - ts).total_seconds() / 60.0
-            w = min(duration_min, _GAP_CAP_MINUTES) if has_gap_next else duration_min
-            w = max(0.0, w)
-            covered_minutes += w
-
-            if value < crit_low:
-                zone_weights[0] += w
-            elif value < low:
-                zone_weights[1] += w
-            elif value <= high:
-                zone_weights[2] += w
-            elif value <= very_high:
-                zone_weights[3] += w
-            else:
-                zone_weights[4] += w
-
-            weighted_readings.append((w, value))
-
-        total_w = sum(w for w, _ in weighted_readings)
-        if total_w > 0:
-            pct_crit_low = round(zone_weights[0] / total_w * 100, 1)
-            pct_low = round(zone_weights[1] / total_w * 100, 1)
-            pct_in_range = round(zone_weights[2] / total_w * 100, 1)
-            pct_high = round(zone_weights[3] / total_w * 100, 1)
-            pct_very_high = round(zone_weights[4] / total_w * 100, 1)
-            weighted_mean = sum(w * v for w, v in weighted_readings) / total_w
-            glucose_mean = round(weighted_mean, 1)
-            glucose_sd = round(
-                (sum(w * (v - weighted_mean) ** 2 for w, v in weighted_readings) / total_w) ** 0.5,
-                1,
-            ) if len(weighted_readings) > 1 else 0.0
-        else:
-            pct_crit_low = pct_low = pct_in_range = pct_high = pct_very_high = 0.0
-            glucose_mean = 0.0
-            glucose_sd = 0.0
-
-        # Time-based data completeness
-        total_minutes = (yesterday_end - yesterday_start).total_seconds() / 60.0
-        uncovered_min = round(max(0.0, total_minutes - covered_minutes))
-        completeness = round(covered_minutes / total_minutes * 100, 1) if total_minutes > 0 else 0.0
-
-        # Daily totals from events
-        insulin_total = sum(e.get("amount", 0) for e in insulin_events)
-        bes_total = sum(e.get("amount", 0) for e in feeding_events)
-
-        # Current state (if coordinator is available)
-        current_glucose = "N/A"
-        current_trend = "N/A"
-        current_status = "N/A"
-        if coordinator is not None and coordinator.data is not None:
-            current_glucose = coordinator.data.glucose_value or "N/A"
-            current_trend = coordinator.data.glucose_trend or "N/A"
-            current_status = coordinator.data.glucose_status
-
-        lines.extend([
-            f"--- {subject_name} ---",
-            f"  Current glucose: {current_glucose} mg/dL ({current_trend})",
-            f"  Current status: {current_status}",
-            f"  Thresholds: <{crit_low} critical | <{low} low | "
-            f"{low}-{high} target | >{high} high | >{very_high} very high",
-            f"  --- Yesterday ({yesterday}) ---",
-            f"  Without valid data: {uncovered_min} min",
-            f"  Min: {glucose_min} mg/dL  |  Max: {glucose_max} mg/dL",
-            f"  Mean: {glucose_mean} mg/dL  |  Median: {glucose_median} mg/dL  |  SD: {glucose_sd}",
-            f"  Critical low (<{crit_low}): {pct_crit_low}%",
-            f"  Low ({crit_low}-{low}): {pct_low}%",
-            f"  In range ({low}-{high}): {pct_in_range}%",
-            f"  High ({high}-{very_high}): {pct_high}%",
-            f"  Very high (>{very_high}): {pct_very_high}%",
-            f"  Data completeness: {completeness}%",
-            f"  Total insulin: {insulin_total} IU",
-            f"  Total feeding: {bes_total} BE",
-        ])
-
-        # Add notable events
-        all_yesterday_events = store.get_events_for_date(subject_name, yesterday)
-        emergencies = [
-            e for e in all_yesterday_events
-            if e.get("category") in ("emergency_single", "emergency_double")
-        ]
-        interventions = [
-            e for e in all_yesterday_events if e.get("category") == "intervention"
-        ]
-
-        if emergencies:
-            lines.append(f"  Emergency rations: {len(emergencies)}")
-        if interventions:
-            lines.append(f"  Interventions: {len(interventions)}")
-
-        lines.append("")
-
-    report_text = "\n".join(lines)
-
-    # Send via email notify service
-    try:
-        await hass.services.async_call(
-            "notify",
-            "notify",
-            {
-                "title": f"GlucoFarmer daily report - {yesterday}",
-                "message": report_text,
-            },
+        _LOGGER.info(
+            "GlucoFarmer daily report for %s built in %.1f ms",
+            yesterday, (time.monotonic() - started) * 1000,
         )
-        _LOGGER.info("Daily report sent successfully")
-    except Exception:
-        _LOGGER.debug("Could not send daily report via notify service")
-
-    # Also create persistent notification (unique per day so old reports are preserved)
-    await hass.services.async_call(
-        "persistent_notification",
-        "create",
-        {
-            "message": report_text,
-            "title": f"GlucoFarmer daily report - {yesterday}",
-            "notification_id": f"glucofarmer_daily_report_{yesterday}",
-        },
-    )
+        domain_data["report_cache"] = (yesterday, thresholds, sections, subject_readings)
+        await get_daily_rollups(hass).async_set_day(yesterday, subject_rollups)
+    report_text = render_daily_report(hass, yesterday, sections)
 
-    # Send email with per-subject CSV attachments
-    smtp_config = _get_smtp_config(hass)
-    if smtp_config:
-        attachments = [
+    await _async_deliver_report(
+        hass,
+        f"GlucoFarmer daily report - {yesterday}",
+        report_text,
+        f"glucofarmer_daily_report_{yesterday}",
+        [
             (f"{name}_{yesterday}.csv", _build_csv(readings))
             for name, readings in subject_readings.items()
             if readings
-        ]
-        await _send_daily_report_email(
-            hass,
-            smtp_config,
-            f"GlucoFarmer daily report - {yesterday}",
-            report_text,
-            attachments,
-        )
+        ],
+    )
@@ -0,0 +1,88 @@
+"""Report email attachments: encoding, compression and splitting by size."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import zipfile
+import zlib
+
+from .const import ATTACHMENT_FORMAT_GZIP, ATTACHMENT_FORMAT_ZIP
+
+# MIME headers and boundaries per attachment part (bytes, generous)
+_PART_OVERHEAD = 512
+# Local + central directory headers per zip member, excluding the name
+_ZIP_MEMBER_OVERHEAD = 100
+
+
+def _base64_size(size: int) -> int:
+    """Size of size bytes once base64-encoded with line breaks."""
+    encoded = (size + 2) // 3 * 4
+    return encoded + encoded // 76 * 2
+
+
+def _batches(sizes: list[int], budget: int | None) -> list[list[int]]:
+    """Group item indexes in order so each group stays within budget.
+
+    An item larger than the budget on its own still gets a group.
+    """
+    groups: list[list[int]] = []
+    used = 0
+    for index, size in enumerate(sizes):
+        if not groups or (budget is not None and used + size > budget):
+            groups.append([])
+            used = 0
+        groups[-1].append(index)
+        used += size
+    return groups
+
+
+def _zip(files: list[tuple[str, bytes]]) -> bytes:
+    """Return a deflate-compressed zip archive of files."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def build_attachment_batches(
+    attachments: list[tuple[str, str]],
+    attachment_format: str,
+    max_message_bytes: int,
+    body: str,
+    zip_name: str,
+) -> list[list[tuple[str, bytes]]]:
+    """Encode CSV attachments and split them into one batch per email.
+
+    Content is encoded as UTF-8 with BOM (Excel). With the zip format each
+    batch is one archive (zip_name, numbered when split). max_message_bytes
+    of 0 disables splitting. Runs in the executor.
+    """
+    files = [(name, content.encode("utf-8-sig")) for name, content in attachments]
+    if not files:
+        return [[]]
+    # Message headers and the (base64-encoded) body text come off the budget
+    body_size = _base64_size(len(body.encode("utf-8"))) + 2 * _PART_OVERHEAD
+    budget = max(1, max_message_bytes - body_size) if max_message_bytes else None
+
+    if attachment_format == ATTACHMENT_FORMAT_ZIP:
+        # Estimate each member's deflated size to decide the split up front
+        sizes = [
+            _base64_size(len(zlib.compress(data)) + _ZIP_MEMBER_OVERHEAD + 2 * len(name))
+            for name, data in files
+        ]
+        groups = _batches(sizes, budget)
+        stem = zip_name.removesuffix(".zip")
+        return [
+            [(
+                zip_name if len(groups) == 1 else f"{stem}_part{number}.zip",
+                _zip([files[i] for i in group]),
+            )]
+            for number, group in enumerate(groups, start=1)
+        ]
+
+    if attachment_format == ATTACHMENT_FORMAT_GZIP:
+        files = [(f"{name}.gz", gzip.compress(data)) for name, data in files]
+    sizes = [_base64_size(len(data)) + _PART_OVERHEAD for _, data in files]
+    return [[files[i] for i in group] for group in _batches(sizes, budget)]
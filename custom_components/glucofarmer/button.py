@@ -92,8 +92,6 @@ class GlucoFarmerLogFeedingButton(ButtonEntity):
         if c.form_mode_entity is not None:
             await c.form_mode_entity.async_select_option("list")
 
-        await c.async_request_refresh()
-
 
 class GlucoFarmerLogInsulinButton(ButtonEntity):
     """Logs an insulin event from current form values, then resets the form."""
@@ -142,5 +140,3 @@ class GlucoFarmerLogInsulinButton(ButtonEntity):
             c.minutes_ago_entity.reset()
         if c.form_mode_entity is not None:
             await c.form_mode_entity.async_select_option("list")
-
-        await c.async_request_refresh()
@@ -14,7 +14,6 @@ from homeassistant.config_entries import (
     OptionsFlow,
 )
 from homeassistant.core import callback
-from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.selector import (
     BooleanSelector,
     NumberSelector,
@@ -33,6 +32,9 @@ from .const import (
     ALARM_TRIGGER_AND_QUICKLY,
     ALARM_TRIGGER_OFF,
     ALARM_TRIGGER_QUICKLY_ONLY,
+    ATTACHMENT_FORMAT_CSV,
+    ATTACHMENT_FORMAT_GZIP,
+    ATTACHMENT_FORMAT_ZIP,
     CONF_ALARM_CRITICAL_LOW,
     CONF_ALARM_FALLING_MIN_STATUS,
     CONF_ALARM_FALLING_PRIORITY,
@@ -49,8 +51,15 @@ from .const import (
     CONF_INSULIN_TYPES,
     CONF_MEALS,
     CONF_NOTIFY_TARGETS,
+    CONF_PURGE_ARCHIVED_DAYS,
+    CONF_SAVE_DELAY,
+    CONF_SMTP_ATTACHMENT_FORMAT,
+    CONF_SMTP_MAX_MESSAGE_KB,
+    CONF_STORAGE_BACKEND,
+    CONF_SUBJECT_GROUP,
     CONF_SUBJECT_NAME,
     CONF_SUBJECT_WEIGHT_KG,
+    CONF_SUMMARIZE_AFTER_YEARS,
     CONF_TREND_SENSOR,
     DEFAULT_ALARM_CRITICAL_LOW,
     DEFAULT_ALARM_FALLING_MIN_STATUS,
@@ -64,31 +73,32 @@ from .const import (
     DEFAULT_ALARM_RISING_TRIGGERS,
     DEFAULT_ALARM_VERY_HIGH,
     DEFAULT_ALARM_VERY_LOW,
+    DEFAULT_ATTACHMENT_FORMAT,
     DEFAULT_NOTIFY_TARGETS,
     DEFAULT_INSULIN_TYPES,
     DEFAULT_MEALS,
+    DEFAULT_PURGE_ARCHIVED_DAYS,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SMTP_MAX_MESSAGE_KB,
+    DEFAULT_STORAGE_BACKEND,
+    DEFAULT_SUMMARIZE_AFTER_YEARS,
     DOMAIN,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
 )
+from .entity_index import async_get_entity_index
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def _get_dexcom_sensors(hass, device_class_filter: str | None = None) -> dict[str, str]:
     """Get a dict of entity_id -> friendly name for Dexcom sensor entities."""
-    registry = er.async_get(hass)
     sensors: dict[str, str] = {}
 
-    for entity in registry.entities.values():
-        if entity.domain != "sensor":
-            continue
-        if entity.platform == "dexcom" or "glucose" in (entity.entity_id or ""):
-            state = hass.states.get(entity.entity_id)
-            name = (
-                state.attributes.get("friendly_name", entity.entity_id)
-                if state
-                else entity.entity_id
-            )
-            sensors[entity.entity_id] = name
+    for entity_id in async_get_entity_index(hass).cgm_sensors():
+        state = hass.states.get(entity_id)
+        name = state.attributes.get("friendly_name", entity_id) if state else entity_id
+        sensors[entity_id] = name
 
     if not sensors:
         for state in hass.states.async_all("sensor"):
@@ -173,6 +183,7 @@ class GlucoFarmerOptionsFlow(OptionsFlow):
                 "manage_insulin_types",
                 "manage_alarm_settings",
                 "manage_email_settings",
+                "manage_storage",
             ],
         )
 
@@ -185,6 +196,7 @@ class GlucoFarmerOptionsFlow(OptionsFlow):
         if user_input is not None:
             new_options = dict(self.config_entry.options)
             new_options[CONF_SUBJECT_WEIGHT_KG] = user_input[CONF_SUBJECT_WEIGHT_KG]
+            new_options[CONF_SUBJECT_GROUP] = user_input.get(CONF_SUBJECT_GROUP, "").strip()
             # Sensor changes update config entry data -- store in options as overrides
             new_data = dict(self.config_entry.data)
             new_data[CONF_GLUCOSE_SENSOR] = user_input[CONF_GLUCOSE_SENSOR]
@@ -220,6 +232,10 @@ class GlucoFarmerOptionsFlow(OptionsFlow):
                         CONF_TREND_SENSOR,
                         default=cur_data.get(CONF_TREND_SENSOR, ""),
                     ): SelectSelector(SelectSelectorConfig(options=list(sensors.keys()))),
+                    vol.Optional(
+                        CONF_SUBJECT_GROUP,
+                        default=cur.get(CONF_SUBJECT_GROUP, ""),
+                    ): TextSelector(),
                 }
             ),
         )
@@ -609,6 +625,12 @@ class GlucoFarmerOptionsFlow(OptionsFlow):
             new_options["smtp_username"] = user_input.get("smtp_username", "")
             new_options["smtp_password"] = user_input.get("smtp_password", "")
             new_options["smtp_recipients"] = user_input.get("smtp_recipients", "")
+            new_options[CONF_SMTP_ATTACHMENT_FORMAT] = user_input.get(
+                CONF_SMTP_ATTACHMENT_FORMAT, DEFAULT_ATTACHMENT_FORMAT
+            )
+            new_options[CONF_SMTP_MAX_MESSAGE_KB] = int(
+                user_input.get(CONF_SMTP_MAX_MESSAGE_KB, DEFAULT_SMTP_MAX_MESSAGE_KB)
+            )
             return self.async_create_entry(title="", data=new_options)
 
         from homeassistant.helpers.selector import BooleanSelector, TextSelectorConfig, TextSelectorType
@@ -653,6 +675,91 @@ class GlucoFarmerOptionsFlow(OptionsFlow):
                     vol.Optional(
                         "smtp_recipients", default=cur.get("smtp_recipients", "")
                     ): TextSelector(),
+                    vol.Optional(
+                        CONF_SMTP_ATTACHMENT_FORMAT,
+                        default=cur.get(CONF_SMTP_ATTACHMENT_FORMAT, DEFAULT_ATTACHMENT_FORMAT),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                {"value": ATTACHMENT_FORMAT_CSV, "label": "CSV per subject"},
+                                {"value": ATTACHMENT_FORMAT_ZIP, "label": "One ZIP file"},
+                                {"value": ATTACHMENT_FORMAT_GZIP, "label": "Gzip per subject (.csv.gz)"},
+                            ]
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_SMTP_MAX_MESSAGE_KB,
+                        default=cur.get(CONF_SMTP_MAX_MESSAGE_KB, DEFAULT_SMTP_MAX_MESSAGE_KB),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0, max=102400, step=1, mode=NumberSelectorMode.BOX,
+                            unit_of_measurement="KB",
+                        )
+                    ),
+                }
+            ),
+        )
+
+    # --- Storage ---
+
+    async def async_step_manage_storage(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Select the event storage backend (global, applied after restart)."""
+        if user_input is not None:
+            new_options = dict(self.config_entry.options)
+            new_options[CONF_STORAGE_BACKEND] = user_input[CONF_STORAGE_BACKEND]
+            new_options[CONF_SAVE_DELAY] = int(user_input[CONF_SAVE_DELAY])
+            new_options[CONF_PURGE_ARCHIVED_DAYS] = int(user_input[CONF_PURGE_ARCHIVED_DAYS])
+            new_options[CONF_SUMMARIZE_AFTER_YEARS] = int(
+                user_input[CONF_SUMMARIZE_AFTER_YEARS]
+            )
+            return self.async_create_entry(title="", data=new_options)
+
+        cur = self.config_entry.options
+        return self.async_show_form(
+            step_id="manage_storage",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STORAGE_BACKEND,
+                        default=cur.get(CONF_STORAGE_BACKEND, DEFAULT_STORAGE_BACKEND),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                {"value": STORAGE_BACKEND_JSON, "label": "JSON file (default)"},
+                                {"value": STORAGE_BACKEND_SQLITE, "label": "SQLite database (large herds)"},
+                            ]
+                        )
+                    ),
+                    vol.Required(
+                        CONF_SAVE_DELAY,
+                        default=cur.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0, max=60, step=1, unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_PURGE_ARCHIVED_DAYS,
+                        default=cur.get(CONF_PURGE_ARCHIVED_DAYS, DEFAULT_PURGE_ARCHIVED_DAYS),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0, max=3650, step=1, unit_of_measurement="d",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_SUMMARIZE_AFTER_YEARS,
+                        default=cur.get(
+                            CONF_SUMMARIZE_AFTER_YEARS, DEFAULT_SUMMARIZE_AFTER_YEARS
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0, max=50, step=1, mode=NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             ),
         )
@@ -14,6 +14,8 @@ CONF_TREND_SENSOR = "trend_sensor"
 CONF_SUBJECT_WEIGHT_KG = "weight_kg"
 CONF_MEALS = "meals"
 CONF_INSULIN_TYPES = "insulin_types"
+# Dashboard group (pen, study); subjects with a group get per-group pages
+CONF_SUBJECT_GROUP = "group"
 
 # SMTP / E-Mail options (global -- nur in einer Subject-Entry konfigurieren)
 CONF_SMTP_ENABLED = "smtp_enabled"
@@ -25,6 +27,16 @@ CONF_SMTP_SENDER_NAME = "smtp_sender_name"
 CONF_SMTP_USERNAME = "smtp_username"
 CONF_SMTP_PASSWORD = "smtp_password"
 CONF_SMTP_RECIPIENTS = "smtp_recipients"
+CONF_SMTP_ATTACHMENT_FORMAT = "smtp_attachment_format"
+CONF_SMTP_MAX_MESSAGE_KB = "smtp_max_message_kb"
+
+# Report email attachments: plain CSV per subject, one zip, or gzip per subject
+ATTACHMENT_FORMAT_CSV = "csv"
+ATTACHMENT_FORMAT_ZIP = "zip"
+ATTACHMENT_FORMAT_GZIP = "gzip"
+DEFAULT_ATTACHMENT_FORMAT = ATTACHMENT_FORMAT_CSV
+# Maximum message size in KB (0 = no limit; larger reports are split)
+DEFAULT_SMTP_MAX_MESSAGE_KB = 0
 
 # Alarm options keys (per alarm type: critical / notification / off)
 CONF_ALARM_CRITICAL_LOW = "alarm_critical_low"
@@ -100,11 +112,34 @@ EVENT_TYPE_FEEDING = "feeding"
 STORAGE_VERSION = 1
 STORAGE_KEY = f"{DOMAIN}_events"
 
+# Storage backend option (global -- first entry that selects sqlite wins)
+CONF_STORAGE_BACKEND = "storage_backend"
+STORAGE_BACKEND_JSON = "json"
+STORAGE_BACKEND_SQLITE = "sqlite"
+DEFAULT_STORAGE_BACKEND = STORAGE_BACKEND_JSON
+
+# Write-behind delay for event saves in seconds (global, 0 = save immediately)
+CONF_SAVE_DELAY = "save_delay"
+DEFAULT_SAVE_DELAY = 5
+
+# Retention (global): purge archived events after N days (0 = keep),
+# roll events older than M full years into yearly summaries (0 = keep)
+CONF_PURGE_ARCHIVED_DAYS = "purge_archived_days"
+CONF_SUMMARIZE_AFTER_YEARS = "summarize_after_years"
+DEFAULT_PURGE_ARCHIVED_DAYS = 90
+DEFAULT_SUMMARIZE_AFTER_YEARS = 0
+
 # Services
 SERVICE_LOG_INSULIN = "log_insulin"
 SERVICE_LOG_FEEDING = "log_feeding"
 SERVICE_DELETE_EVENT = "delete_event"
 SERVICE_SEND_DAILY_REPORT = "send_daily_report"
+SERVICE_IMPORT_EVENTS = "import_events"
+SERVICE_LOG_ROUND = "log_round"
+SERVICE_QUERY_EVENTS = "query_events"
+SERVICE_COMPACT_EVENTS = "compact_events"
+SERVICE_GENERATE_REPORT = "generate_report"
+SERVICE_EXPORT = "export"
 
 # Attributes
 ATTR_SUBJECT_NAME = "subject_name"
@@ -115,3 +150,48 @@ ATTR_EVENT_ID = "event_id"
 ATTR_PRODUCT = "product"
 ATTR_CATEGORY = "category"
 ATTR_DESCRIPTION = "description"
+ATTR_EVENTS = "events"
+ATTR_PATH = "path"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_SUBJECTS = "subjects"
+ATTR_MEAL = "meal"
+ATTR_MINUTES_AGO = "minutes_ago"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_CURSOR = "cursor"
+ATTR_LIMIT = "limit"
+ATTR_AGGREGATE = "aggregate"
+ATTR_DATE = "date"
+ATTR_COMPRESS = "compress"
+ATTR_INCLUDE_EVENTS = "include_events"
+
+# query_events paging and aggregation
+QUERY_DEFAULT_LIMIT = 100
+QUERY_MAX_LIMIT = 1000
+AGGREGATE_HOUR = "hour"
+AGGREGATE_DAY = "day"
+
+# Summary report periods (weekly on Mondays, monthly on the 1st, after the daily report)
+REPORT_PERIOD_WEEK = "week"
+REPORT_PERIOD_MONTH = "month"
+
+# generate_report: maximum days per call (days without rollups read the recorder)
+REPORT_MAX_DAYS = 92
+
+# export: default output directory (relative to the config dir)
+DEFAULT_EXPORT_DIR = "glucofarmer_exports"
+
+# Today's events listed by the recent_events sensor (attributes entry_1..N)
+RECENT_EVENTS_SHOWN = 10
+
+# Dashboard chart series: spans served by the glucose_chart sensor (attribute
+# points_<span>) and the point budget per span after downsampling
+CHART_SPAN_HOURS = {"3h": 3, "6h": 6, "24h": 24, "7d": 168}
+CHART_MAX_POINTS = 300
+# Day-scale statistics ranges (from the daily rollups) and the days of
+# per-day statistics served to the dashboard
+CHART_TIMERANGE_DAY_OPTIONS = ["7d", "14d", "30d", "90d"]
+CHART_MAX_DAYS = 90
+
+# WebSocket history: maximum days per request
+HISTORY_MAX_DAYS = 92
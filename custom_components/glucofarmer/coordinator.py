@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
-import asyncio
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
 import logging
 from typing import Any
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.history import state_changes_during_period
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+import homeassistant.util.dt as dt_util
 
 from .const import (
+    CHART_MAX_DAYS,
+    CHART_MAX_POINTS,
+    CHART_SPAN_HOURS,
     CONF_GLUCOSE_SENSOR,
     CONF_INSULIN_TYPES,
     CONF_MEALS,
@@ -39,7 +42,10 @@ from .const import (
     STATUS_VERY_HIGH,
     STATUS_VERY_LOW,
 )
-from .store import GlucoFarmerStore
+from .downsample import GlucoseSeries
+from .report import DayAccumulator, GlucoseValue, day_rollup, parse_glucose_state
+from .rollups import get_daily_rollups
+from .store import EventRecord, GlucoFarmerStore, StoreChange
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -95,7 +101,56 @@ class GlucoFarmerData:
     last_reading_time: datetime | None
     link_status: str               # "ok" | "lost"
     link_outage_minutes: int | None  # None when ok, else minutes since signal loss
-    today_events: list[dict[str, Any]] = field(default_factory=list)
+    today_events: list[EventRecord] = field(default_factory=list)
+    # Formatted dashboard status line (see format_status_line)
+    status_line: str = ""
+    # Per-day statistics of the last CHART_MAX_DAYS days (oldest first):
+    # {"t": local midnight in ms, "coverage": %, "zones": 6-zone % of covered time}
+    daily_stats: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _six_zone_minutes(rollup: dict[str, Any]) -> list[float]:
+    """Split a rollup's 5 report zones into the dashboard's 6 zones (minutes)."""
+    crit_low, low, in_range, high, very_high = rollup["zones_min"]
+    very_low = min(rollup.get("very_low_min", 0.0), low)
+    return [crit_low, very_low, low - very_low, in_range, high, very_high]
+
+
+def _zone_pcts(zone_minutes: list[float], covered: float) -> list[float]:
+    """Zone minutes as percentages of the covered time."""
+    if covered <= 0:
+        return [0.0] * len(zone_minutes)
+    return [round(m / covered * 100, 1) for m in zone_minutes]
+
+
+def _format_number(value: float) -> str:
+    """Format a total without trailing zeros (4.0 -> 4, 2.5 -> 2.5)."""
+    return f"{value:g}"
+
+
+def format_status_line(
+    glucose_value: float | None,
+    glucose_status: str,
+    glucose_trend: str | None,
+    daily_insulin: float,
+    daily_bes: float,
+) -> str:
+    """Return the one-line subject status shown in the input view.
+
+    Critical states are wrapped in "!" so they stand out without a template.
+    """
+    glucose = (
+        f"Glucose: {int(round(glucose_value))} mg/dL"
+        if glucose_value is not None
+        else "Glucose: -- mg/dL"
+    )
+    if glucose_status in (STATUS_CRITICAL_LOW, STATUS_VERY_HIGH):
+        glucose = f"! {glucose} !"
+    return (
+        f"{glucose} | Trend: {glucose_trend or '--'}"
+        f" | Insulin heute: {_format_number(daily_insulin)} IU"
+        f" | BE heute: {_format_number(daily_bes)}"
+    )
 
 
 class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
@@ -149,8 +204,26 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
         # Timestamp when the current signal-loss event started (None = signal ok)
         self._signal_lost_since: datetime | None = None
 
-        # Pending debounced dashboard refresh task (used after startup restore)
-        self._dashboard_refresh_task: asyncio.Task | None = None
+        # Alarm notification flags ("<alarm>_notified"), set by the alarm checks
+        self.alarm_state: dict[str, bool] = {
+            "low_notified": False,
+            "critical_low_notified": False,
+            "high_notified": False,
+            "no_data_notified": False,
+            "falling_notified": False,
+            "rising_notified": False,
+        }
+
+        # Daily report statistics, accumulated from live readings (today) and
+        # kept for the finished previous day until the 00:05 report
+        self._day_acc: DayAccumulator | None = None
+        self._prev_day_acc: DayAccumulator | None = None
+
+        # Numeric readings of the longest chart span (downsampled for the dashboard)
+        self._chart_series: GlucoseSeries | None = None
+
+        # {subject: {day: rollup}} written by the daily report (day-scale ranges)
+        self._rollups: dict[str, dict[str, dict[str, Any]]] | None = None
 
     @property
     def weight_kg(self) -> float:
@@ -167,6 +240,152 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
         """Insulin type names from config entry options."""
         return list(self.config_entry.options.get(CONF_INSULIN_TYPES, DEFAULT_INSULIN_TYPES))
 
+    def compute_meal_be(self, meal_name: str) -> float | None:
+        """Return the BE amount of a meal for this subject (None if not defined here).
+
+        Fixed meals use their amount; per-kg meals scale with the subject weight.
+        """
+        meal = next((m for m in self.meals if m["name"] == meal_name), None)
+        if meal is None:
+            return None
+        if "amount" in meal:
+            return float(meal["amount"])
+        if "be_per_kg" in meal:
+            return round(float(meal["be_per_kg"]) * self.weight_kg, 2)
+        return 0.0
+
+    @callback
+    def async_handle_store_change(self, change: StoreChange) -> None:
+        """Update the event-derived fields when today's events of this subject change.
+
+        Only today's totals and event list depend on stored events, so other
+        subjects and other dates (e.g. a backdated event before midnight) are
+        ignored, and glucose stats are not recomputed from the recorder.
+        """
+        if change.subject_name != self.subject_name or self.data is None:
+            return
+        if datetime.now().strftime("%Y-%m-%d") not in change.dates:
+            return
+        daily_insulin = self._compute_daily_insulin()
+        daily_bes = self._compute_daily_bes()
+        self.async_set_updated_data(
+            replace(
+                self.data,
+                daily_insulin_total=daily_insulin,
+                daily_bes_total=daily_bes,
+                today_events=self.store.get_today_events(self.subject_name),
+                status_line=format_status_line(
+                    self.data.glucose_value,
+                    self.data.glucose_status,
+                    self.data.glucose_trend,
+                    daily_insulin,
+                    daily_bes,
+                ),
+            )
+        )
+
+    async def async_seed_from_recorder(self) -> None:
+        """Seed today's report statistics and the chart series (once, on setup).
+
+        One recorder query covers the longest chart span; only readings since
+        midnight go into the day statistics.
+        """
+        now = dt_util.now()
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        max_hours = max(CHART_SPAN_HOURS.values())
+        accumulator = DayAccumulator(day_start, day_start + timedelta(days=1))
+        series = GlucoseSeries(max_hours)
+        instance = get_instance(self.hass)
+        if instance is not None:
+            states_dict = await instance.async_add_executor_job(
+                state_changes_during_period,
+                self.hass, min(day_start, now - timedelta(hours=max_hours)), now,
+                self.glucose_sensor_id,
+            )
+            # The state current at midnight opens the day, as a query
+            # starting at midnight would have returned it (a gap needs no entry)
+            at_midnight: GlucoseValue = None
+            for state in states_dict.get(self.glucose_sensor_id, []):
+                value = parse_glucose_state(state.state)
+                if state.last_changed < day_start:
+                    at_midnight = value
+                else:
+                    if at_midnight is not None and state.last_changed > day_start:
+                        accumulator.add(day_start, at_midnight)
+                    at_midnight = None
+                    accumulator.add(state.last_changed, value)
+                if isinstance(value, float):
+                    series.add(int(state.last_changed.timestamp() * 1000), value)
+            if at_midnight is not None:
+                accumulator.add(day_start, at_midnight)
+        self._day_acc = accumulator
+        self._chart_series = series
+
+    @callback
+    def async_add_glucose_state(self, state: State) -> None:
+        """Feed a live glucose sensor state into today's statistics and the chart."""
+        if self._day_acc is None or state.last_changed != state.last_updated:
+            return  # not seeded yet, or attribute-only update
+        self._roll_day(state.last_changed)
+        value = parse_glucose_state(state.state)
+        self._day_acc.add(state.last_changed, value)
+        if self._chart_series is not None and isinstance(value, float):
+            self._chart_series.add(int(state.last_changed.timestamp() * 1000), value)
+
+    @property
+    def chart_readings(self) -> int:
+        """Return the number of readings buffered for the charts."""
+        return len(self._chart_series) if self._chart_series is not None else 0
+
+    def chart_points(self, span: str) -> list[list[float]]:
+        """Return the downsampled [[timestamp_ms, mg/dL], ...] of a chart span."""
+        if self._chart_series is None:
+            return []
+        return self._chart_series.points(
+            CHART_SPAN_HOURS[span],
+            CHART_MAX_POINTS,
+            (
+                self.critical_low_threshold,
+                self.very_low_threshold,
+                self.low_threshold,
+                self.high_threshold,
+                self.very_high_threshold,
+            ),
+        )
+
+    def _roll_day(self, now: datetime) -> None:
+        """Close today's statistics once the local date has changed."""
+        accumulator = self._day_acc
+        if accumulator is None or now < accumulator.day_end:
+            return
+        day_start = dt_util.as_local(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        self._prev_day_acc = accumulator
+        self._day_acc = DayAccumulator(day_start, day_start + timedelta(days=1))
+        # The last reading carries over midnight (like the recorder's start state)
+        self._day_acc.add(day_start, accumulator.last_value)
+
+    def today_zone_minutes(self) -> list[float]:
+        """Return today's minutes per dashboard zone so far (live statistics)."""
+        now = dt_util.now()
+        self._roll_day(now)
+        if self._day_acc is None:
+            return [0.0] * 6
+        return _six_zone_minutes(self._accumulator_rollup(self._day_acc, now))
+
+    def active_alarms(self) -> list[str]:
+        """Return the alarms currently raised (e.g. "low", "falling")."""
+        return sorted(
+            key.removesuffix("_notified")
+            for key, raised in self.alarm_state.items()
+            if raised
+        )
+
+    def get_finished_day(self, day: str) -> DayAccumulator | None:
+        """Return the accumulated statistics of a finished day, if still held."""
+        self._roll_day(dt_util.now())
+        accumulator = self._prev_day_acc
+        return accumulator if accumulator is not None and accumulator.day == day else None
+
     async def _async_update_data(self) -> GlucoFarmerData:
         """Fetch data from Dexcom sensors and compute stats."""
         glucose_value = self._get_sensor_value(self.glucose_sensor_id)
@@ -233,9 +452,23 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
         midnight_aware = now_aware.replace(hour=0, minute=0, second=0, microsecond=0)
         range_start_aware = now_aware - timedelta(hours=hours)
 
-        zones = await self._compute_zone_stats(range_start_aware, now_aware)
         covered_today, total_today = await self._compute_signal_coverage(midnight_aware, now_aware)
-        covered_range, total_range = await self._compute_signal_coverage(range_start_aware, now_aware)
+
+        # Day-scale ranges are summed from the per-day rollups instead of
+        # rescanning weeks of recorder history
+        if self._rollups is None:
+            self._rollups = await get_daily_rollups(self.hass).async_load()
+        local_now = dt_util.now()
+        days = self._daily_rollups(local_now)
+        if hours > 24:
+            zones, covered_range, total_range = self._range_from_days(
+                days, hours // 24, local_now.date()
+            )
+        else:
+            zones = await self._compute_zone_stats(range_start_aware, now_aware)
+            covered_range, total_range = await self._compute_signal_coverage(
+                range_start_aware, now_aware
+            )
 
         # Daily totals (always from midnight)
         daily_insulin = self._compute_daily_insulin()
@@ -265,6 +498,20 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
             link_status=link_status,
             link_outage_minutes=link_outage_minutes,
             today_events=today_events,
+            status_line=format_status_line(
+                glucose_value, glucose_status, trend_value, daily_insulin, daily_bes
+            ),
+            daily_stats=[
+                {
+                    "t": int(dt_util.start_of_local_day(day).timestamp() * 1000),
+                    "coverage": (
+                        round(rollup["covered_min"] / rollup["minutes"] * 100, 1)
+                        if rollup["minutes"] else 0.0
+                    ),
+                    "zones": _zone_pcts(_six_zone_minutes(rollup), rollup["covered_min"]),
+                }
+                for day, rollup in days
+            ],
         )
 
     async def _get_readings_from_recorder(
@@ -405,23 +652,13 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
         })
 
     def schedule_dashboard_refresh(self) -> None:
-        """Schedule a debounced dashboard refresh.
+        """Request a debounced herd-level dashboard rebuild (see dashboard.py).
 
-        Cancels any pending refresh and schedules a new one 200 ms later.
         Multiple rapid calls (e.g. all number entities restoring on startup)
-        collapse into a single refresh once things settle.
+        collapse into a single rebuild once things settle.
         """
-        if self._dashboard_refresh_task is not None and not self._dashboard_refresh_task.done():
-            self._dashboard_refresh_task.cancel()
-        self._dashboard_refresh_task = self.hass.async_create_task(
-            self._do_dashboard_refresh()
-        )
-
-    async def _do_dashboard_refresh(self) -> None:
-        """Wait briefly then regenerate dashboard with current threshold values."""
-        from .dashboard import async_update_dashboard  # avoid circular import at module level
-        await asyncio.sleep(0.2)
-        await async_update_dashboard(self.hass)
+        from .dashboard import schedule_dashboard_update  # avoid circular import at module level
+        schedule_dashboard_update(self.hass)
 
     def _compute_status(
         self, glucose: float | None, sensor_unavailable: bool
@@ -448,14 +685,77 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
         return STATUS_NORMAL
 
     def _get_chart_timerange(self) -> int:
-        """Get selected chart timerange in hours from shared state."""
+        """Get selected chart timerange in hours from shared state ("7d" = 168)."""
         domain_data = self.hass.data.get(DOMAIN, {})
-        timerange_str = domain_data.get("chart_timerange", "24h")
+        timerange_str = str(domain_data.get("chart_timerange", "24h"))
         try:
-            return int(str(timerange_str).replace("h", ""))
-        except (ValueError, AttributeError):
+            if timerange_str.endswith("d"):
+                return int(timerange_str[:-1]) * 24
+            return int(timerange_str.replace("h", ""))
+        except ValueError:
             return 24
 
+    def _accumulator_rollup(
+        self, accumulator: DayAccumulator, until: datetime
+    ) -> dict[str, Any]:
+        """Glucose part of a day rollup from a (possibly unfinished) day."""
+        stats = accumulator.finalize(
+            (
+                self.critical_low_threshold,
+                self.low_threshold,
+                self.high_threshold,
+                self.very_high_threshold,
+            ),
+            self.very_low_threshold,
+            until,
+        )
+        minutes = (until - accumulator.day_start).total_seconds() / 60.0
+        return day_rollup(stats, minutes, 0.0, 0.0, 0, 0)
+
+    def _daily_rollups(self, now: datetime) -> list[tuple[date, dict[str, Any]]]:
+        """Return (day, rollup) for the last CHART_MAX_DAYS days, oldest first.
+
+        Finished days come from the stored rollups (or, before the report has
+        run, the finished day still held in memory); today is finalized up to
+        now. Days without data are left out.
+        """
+        today = now.date()
+        subject_days = (self._rollups or {}).get(self.subject_name, {})
+        result: list[tuple[date, dict[str, Any]]] = []
+        for offset in range(CHART_MAX_DAYS - 1, 0, -1):
+            day = today - timedelta(days=offset)
+            rollup = subject_days.get(day.isoformat())
+            if rollup is None:
+                finished = self.get_finished_day(day.isoformat())
+                if finished is not None:
+                    rollup = self._accumulator_rollup(finished, finished.day_end)
+            if rollup is not None:
+                result.append((day, rollup))
+        if self._day_acc is not None and self._day_acc.day == today.isoformat():
+            result.append((today, self._accumulator_rollup(self._day_acc, now)))
+        return result
+
+    @staticmethod
+    def _range_from_days(
+        days: list[tuple[date, dict[str, Any]]], count: int, today: date
+    ) -> tuple[tuple[float, float, float, float, float, float], float, float]:
+        """Return (6-zone %, covered minutes, total minutes) of the last count days.
+
+        The range ends with today (so far); days without a rollup count as
+        fully uncovered.
+        """
+        first = today - timedelta(days=count - 1)
+        selected = [(day, rollup) for day, rollup in days if day >= first]
+        zone_minutes = [0.0] * 6
+        covered = total = 0.0
+        for _day, rollup in selected:
+            covered += rollup["covered_min"]
+            total += rollup["minutes"]
+            zone_minutes = [z + m for z, m in zip(zone_minutes, _six_zone_minutes(rollup))]
+        total += (count - len(selected)) * 1440
+        zones = _zone_pcts(zone_minutes, sum(zone_minutes))
+        return tuple(zones), covered, total  # type: ignore[return-value]
+
     async def _compute_zone_stats(
         self,
         start_dt: datetime,
@@ -569,9 +869,9 @@ class GlucoFarmerCoordinator(DataUpdateCoordinator[GlucoFarmerData]):
     def _compute_daily_insulin(self) -> float:
         """Compute total insulin IU administered today."""
         events = self.store.get_today_events(self.subject_name, EVENT_TYPE_INSULIN)
-        return sum(e.get("amount", 0) for e in events)
+        return sum(e.amount for e in events)
 
     def _compute_daily_bes(self) -> float:
         """Compute total bread units (BE) fed today."""
         events = self.store.get_today_events(self.subject_name, EVENT_TYPE_FEEDING)
-        return sum(e.get("amount", 0) for e in events)
+        return sum(e.amount for e in events)
@@ -7,15 +7,31 @@ with colored threshold zones.
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
+import hashlib
+import json
 import logging
 from typing import Any
 
 from homeassistant.components.lovelace import dashboard as lovelace_dashboard
-from homeassistant.components.lovelace.const import LOVELACE_DATA
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er
-
-from .const import CONF_SUBJECT_NAME, DOMAIN
+from homeassistant.components.lovelace.const import LOVELACE_DATA, ConfigNotFound
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.util import slugify
+
+from .const import (
+    CHART_SPAN_HOURS,
+    CHART_TIMERANGE_DAY_OPTIONS,
+    CONF_MEALS,
+    CONF_SUBJECT_GROUP,
+    CONF_SUBJECT_NAME,
+    DOMAIN,
+    RECENT_EVENTS_SHOWN,
+    SERVICE_LOG_ROUND,
+)
+from .entity_index import async_get_entity_index
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,6 +55,17 @@ _COLOR_NORMAL = "#4CAF50"     # gruen
 _COLOR_HIGH = "#FFC107"       # gelb
 _COLOR_VERY_HIGH = "#FF9800"  # orange
 
+# 6 zones as (zone sensor key, label, color); order matches the zone
+# percentages of the glucose_chart sensor's daily statistics
+_ZONES = [
+    ("time_critical_low_pct", "Kritisch niedrig", _COLOR_CRITICAL),
+    ("time_very_low_pct", "Sehr niedrig", _COLOR_VERY_LOW),
+    ("time_low_pct", "Niedrig", _COLOR_LOW),
+    ("time_in_range_pct", "Zielbereich", _COLOR_NORMAL),
+    ("time_high_pct", "Hoch", _COLOR_HIGH),
+    ("time_very_high_pct", "Sehr hoch", _COLOR_VERY_HIGH),
+]
+
 # HA gauge uses CSS color names or hex
 _GAUGE_CRITICAL = "red"
 _GAUGE_VERY_LOW = "orange"
@@ -47,6 +74,15 @@ _GAUGE_NORMAL = "green"
 _GAUGE_HIGH = "yellow"
 _GAUGE_VERY_HIGH = "orange"
 
+# URL path of the generated dashboard
+_DASHBOARD_URL = "glucofarmer"
+
+# Group of subjects without one, once groups are in use
+_UNGROUPED = "Ohne Gruppe"
+
+# Herd-level rebuild delay: changes within this window collapse into one build
+_UPDATE_COOLDOWN = 0.5
+
 # Default thresholds (used when hass.data not yet populated)
 _DEFAULT_THRESHOLDS = {
     "critical_low": 55,
@@ -57,20 +93,31 @@ _DEFAULT_THRESHOLDS = {
 }
 
 
-def _get_subject_entities(
-    hass: HomeAssistant, entry_id: str
-) -> dict[str, str]:
-    """Map entity keys to actual entity_ids for a config entry."""
-    registry = er.async_get(hass)
-    entities = er.async_entries_for_config_entry(registry, entry_id)
+def _digest(value: Any) -> str:
+    """Stable hash of a JSON-serializable value (dashboard change detection)."""
+    return hashlib.sha1(
+        json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
 
-    prefix = f"{entry_id}_"
-    result: dict[str, str] = {}
-    for entity in entities:
-        if entity.unique_id and entity.unique_id.startswith(prefix):
-            key = entity.unique_id[len(prefix):]
-            result[key] = entity.entity_id
-    return result
+
+def _glucose_series(
+    ents: dict[str, str], span: str, **options: Any
+) -> dict[str, Any] | None:
+    """Build a glucose chart series for span (a CHART_SPAN_HOURS key).
+
+    Reads the downsampled points of the glucose_chart sensor through a
+    data_generator, so the browser does not load raw recorder history.
+    Falls back to the glucose value sensor's history.
+    """
+    if chart_entity := ents.get("glucose_chart"):
+        return {
+            "entity": chart_entity,
+            "data_generator": f"return entity.attributes.points_{span} || [];",
+            **options,
+        }
+    if glucose_entity := ents.get("glucose_value"):
+        return {"entity": glucose_entity, **options}
+    return None
 
 
 def _yaxis_max(thresholds: dict[str, Any]) -> int:
@@ -208,11 +255,33 @@ def _zone_annotations_lines(thresholds: dict[str, Any]) -> list[dict[str, Any]]:
     ]
 
 
-def _build_overview_view(
-    subjects: list[dict[str, Any]],
+def _subject_card(
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]] | None,
+    kind: str,
+    subject: dict[str, Any],
     thresholds: dict[str, Any],
+    build: Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]],
 ) -> dict[str, Any]:
-    """Build the overview view with gauges and apexcharts."""
+    """Return a subject's card subtree, rebuilt only when its inputs changed.
+
+    The cache maps (view kind, entry_id) to (input hash, card); inputs are
+    the subject's entity map, name, meals and the thresholds.
+    """
+    if card_cache is None:
+        return build(subject, thresholds)
+    key = (kind, subject["entry_id"])
+    input_hash = _digest((subject, thresholds))
+    cached = card_cache.get(key)
+    if cached is None or cached[0] != input_hash:
+        cached = card_cache[key] = (input_hash, build(subject, thresholds))
+    return cached[1]
+
+
+def _overview_subject_card(
+    subject: dict[str, Any],
+    thresholds: dict[str, Any],
+) -> dict[str, Any]:
+    """Build one subject's gauge and status card (overview)."""
     crit = thresholds.get("critical_low", 55)
     very_low = thresholds.get("very_low", 100)
     low = thresholds.get("low", 200)
@@ -220,19 +289,115 @@ def _build_overview_view(
     very_high = thresholds.get("very_high", 400)
     yaxis_max = _yaxis_max(thresholds)
 
+    ents = subject["entities"]
+    subject_cards: list[dict[str, Any]] = [
+        {"type": "markdown", "content": f"## {subject['name']}"},
+    ]
+
+    row_cards: list[dict[str, Any]] = []
+    glucose_entity = ents.get("glucose_value")
+    link_status_entity = ents.get("link_status")
+    reading_age_entity = ents.get("reading_age")
+
+    if glucose_entity:
+        # Gauge: only when sensor has a valid (numeric) reading
+        row_cards.append({
+            "type": "conditional",
+            "conditions": [
+                {"condition": "state", "entity": glucose_entity, "state_not": "unavailable"},
+                {"condition": "state", "entity": glucose_entity, "state_not": "unknown"},
+            ],
+            "card": {
+                "type": "gauge",
+                "entity": glucose_entity,
+                "name": "Glucose",
+                "unit": "mg/dL",
+                "min": 20,
+                "max": yaxis_max,
+                "needle": True,
+                "segments": [
+                    {"from": 0, "color": _GAUGE_CRITICAL, "label": "Kritisch"},
+                    {"from": crit, "color": _GAUGE_VERY_LOW, "label": "Sehr niedrig"},
+                    {"from": very_low, "color": _GAUGE_LOW, "label": "Niedrig"},
+                    {"from": low, "color": _GAUGE_NORMAL, "label": "Normal"},
+                    {"from": high, "color": _GAUGE_HIGH, "label": "Hoch"},
+                    {"from": very_high, "color": _GAUGE_VERY_HIGH, "label": "Sehr hoch"},
+                ],
+            },
+        })
+        # Warning card when signal is lost
+        if link_status_entity:
+            row_cards.append({
+                "type": "conditional",
+                "conditions": [
+                    {"condition": "state", "entity": link_status_entity, "state": "lost"},
+                ],
+                "card": {
+                    "type": "markdown",
+                    "content": "## ⚠\n\n**Kein Messwert**\nSensor nicht verfuegbar",
+                },
+            })
+        else:
+            for no_data_state in ["unavailable", "unknown"]:
+                row_cards.append({
+                    "type": "conditional",
+                    "conditions": [
+                        {"condition": "state", "entity": glucose_entity, "state": no_data_state},
+                    ],
+                    "card": {
+                        "type": "markdown",
+                        "content": "## ⚠\n\n**Kein Messwert**\nSensor nicht verfuegbar",
+                    },
+                })
+
+    # Right column: 4 entities (Glucose, Trend, Since, Coverage)
+    status_entities = []
+    for key, label in [
+        ("glucose_value", "Glucose"),
+        ("glucose_trend", "Trend"),
+    ]:
+        if key in ents:
+            status_entities.append({"entity": ents[key], "name": label})
+
+    if reading_age_entity:
+        status_entities.append({"entity": reading_age_entity, "name": "Since"})
+
+    comp_today_entity = ents.get("data_completeness_today")
+    if comp_today_entity:
+        status_entities.append({"entity": comp_today_entity, "name": "Coverage"})
+
+    if status_entities:
+        right_column = {"type": "entities", "entities": status_entities}
+        row_cards.append(right_column)
+
+    if row_cards:
+        subject_cards.append({"type": "horizontal-stack", "cards": row_cards})
+
+    return {"type": "vertical-stack", "cards": subject_cards}
+
+
+def _build_overview_view(
+    subjects: list[dict[str, Any]],
+    thresholds: dict[str, Any],
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]] | None = None,
+) -> dict[str, Any]:
+    """Build the overview view with gauges and apexcharts."""
+    yaxis_max = _yaxis_max(thresholds)
+
     cards: list[dict[str, Any]] = []
 
     # ApexCharts: all subjects in one chart with 6-zone threshold areas
     series = []
     for i, subject in enumerate(subjects):
-        entity_id = subject["entities"].get("glucose_value")
-        if entity_id:
-            series.append({
-                "entity": entity_id,
-                "name": subject["name"],
-                "stroke_width": 2,
-                "color": _SUBJECT_COLORS[i % len(_SUBJECT_COLORS)],
-            })
+        subject_series = _glucose_series(
+            subject["entities"],
+            "6h",
+            name=subject["name"],
+            stroke_width=2,
+            color=_SUBJECT_COLORS[i % len(_SUBJECT_COLORS)],
+        )
+        if subject_series:
+            series.append(subject_series)
 
     if series:
         cards.append({
@@ -261,93 +426,10 @@ def _build_overview_view(
             "series": series,
         })
 
-    # Per subject: gauge + info
     for subject in subjects:
-        ents = subject["entities"]
-        subject_cards: list[dict[str, Any]] = [
-            {"type": "markdown", "content": f"## {subject['name']}"},
-        ]
-
-        row_cards: list[dict[str, Any]] = []
-        glucose_entity = ents.get("glucose_value")
-        link_status_entity = ents.get("link_status")
-        reading_age_entity = ents.get("reading_age")
-
-        if glucose_entity:
-            # Gauge: only when sensor has a valid (numeric) reading
-            row_cards.append({
-                "type": "conditional",
-                "conditions": [
-                    {"condition": "state", "entity": glucose_entity, "state_not": "unavailable"},
-                    {"condition": "state", "entity": glucose_entity, "state_not": "unknown"},
-                ],
-                "card": {
-                    "type": "gauge",
-                    "entity": glucose_entity,
-                    "name": "Glucose",
-                    "unit": "mg/dL",
-                    "min": 20,
-                    "max": yaxis_max,
-                    "needle": True,
-                    "segments": [
-                        {"from": 0, "color": _GAUGE_CRITICAL, "label": "Kritisch"},
-                        {"from": crit, "color": _GAUGE_VERY_LOW, "label": "Sehr niedrig"},
-                        {"from": very_low, "color": _GAUGE_LOW, "label": "Niedrig"},
-                        {"from": low, "color": _GAUGE_NORMAL, "label": "Normal"},
-                        {"from": high, "color": _GAUGE_HIGH, "label": "Hoch"},
-                        {"from": very_high, "color": _GAUGE_VERY_HIGH, "label": "Sehr hoch"},
-                    ],
-                },
-            })
-            # Warning card when signal is lost
-            if link_status_entity:
-                row_cards.append({
-                    "type": "conditional",
-                    "conditions": [
-                        {"condition": "state", "entity": link_status_entity, "state": "lost"},
-                    ],
-                    "card": {
-                        "type": "markdown",
-                        "content": "## ⚠\n\n**Kein Messwert**\nSensor nicht verfuegbar",
-                    },
-                })
-            else:
-                for no_data_state in ["unavailable", "unknown"]:
-                    row_cards.append({
-                        "type": "conditional",
-                        "conditions": [
-                            {"condition": "state", "entity": glucose_entity, "state": no_data_state},
-                        ],
-                        "card": {
-                            "type": "markdown",
-                            "content": "## ⚠\n\n**Kein Messwert**\nSensor nicht verfuegbar",
-                        },
-                    })
-
-        # Right column: 4 entities (Glucose, Trend, Since, Coverage)
-        status_entities = []
-        for key, label in [
-            ("glucose_value", "Glucose"),
-            ("glucose_trend", "Trend"),
-        ]:
-            if key in ents:
-                status_entities.append({"entity": ents[key], "name": label})
-
-        if reading_age_entity:
-            status_entities.append({"entity": reading_age_entity, "name": "Since"})
-
-        comp_today_entity = ents.get("data_completeness_today")
-        if comp_today_entity:
-            status_entities.append({"entity": comp_today_entity, "name": "Coverage"})
-
-        if status_entities:
-            right_column = {"type": "entities", "entities": status_entities}
-            row_cards.append(right_column)
-
-        if row_cards:
-            subject_cards.append({"type": "horizontal-stack", "cards": row_cards})
-
-        cards.append({"type": "vertical-stack", "cards": subject_cards})
+        cards.append(
+            _subject_card(card_cache, "overview", subject, thresholds, _overview_subject_card)
+        )
 
     return {
         "title": "Uebersicht",
@@ -357,211 +439,288 @@ def _build_overview_view(
     }
 
 
-def _build_input_view(
-    subjects: list[dict[str, Any]],
+def _input_subject_card(
+    subject: dict[str, Any],
     thresholds: dict[str, Any],
 ) -> dict[str, Any]:
-    """Build the input view: mini-graph, status, form buttons, conditional forms, events."""
+    """Build one subject's status, mini graph and entry forms (input view)."""
     yaxis_max = _yaxis_max(thresholds)
-    cards: list[dict[str, Any]] = []
-
-    for subject in subjects:
-        ents = subject["entities"]
-        subject_name = subject["name"]
-        subject_cards: list[dict[str, Any]] = [
-            {"type": "markdown", "content": f"## {subject_name}"},
-        ]
+    ents = subject["entities"]
+    subject_name = subject["name"]
+    subject_cards: list[dict[str, Any]] = [
+        {"type": "markdown", "content": f"## {subject_name}"},
+    ]
 
-        glucose_entity = ents.get("glucose_value")
-        status_entity = ents.get("glucose_status", "")
-        trend_entity = ents.get("glucose_trend", "")
-        insulin_entity = ents.get("daily_insulin_total", "")
-        bes_entity = ents.get("daily_bes_total", "")
-        form_mode_entity = ents.get("form_mode")
-        meal_entity = ents.get("meal")
-        be_entity = ents.get("be_amount")
-        minutes_entity = ents.get("minutes_ago")
-        log_feeding_entity = ents.get("log_feeding")
-        insulin_type_entity = ents.get("insulin_type")
-        insulin_units_entity = ents.get("insulin_units")
-        log_insulin_entity = ents.get("log_insulin")
-        events_entity = ents.get("recent_events")
-
-        # 1. Status line (first, before graph)
-        if glucose_entity:
+    glucose_entity = ents.get("glucose_value")
+    status_entity = ents.get("glucose_status")
+    status_line_entity = ents.get("status_line")
+    form_mode_entity = ents.get("form_mode")
+    meal_entity = ents.get("meal")
+    be_entity = ents.get("be_amount")
+    minutes_entity = ents.get("minutes_ago")
+    log_feeding_entity = ents.get("log_feeding")
+    insulin_type_entity = ents.get("insulin_type")
+    insulin_units_entity = ents.get("insulin_units")
+    log_insulin_entity = ents.get("log_insulin")
+    events_entity = ents.get("recent_events")
+
+    # 1. Status line (first, before graph). The text is rendered by the
+    # coordinator (status_line sensor); the tile color follows the glucose
+    # status through conditional cards, so no server-side template is needed.
+    if status_line_entity:
+        status_tile = {
+            "type": "tile",
+            "entity": status_line_entity,
+            "name": "Status",
+            "vertical": False,
+        }
+        if status_entity:
+            for states, color in (
+                (["critical_low", "very_high"], "red"),
+                (["very_low", "low", "high"], "amber"),
+            ):
+                subject_cards.append({
+                    "type": "conditional",
+                    "conditions": [
+                        {"condition": "state", "entity": status_entity, "state": states},
+                    ],
+                    "card": {**status_tile, "color": color},
+                })
             subject_cards.append({
-                "type": "markdown",
-                "content": (
-                    f"{{% set val = states('{glucose_entity}') %}}"
-                    f"{{% set status = states('{status_entity}') %}}"
-                    f"{{% set trend = states('{trend_entity}') %}}"
-                    "{% if status in ['critical_low', 'very_high'] %}"
-                    "**! Glucose: {{ val }} mg/dL !**"
-                    "{% elif status in ['very_low', 'low', 'high'] %}"
-                    "**Glucose: {{ val }} mg/dL**"
-                    "{% else %}"
-                    "Glucose: {{ val }} mg/dL"
-                    "{% endif %}"
-                    " | Trend: {{ trend }}"
-                    f" | Insulin heute: {{{{ states('{insulin_entity}') }}}} IU"
-                    f" | BE heute: {{{{ states('{bes_entity}') }}}}"
-                ),
+                "type": "conditional",
+                "conditions": [
+                    {
+                        "condition": "state",
+                        "entity": status_entity,
+                        "state_not": ["critical_low", "very_high", "very_low", "low", "high"],
+                    },
+                ],
+                "card": status_tile,
             })
+        else:
+            subject_cards.append(status_tile)
 
-        # 2. Mini graph: last 3h, threshold lines only (no fill)
-        if glucose_entity:
-            subject_cards.append({
-                "type": "custom:apexcharts-card",
-                "header": {"show": False},
-                "graph_span": "3h",
-                "apex_config": {
-                    "chart": {"height": 300, "toolbar": {"show": False}},
-                    "legend": {"show": False},
-                    "yaxis": {
-                        "min": 0,
-                        "max": yaxis_max,
-                        "tickAmount": yaxis_max // 50,
-                        "forceNiceScale": False,
-                        "decimalsInFloat": 0,
-                    },
-                    "annotations": {
-                        "yaxis": _zone_annotations_lines(thresholds),
-                    },
+    # 2. Mini graph: last 3h, threshold lines only (no fill)
+    if glucose_entity:
+        subject_cards.append({
+            "type": "custom:apexcharts-card",
+            "header": {"show": False},
+            "graph_span": "3h",
+            "apex_config": {
+                "chart": {"height": 300, "toolbar": {"show": False}},
+                "legend": {"show": False},
+                "yaxis": {
+                    "min": 0,
+                    "max": yaxis_max,
+                    "tickAmount": yaxis_max // 50,
+                    "forceNiceScale": False,
+                    "decimalsInFloat": 0,
                 },
-                "series": [{
-                    "entity": glucose_entity,
-                    "name": subject_name,
-                    "stroke_width": 2,
-                    "color": _SUBJECT_COLORS[0],
-                }],
-            })
+                "annotations": {
+                    "yaxis": _zone_annotations_lines(thresholds),
+                },
+            },
+            "series": [
+                _glucose_series(
+                    ents, "3h", name=subject_name, stroke_width=2, color=_SUBJECT_COLORS[0]
+                ),
+            ],
+        })
 
-        # 3. Three action buttons: Fuetterung | Insulin | Liste
-        if form_mode_entity:
+    # 3. Three action buttons: Fuetterung | Insulin | Liste
+    if form_mode_entity:
 
-            def _toggle_btn(icon: str, option: str) -> dict[str, Any]:
-                return {
-                    "type": "button",
-                    "name": "",
-                    "icon": icon,
-                    "tap_action": {
-                        "action": "call-service",
-                        "service": "select.select_option",
-                        "service_data": {"entity_id": form_mode_entity, "option": option},
-                    },
-                    "show_state": False,
-                }
+        def _toggle_btn(icon: str, option: str) -> dict[str, Any]:
+            return {
+                "type": "button",
+                "name": "",
+                "icon": icon,
+                "tap_action": {
+                    "action": "call-service",
+                    "service": "select.select_option",
+                    "service_data": {"entity_id": form_mode_entity, "option": option},
+                },
+                "show_state": False,
+            }
 
-            subject_cards.append({
-                "type": "horizontal-stack",
-                "cards": [
-                    _toggle_btn("mdi:food-apple", "feeding"),
-                    _toggle_btn("mdi:needle", "insulin"),
-                    _toggle_btn("mdi:clipboard-list-outline", "list"),
+        subject_cards.append({
+            "type": "horizontal-stack",
+            "cards": [
+                _toggle_btn("mdi:food-apple", "feeding"),
+                _toggle_btn("mdi:needle", "insulin"),
+                _toggle_btn("mdi:clipboard-list-outline", "list"),
+            ],
+        })
+
+    # 4. Conditional: feeding form
+    if form_mode_entity and meal_entity and be_entity and minutes_entity:
+        feeding_inner_cards: list[dict[str, Any]] = [
+            {
+                "type": "entities",
+                "title": "Fuetterung",
+                "entities": [
+                    {"entity": meal_entity, "name": "Mahlzeit"},
+                    {"entity": be_entity, "name": "BE"},
+                    {"entity": minutes_entity, "name": "Vor ___ Minuten"},
                 ],
+            },
+        ]
+        if log_feeding_entity:
+            feeding_inner_cards.append({
+                "type": "button",
+                "name": "Speichern",
+                "icon": "mdi:content-save",
+                "tap_action": {
+                    "action": "call-service",
+                    "service": "button.press",
+                    "service_data": {"entity_id": log_feeding_entity},
+                },
             })
+        subject_cards.append({
+            "type": "conditional",
+            "conditions": [
+                {"condition": "state", "entity": form_mode_entity, "state": "feeding"},
+            ],
+            "card": {"type": "vertical-stack", "cards": feeding_inner_cards},
+        })
 
-        # 4. Conditional: feeding form
-        if form_mode_entity and meal_entity and be_entity and minutes_entity:
-            feeding_inner_cards: list[dict[str, Any]] = [
-                {
-                    "type": "entities",
-                    "title": "Fuetterung",
-                    "entities": [
-                        {"entity": meal_entity, "name": "Mahlzeit"},
-                        {"entity": be_entity, "name": "BE"},
-                        {"entity": minutes_entity, "name": "Vor ___ Minuten"},
-                    ],
+    # 5. Conditional: insulin form
+    if form_mode_entity and insulin_type_entity and insulin_units_entity:
+        insulin_fields = [
+            {"entity": insulin_type_entity, "name": "Typ"},
+            {"entity": insulin_units_entity, "name": "IU"},
+        ]
+        if minutes_entity:
+            insulin_fields.append({"entity": minutes_entity, "name": "Vor ___ Minuten"})
+        insulin_inner_cards: list[dict[str, Any]] = [
+            {
+                "type": "entities",
+                "title": "Insulin",
+                "entities": insulin_fields,
+            },
+        ]
+        if log_insulin_entity:
+            insulin_inner_cards.append({
+                "type": "button",
+                "name": "Speichern",
+                "icon": "mdi:content-save",
+                "tap_action": {
+                    "action": "call-service",
+                    "service": "button.press",
+                    "service_data": {"entity_id": log_insulin_entity},
                 },
-            ]
-            if log_feeding_entity:
-                feeding_inner_cards.append({
-                    "type": "button",
-                    "name": "Speichern",
-                    "icon": "mdi:content-save",
-                    "tap_action": {
-                        "action": "call-service",
-                        "service": "button.press",
-                        "service_data": {"entity_id": log_feeding_entity},
-                    },
-                })
-            subject_cards.append({
+            })
+        subject_cards.append({
+            "type": "conditional",
+            "conditions": [
+                {"condition": "state", "entity": form_mode_entity, "state": "insulin"},
+            ],
+            "card": {"type": "vertical-stack", "cards": insulin_inner_cards},
+        })
+
+    # 6. Conditional: events list (visible only when form_mode="list")
+    if form_mode_entity and events_entity:
+        close_btn: dict[str, Any] = {
+            "type": "button",
+            "name": "Schliessen",
+            "icon": "mdi:chevron-up",
+            "tap_action": {
+                "action": "call-service",
+                "service": "select.select_option",
+                "service_data": {"entity_id": form_mode_entity, "option": "—"},
+            },
+        }
+        # One attribute row per listed event; row n shows while the sensor
+        # (today's event count) is at least n, so no template is rendered
+        event_rows: list[dict[str, Any]] = [
+            {"entity": events_entity, "name": "Eintraege heute"},
+        ]
+        for n in range(1, RECENT_EVENTS_SHOWN + 1):
+            event_rows.append({
                 "type": "conditional",
                 "conditions": [
-                    {"condition": "state", "entity": form_mode_entity, "state": "feeding"},
+                    {
+                        "entity": events_entity,
+                        "state_not": ["unavailable", "unknown", *map(str, range(n))],
+                    },
                 ],
-                "card": {"type": "vertical-stack", "cards": feeding_inner_cards},
+                "row": {
+                    "type": "attribute",
+                    "entity": events_entity,
+                    "attribute": f"entry_{n}",
+                    "name": " ",
+                },
             })
+        events_list: dict[str, Any] = {"type": "entities", "entities": event_rows}
+        subject_cards.append({
+            "type": "conditional",
+            "conditions": [
+                {"condition": "state", "entity": form_mode_entity, "state": "list"},
+            ],
+            "card": {"type": "vertical-stack", "cards": [close_btn, events_list]},
+        })
 
-        # 5. Conditional: insulin form
-        if form_mode_entity and insulin_type_entity and insulin_units_entity:
-            insulin_fields = [
-                {"entity": insulin_type_entity, "name": "Typ"},
-                {"entity": insulin_units_entity, "name": "IU"},
-            ]
-            if minutes_entity:
-                insulin_fields.append({"entity": minutes_entity, "name": "Vor ___ Minuten"})
-            insulin_inner_cards: list[dict[str, Any]] = [
+    return {"type": "vertical-stack", "cards": subject_cards}
+
+
+def _build_input_view(
+    subjects: list[dict[str, Any]],
+    thresholds: dict[str, Any],
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]] | None = None,
+    group: str | None = None,
+) -> dict[str, Any]:
+    """Build the input view: mini-graph, status, form buttons, conditional forms, events.
+
+    On a group page the round buttons only log for the group's subjects.
+    """
+    cards: list[dict[str, Any]] = []
+
+    # Herd round: one button per meal logs it for every subject that has it
+    if len(subjects) > 1:
+        round_data: dict[str, Any] = {"event_type": "feeding"}
+        if group is not None:
+            round_data["subjects"] = [subject["name"] for subject in subjects]
+        meal_names: list[str] = []
+        for subject in subjects:
+            for name in subject.get("meals", []):
+                if name not in meal_names:
+                    meal_names.append(name)
+        if meal_names:
+            round_buttons = [
                 {
-                    "type": "entities",
-                    "title": "Insulin",
-                    "entities": insulin_fields,
-                },
-            ]
-            if log_insulin_entity:
-                insulin_inner_cards.append({
                     "type": "button",
-                    "name": "Speichern",
-                    "icon": "mdi:content-save",
+                    "name": name,
+                    "icon": "mdi:food-apple",
                     "tap_action": {
                         "action": "call-service",
-                        "service": "button.press",
-                        "service_data": {"entity_id": log_insulin_entity},
+                        "service": f"{DOMAIN}.{SERVICE_LOG_ROUND}",
+                        "service_data": {**round_data, "meal": name},
+                        "confirmation": {
+                            "text": (
+                                f"{name} fuer alle Profile speichern?"
+                                if group is None
+                                else f"{name} fuer alle Profile in {group} speichern?"
+                            ),
+                        },
                     },
-                })
-            subject_cards.append({
-                "type": "conditional",
-                "conditions": [
-                    {"condition": "state", "entity": form_mode_entity, "state": "insulin"},
-                ],
-                "card": {"type": "vertical-stack", "cards": insulin_inner_cards},
-            })
-
-        # 6. Conditional: events list (visible only when form_mode="list")
-        if form_mode_entity and events_entity:
-            close_btn: dict[str, Any] = {
-                "type": "button",
-                "name": "Schliessen",
-                "icon": "mdi:chevron-up",
-                "tap_action": {
-                    "action": "call-service",
-                    "service": "select.select_option",
-                    "service_data": {"entity_id": form_mode_entity, "option": "—"},
-                },
-            }
-            events_markdown: dict[str, Any] = {
-                "type": "markdown",
-                "content": (
-                    "**Eintraege heute**\n\n"
-                    f"{{% set evts = state_attr('{events_entity}', 'events') or [] %}}"
-                    "{% if evts | length > 0 %}"
-                    "{% for e in evts %}"
-                    "{{ e.label }}\n\n"
-                    "{% endfor %}"
-                    "{% else %}"
-                    "_Noch keine Eintraege heute._"
-                    "{% endif %}"
-                ),
-            }
-            subject_cards.append({
-                "type": "conditional",
-                "conditions": [
-                    {"condition": "state", "entity": form_mode_entity, "state": "list"},
+                }
+                for name in meal_names
+            ]
+            cards.append({
+                "type": "vertical-stack",
+                "cards": [
+                    {
+                        "type": "markdown",
+                        "content": f"## {group or 'Herde'}: Fuetterungsrunde",
+                    },
+                    {"type": "grid", "columns": 3, "square": False, "cards": round_buttons},
                 ],
-                "card": {"type": "vertical-stack", "cards": [close_btn, events_markdown]},
             })
 
-        cards.append({"type": "vertical-stack", "cards": subject_cards})
+    for subject in subjects:
+        cards.append(
+            _subject_card(card_cache, "input", subject, thresholds, _input_subject_card)
+        )
 
     return {
         "title": "Eingabe",
@@ -571,146 +730,398 @@ def _build_input_view(
     }
 
 
+def _stats_subject_card(
+    subject: dict[str, Any],
+    thresholds: dict[str, Any],
+) -> dict[str, Any]:
+    """Build one subject's zone distribution, details and glucose chart (stats view)."""
+    yaxis_max = _yaxis_max(thresholds)
+    ents = subject["entities"]
+    subject_cards: list[dict[str, Any]] = [
+        {"type": "markdown", "content": f"## {subject['name']}"},
+    ]
+
+    # 6-zone distribution as donut chart
+    zone_series = []
+    for key, name, color in _ZONES:
+        if key in ents:
+            zone_series.append({
+                "entity": ents[key],
+                "name": name,
+                "color": color,
+            })
+
+    if zone_series:
+        subject_cards.append({
+            "type": "custom:apexcharts-card",
+            "chart_type": "donut",
+            "header": {
+                "show": True,
+                "title": "Zeit im Zielbereich",
+            },
+            "apex_config": {
+                "chart": {"height": 220},
+                "legend": {"show": True, "position": "bottom"},
+                "dataLabels": {"enabled": True},
+            },
+            "series": zone_series,
+        })
+
+        # Details: insulin, feeding, completeness
+        detail_entities = []
+        for key, label in [
+            ("daily_insulin_total", "Insulin gesamt"),
+            ("daily_bes_total", "Fuetterung gesamt"),
+        ]:
+            if key in ents:
+                detail_entities.append({"entity": ents[key], "name": label})
+
+        comp_range_entity = ents.get("data_completeness_range")
+        if comp_range_entity:
+            detail_entities.append({"entity": comp_range_entity, "name": "Signalabdeckung"})
+            detail_entities.append({
+                "type": "attribute",
+                "entity": comp_range_entity,
+                "attribute": "missed_minutes",
+                "name": "Verpasst (min)",
+            })
+
+        if detail_entities:
+            subject_cards.append({
+                "type": "entities",
+                "title": "Details",
+                "entities": detail_entities,
+            })
+
+    # Glucose chart with zoom/pan and 6-zone line annotations
+    glucose_entity = ents.get("glucose_value")
+    if glucose_entity:
+        subject_cards.append({
+            "type": "custom:apexcharts-card",
+            "header": {
+                "show": True,
+                "title": f"{subject['name']} - Glucose-Verlauf",
+            },
+            "graph_span": "24h",
+            "apex_config": {
+                "chart": {
+                    "height": 300,
+                    "toolbar": {
+                        "show": True,
+                        "tools": {
+                            "download": True,
+                            "selection": True,
+                            "zoom": True,
+                            "zoomin": True,
+                            "zoomout": True,
+                            "pan": True,
+                            "reset": True,
+                        },
+                    },
+                },
+                "yaxis": {
+                    "min": 0,
+                    "max": yaxis_max,
+                    "opposite": True,
+                    "tickAmount": yaxis_max // 50,
+                    "forceNiceScale": False,
+                    "decimalsInFloat": 0,
+                },
+                "annotations": {
+                    "yaxis": _zone_annotations_lines(thresholds),
+                },
+            },
+            "series": [
+                _glucose_series(
+                    ents,
+                    "24h",
+                    name=subject["name"],
+                    type="line",
+                    color="#2196F3",
+                    stroke_width=2,
+                ),
+            ],
+        })
+
+    return {"type": "vertical-stack", "cards": subject_cards}
+
+
+def _daily_charts(
+    subjects: list[dict[str, Any]], span: str, thresholds: dict[str, Any]
+) -> dict[str, Any]:
+    """Build the per-day charts of a day-scale range (e.g. "30d").
+
+    One stacked column chart of the daily zone shares per subject and one
+    coverage chart for the herd, all fed from the glucose_chart sensor's
+    daily statistics (rollups) instead of recorder history. Ranges the
+    sensor also serves as a downsampled series (CHART_SPAN_HOURS, e.g. 7d)
+    get a glucose chart of the herd on top.
+    """
+    cards: list[dict[str, Any]] = []
+    coverage_series = []
+    glucose_series = []
+    for i, subject in enumerate(subjects):
+        chart_entity = subject["entities"].get("glucose_chart")
+        if not chart_entity:
+            continue
+        if span in CHART_SPAN_HOURS:
+            glucose_series.append(_glucose_series(
+                subject["entities"],
+                span,
+                name=subject["name"],
+                stroke_width=1,
+                color=_SUBJECT_COLORS[i % len(_SUBJECT_COLORS)],
+            ))
+        coverage_series.append({
+            "entity": chart_entity,
+            "name": subject["name"],
+            "type": "line",
+            "color": _SUBJECT_COLORS[i % len(_SUBJECT_COLORS)],
+            "stroke_width": 2,
+            "data_generator": (
+                "return (entity.attributes.daily || []).map(d => [d.t, d.coverage]);"
+            ),
+        })
+        cards.append({
+            "type": "custom:apexcharts-card",
+            "header": {"show": True, "title": f"{subject['name']} - Zonen pro Tag"},
+            "graph_span": span,
+            "span": {"end": "day"},
+            "stacked": True,
+            "apex_config": {
+                "chart": {"height": 250},
+                "legend": {"show": True, "position": "bottom"},
+                "yaxis": {"min": 0, "max": 100, "decimalsInFloat": 0},
+            },
+            "series": [
+                {
+                    "entity": chart_entity,
+                    "name": name,
+                    "type": "column",
+                    "color": color,
+                    "data_generator": (
+                        "return (entity.attributes.daily || [])"
+                        f".map(d => [d.t, d.zones[{index}]]);"
+                    ),
+                }
+                for index, (_key, name, color) in enumerate(_ZONES)
+            ],
+        })
+    if coverage_series:
+        cards.insert(0, {
+            "type": "custom:apexcharts-card",
+            "header": {"show": True, "title": "Signalabdeckung pro Tag"},
+            "graph_span": span,
+            "span": {"end": "day"},
+            "apex_config": {
+                "chart": {"height": 250},
+                "legend": {"show": True},
+                "yaxis": {"min": 0, "max": 100, "decimalsInFloat": 0},
+            },
+            "series": coverage_series,
+        })
+    if glucose_series:
+        yaxis_max = _yaxis_max(thresholds)
+        cards.insert(0, {
+            "type": "custom:apexcharts-card",
+            "header": {"show": True, "title": "Glucose-Verlauf (alle Profile)"},
+            "graph_span": span,
+            "apex_config": {
+                "chart": {"height": 350},
+                "legend": {"show": True},
+                "yaxis": {
+                    "min": 0,
+                    "max": yaxis_max,
+                    "opposite": True,
+                    "tickAmount": yaxis_max // 50,
+                    "forceNiceScale": False,
+                    "decimalsInFloat": 0,
+                },
+                "annotations": {
+                    "yaxis": _zone_annotations_lines(thresholds),
+                },
+            },
+            "series": glucose_series,
+        })
+    return {"type": "vertical-stack", "cards": cards}
+
+
 def _build_stats_view(
     subjects: list[dict[str, Any]],
     thresholds: dict[str, Any],
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]] | None = None,
 ) -> dict[str, Any]:
     """Build the statistics view with 6-zone distribution and charts."""
-    very_high = thresholds.get("very_high", 400)
-    yaxis_max = _yaxis_max(thresholds)
-
     cards: list[dict[str, Any]] = []
 
     # Chart timerange selector (use first subject's entity)
     for subject in subjects:
         if "chart_timerange" in subject["entities"]:
+            timerange_entity = subject["entities"]["chart_timerange"]
             cards.append({
                 "type": "entities",
                 "entities": [{
-                    "entity": subject["entities"]["chart_timerange"],
+                    "entity": timerange_entity,
                     "name": "Zeitraum",
                 }],
             })
+            # Per-day charts, shown for the selected day-scale range
+            for span in CHART_TIMERANGE_DAY_OPTIONS:
+                cards.append({
+                    "type": "conditional",
+                    "conditions": [
+                        {"condition": "state", "entity": timerange_entity, "state": span},
+                    ],
+                    "card": _daily_charts(subjects, span, thresholds),
+                })
             break
 
     for subject in subjects:
-        ents = subject["entities"]
-        subject_cards: list[dict[str, Any]] = [
-            {"type": "markdown", "content": f"## {subject['name']}"},
-        ]
+        cards.append(
+            _subject_card(card_cache, "stats", subject, thresholds, _stats_subject_card)
+        )
 
-        # 6-zone distribution as donut chart
-        zone_series = []
-        for key, name, color in [
-            ("time_critical_low_pct", "Kritisch niedrig", _COLOR_CRITICAL),
-            ("time_very_low_pct", "Sehr niedrig", _COLOR_VERY_LOW),
-            ("time_low_pct", "Niedrig", _COLOR_LOW),
-            ("time_in_range_pct", "Zielbereich", _COLOR_NORMAL),
-            ("time_high_pct", "Hoch", _COLOR_HIGH),
-            ("time_very_high_pct", "Sehr hoch", _COLOR_VERY_HIGH),
-        ]:
-            if key in ents:
-                zone_series.append({
-                    "entity": ents[key],
-                    "name": name,
-                    "color": color,
-                })
+    return {
+        "title": "Statistiken",
+        "path": "stats",
+        "icon": "mdi:chart-bar",
+        "cards": cards,
+    }
 
-        if zone_series:
-            subject_cards.append({
-                "type": "custom:apexcharts-card",
-                "chart_type": "donut",
-                "header": {
-                    "show": True,
-                    "title": "Zeit im Zielbereich",
-                },
-                "apex_config": {
-                    "chart": {"height": 220},
-                    "legend": {"show": True, "position": "bottom"},
-                    "dataLabels": {"enabled": True},
-                },
-                "series": zone_series,
-            })
 
-            # Details: insulin, feeding, completeness
-            detail_entities = []
-            for key, label in [
-                ("daily_insulin_total", "Insulin gesamt"),
-                ("daily_bes_total", "Fuetterung gesamt"),
-            ]:
-                if key in ents:
-                    detail_entities.append({"entity": ents[key], "name": label})
-
-            comp_range_entity = ents.get("data_completeness_range")
-            if comp_range_entity:
-                detail_entities.append({"entity": comp_range_entity, "name": "Signalabdeckung"})
-                detail_entities.append({
-                    "type": "attribute",
-                    "entity": comp_range_entity,
-                    "attribute": "missed_minutes",
-                    "name": "Verpasst (min)",
-                })
+def _group_subjects(
+    subjects: list[dict[str, Any]],
+) -> dict[str, list[dict[str, Any]]] | None:
+    """Return {group: subjects} (sorted by group), or None if nobody has a group."""
+    if not any(subject["group"] for subject in subjects):
+        return None
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for subject in subjects:
+        groups.setdefault(subject["group"] or _UNGROUPED, []).append(subject)
+    return dict(sorted(groups.items()))
 
-            if detail_entities:
-                subject_cards.append({
-                    "type": "entities",
-                    "title": "Details",
-                    "entities": detail_entities,
-                })
 
-        # Glucose chart with zoom/pan and 6-zone line annotations
-        glucose_entity = ents.get("glucose_value")
-        if glucose_entity:
-            subject_cards.append({
-                "type": "custom:apexcharts-card",
-                "header": {
-                    "show": True,
-                    "title": f"{subject['name']} - Glucose-Verlauf",
+def _group_slugs(groups: dict[str, list[dict[str, Any]]]) -> dict[str, str]:
+    """Return {group: path slug}, unique even if names slugify alike.
+
+    "Pen A" and "pen-a" both slugify to "pen_a"; the later one (in group
+    order) gets "pen_a_2". Names without letters or digits use "group".
+    """
+    slugs: dict[str, str] = {}
+    taken: set[str] = set()
+    for group in groups:
+        base = slugify(group) or "group"
+        slug, n = base, 2
+        while slug in taken:
+            slug, n = f"{base}_{n}", n + 1
+        taken.add(slug)
+        slugs[group] = slug
+    return slugs
+
+
+def _group_view(view: dict[str, Any], group: str, slug: str) -> dict[str, Any]:
+    """Turn a view into a group subview (reached from the herd table)."""
+    return {
+        **view,
+        "title": f"{view['title']}: {group}",
+        "path": f"{view['path']}-{slug}",
+        "subview": True,
+        "back_path": f"/{_DASHBOARD_URL}/herd",
+    }
+
+
+def _group_overview_view(
+    members: list[dict[str, Any]],
+    thresholds: dict[str, Any],
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]],
+    group: str,
+    slug: str,
+) -> dict[str, Any]:
+    """Build a group's overview subview."""
+    return _group_view(_build_overview_view(members, thresholds, card_cache), group, slug)
+
+
+def _group_input_view(
+    members: list[dict[str, Any]],
+    thresholds: dict[str, Any],
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]],
+    group: str,
+    slug: str,
+) -> dict[str, Any]:
+    """Build a group's input subview (rounds limited to the group)."""
+    return _group_view(
+        _build_input_view(members, thresholds, card_cache, group), group, slug
+    )
+
+
+def _group_stats_view(
+    members: list[dict[str, Any]],
+    thresholds: dict[str, Any],
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]],
+    group: str,
+    slug: str,
+) -> dict[str, Any]:
+    """Build a group's statistics subview."""
+    return _group_view(_build_stats_view(members, thresholds, card_cache), group, slug)
+
+
+def _build_herd_view(
+    groups: dict[str, list[dict[str, Any]]], slugs: dict[str, str]
+) -> dict[str, Any]:
+    """Build the herd table: current glucose of every subject, per group.
+
+    Only plain states are shown (no charts or history); tapping a subject
+    or a page button opens the group's pages.
+    """
+    cards: list[dict[str, Any]] = []
+    for group, members in groups.items():
+        slug = slugs[group]
+        entities = [
+            {
+                "entity": member["entities"]["glucose_value"],
+                "name": member["name"],
+                "tap_action": {
+                    "action": "navigate",
+                    "navigation_path": f"/{_DASHBOARD_URL}/overview-{slug}",
                 },
-                "graph_span": "24h",
-                "apex_config": {
-                    "chart": {
-                        "height": 300,
-                        "toolbar": {
-                            "show": True,
-                            "tools": {
-                                "download": True,
-                                "selection": True,
-                                "zoom": True,
-                                "zoomin": True,
-                                "zoomout": True,
-                                "pan": True,
-                                "reset": True,
-                            },
-                        },
-                    },
-                    "yaxis": {
-                        "min": 0,
-                        "max": yaxis_max,
-                        "opposite": True,
-                        "tickAmount": yaxis_max // 50,
-                        "forceNiceScale": False,
-                        "decimalsInFloat": 0,
-                    },
-                    "annotations": {
-                        "yaxis": _zone_annotations_lines(thresholds),
-                    },
+            }
+            for member in members
+            if "glucose_value" in member["entities"]
+        ]
+        page_buttons = [
+            {
+                "type": "button",
+                "name": title,
+                "icon": icon,
+                "tap_action": {
+                    "action": "navigate",
+                    "navigation_path": f"/{_DASHBOARD_URL}/{path}-{slug}",
                 },
-                "series": [{
-                    "entity": glucose_entity,
-                    "name": subject["name"],
-                    "type": "line",
-                    "color": "#2196F3",
-                    "stroke_width": 2,
-                }],
-            })
-
-        cards.append({"type": "vertical-stack", "cards": subject_cards})
+            }
+            for title, path, icon in (
+                ("Uebersicht", "overview", "mdi:view-dashboard"),
+                ("Eingabe", "input", "mdi:pencil-plus"),
+                ("Statistiken", "stats", "mdi:chart-bar"),
+            )
+        ]
+        cards.append({
+            "type": "vertical-stack",
+            "cards": [
+                {
+                    "type": "glance",
+                    "title": f"{group} ({len(members)})",
+                    "columns": 6,
+                    "show_icon": False,
+                    "entities": entities,
+                },
+                {"type": "grid", "columns": 3, "square": False, "cards": page_buttons},
+            ],
+        })
 
     return {
-        "title": "Statistiken",
-        "path": "stats",
-        "icon": "mdi:chart-bar",
+        "title": "Herde",
+        "path": "herd",
+        "icon": "mdi:table",
         "cards": cards,
     }
 
@@ -766,6 +1177,54 @@ def _build_settings_view(
     }
 
 
+@callback
+def schedule_dashboard_update(hass: HomeAssistant) -> None:
+    """Request a debounced, herd-level dashboard rebuild.
+
+    Before Home Assistant has started the build is deferred until it has
+    (all entries are set up by then), so N subjects loading at startup
+    produce one build instead of N. Afterwards, requests within
+    _UPDATE_COOLDOWN collapse into one build.
+    """
+    domain_data = hass.data.get(DOMAIN)
+    if domain_data is None:
+        return
+
+    if hass.state is not CoreState.running:
+        if "dashboard_start_unsub" not in domain_data:
+
+            @callback
+            def _started(_event: Event) -> None:
+                domain_data.pop("dashboard_start_unsub", None)
+                schedule_dashboard_update(hass)
+
+            domain_data["dashboard_start_unsub"] = hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STARTED, _started
+            )
+        return
+
+    debouncer: Debouncer | None = domain_data.get("dashboard_debouncer")
+    if debouncer is None:
+        debouncer = domain_data["dashboard_debouncer"] = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=_UPDATE_COOLDOWN,
+            immediate=False,
+            function=partial(async_update_dashboard, hass),
+        )
+    debouncer.async_schedule_call()
+
+
+@callback
+def async_cancel_dashboard_update(hass: HomeAssistant) -> None:
+    """Drop a pending or deferred rebuild (last entry unloaded)."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if (unsub := domain_data.pop("dashboard_start_unsub", None)) is not None:
+        unsub()
+    if (debouncer := domain_data.pop("dashboard_debouncer", None)) is not None:
+        debouncer.async_cancel()
+
+
 async def async_update_dashboard(hass: HomeAssistant) -> None:
     """Generate and save the GlucoFarmer dashboard automatically.
 
@@ -780,30 +1239,98 @@ async def async_update_dashboard(hass: HomeAssistant) -> None:
     domain_data = hass.data.get(DOMAIN, {})
     thresholds = domain_data.get("thresholds", _DEFAULT_THRESHOLDS)
 
-    # Collect subject data from entity registry
+    # Collect subject data (entity maps come from the cached registry index)
+    entity_index = async_get_entity_index(hass)
     subjects: list[dict[str, Any]] = []
     for entry in entries:
         if not entry.data.get(CONF_SUBJECT_NAME):
             continue
-        entities = _get_subject_entities(hass, entry.entry_id)
+        entities = entity_index.subject_entities(entry.entry_id)
         subjects.append({
             "name": entry.data[CONF_SUBJECT_NAME],
             "entry_id": entry.entry_id,
             "entities": entities,
+            "meals": [m["name"] for m in entry.options.get(CONF_MEALS, [])],
+            "group": entry.options.get(CONF_SUBJECT_GROUP, ""),
         })
 
     if not subjects:
         return
 
-    # Build dashboard config
-    config = {
-        "views": [
-            _build_overview_view(subjects, thresholds),
-            _build_input_view(subjects, thresholds),
-            _build_stats_view(subjects, thresholds),
-            _build_settings_view(subjects),
-        ],
-    }
+    # Build dashboard config. Each view is only rebuilt when its inputs
+    # changed since the last run (cached as (input hash, view) per view), and
+    # within a view only the subjects whose inputs changed (card cache).
+    view_cache: dict[str, tuple[str, dict[str, Any]]] = domain_data.setdefault(
+        "dashboard_views", {}
+    )
+    card_cache: dict[tuple[str, str], tuple[str, dict[str, Any]]] = domain_data.setdefault(
+        "dashboard_cards", {}
+    )
+    entry_ids = {subject["entry_id"] for subject in subjects}
+    for key in [key for key in card_cache if key[1] not in entry_ids]:
+        del card_cache[key]
+    builders: list[tuple[str, Callable[[], dict[str, Any]], Any]]
+    groups = _group_subjects(subjects)
+    if groups is None:
+        builders = [
+            (
+                "overview",
+                lambda: _build_overview_view(subjects, thresholds, card_cache),
+                (subjects, thresholds),
+            ),
+            (
+                "input",
+                lambda: _build_input_view(subjects, thresholds, card_cache),
+                (subjects, thresholds),
+            ),
+            (
+                "stats",
+                lambda: _build_stats_view(subjects, thresholds, card_cache),
+                (subjects, thresholds),
+            ),
+        ]
+    else:
+        # Large herds: a compact herd table plus overview/input/stats subviews
+        # per group, so a page only subscribes to its group's entities
+        slugs = _group_slugs(groups)
+        builders = [("herd", lambda: _build_herd_view(groups, slugs), (groups, slugs))]
+        for group, members in groups.items():
+            slug = slugs[group]
+            builders.extend([
+                (
+                    f"overview:{group}",
+                    partial(
+                        _group_overview_view, members, thresholds, card_cache, group, slug
+                    ),
+                    (members, thresholds, slug),
+                ),
+                (
+                    f"input:{group}",
+                    partial(
+                        _group_input_view, members, thresholds, card_cache, group, slug
+                    ),
+                    (members, thresholds, slug),
+                ),
+                (
+                    f"stats:{group}",
+                    partial(
+                        _group_stats_view, members, thresholds, card_cache, group, slug
+                    ),
+                    (members, thresholds, slug),
+                ),
+            ])
+    builders.append(("settings", lambda: _build_settings_view(subjects), subjects))
+    for name in set(view_cache) - {name for name, _, _ in builders}:
+        del view_cache[name]
+    views: list[dict[str, Any]] = []
+    for name, build, inputs in builders:
+        input_hash = _digest(inputs)
+        cached = view_cache.get(name)
+        if cached is None or cached[0] != input_hash:
+            cached = view_cache[name] = (input_hash, build())
+        views.append(cached[1])
+    config = {"views": views}
+    config_hash = _digest(config)
 
     # Access lovelace component data
     lovelace_data = hass.data.get(LOVELACE_DATA)
@@ -813,13 +1340,14 @@ async def async_update_dashboard(hass: HomeAssistant) -> None:
 
     dashboards = lovelace_data.dashboards
 
-    # Create dashboard if it doesn't exist yet
-    if "glucofarmer" not in dashboards:
+    # Create dashboard if it doesn't exist (yet, or deleted by the user)
+    if _DASHBOARD_URL not in dashboards:
+        domain_data.pop("dashboard_hash", None)
         dashboards_collection = lovelace_dashboard.DashboardsCollection(hass)
         await dashboards_collection.async_load()
         try:
             await dashboards_collection.async_create_item({
-                "url_path": "glucofarmer",
+                "url_path": _DASHBOARD_URL,
                 "allow_single_word": True,
                 "title": "GlucoFarmer",
                 "icon": "mdi:diabetes",
@@ -832,13 +1360,30 @@ async def async_update_dashboard(hass: HomeAssistant) -> None:
         # Re-fetch after creation
         dashboards = lovelace_data.dashboards
 
-    dashboard_config = dashboards.get("glucofarmer")
+    dashboard_config = dashboards.get(_DASHBOARD_URL)
     if dashboard_config is None:
         _LOGGER.warning("GlucoFarmer dashboard not found after creation")
         return
 
+    if config_hash == domain_data.get("dashboard_hash"):
+        _LOGGER.debug("GlucoFarmer dashboard unchanged, not saving")
+        return
+
+    # First run since start: compare with what is stored (a save rewrites
+    # the Lovelace file and reloads every open browser)
+    if "dashboard_hash" not in domain_data:
+        try:
+            stored = await dashboard_config.async_load(False)
+        except ConfigNotFound:
+            stored = None
+        if stored is not None and _digest(stored) == config_hash:
+            domain_data["dashboard_hash"] = config_hash
+            _LOGGER.debug("GlucoFarmer dashboard unchanged, not saving")
+            return
+
     try:
         await dashboard_config.async_save(config)
+        domain_data["dashboard_hash"] = config_hash
         _LOGGER.debug("GlucoFarmer dashboard updated with %d subjects", len(subjects))
     except Exception:
         _LOGGER.exception("Failed to save GlucoFarmer dashboard config")
@@ -0,0 +1,36 @@
+"""Diagnostics support for GlucoFarmer."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_SMTP_PASSWORD,
+    CONF_SMTP_RECIPIENTS,
+    CONF_SMTP_SENDER,
+    CONF_SMTP_USERNAME,
+    DOMAIN,
+)
+from .coordinator import GlucoFarmerConfigEntry
+
+TO_REDACT = {CONF_SMTP_PASSWORD, CONF_SMTP_RECIPIENTS, CONF_SMTP_SENDER, CONF_SMTP_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: GlucoFarmerConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry (options plus shared mail/retention state)."""
+    domain_data = hass.data.get(DOMAIN, {})
+    outbox = domain_data.get("outbox")
+    compaction = domain_data.get("compaction_stats")
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "outbox": outbox.diagnostics() if outbox is not None else None,
+        "compaction": compaction.as_dict() if compaction is not None else None,
+    }
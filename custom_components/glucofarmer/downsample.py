@@ -0,0 +1,135 @@
+"""Downsampled glucose series for the dashboard charts.
+
+Largest-Triangle-Three-Buckets keeps the visual shape of a series with a
+fixed point budget. Points on both sides of a zone boundary crossing are
+always kept, so a dip below a threshold never disappears from a chart.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+# (epoch milliseconds, mg/dL), the point format apexcharts-card expects
+Point = tuple[int, float]
+
+
+def lttb_indexes(points: Sequence[Point], threshold: int) -> list[int]:
+    """Return the indexes LTTB keeps to reduce points to threshold."""
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    every = (count - 2) / (threshold - 2)
+    kept = [0]
+    anchor = 0
+    for bucket in range(threshold - 2):
+        # Average of the next bucket is the third triangle corner
+        avg_start = int((bucket + 1) * every) + 1
+        avg_end = min(int((bucket + 2) * every) + 1, count)
+        span = avg_end - avg_start
+        avg_x = sum(points[i][0] for i in range(avg_start, avg_end)) / span
+        avg_y = sum(points[i][1] for i in range(avg_start, avg_end)) / span
+
+        anchor_x, anchor_y = points[anchor]
+        best_area = -1.0
+        best = int(bucket * every) + 1
+        for i in range(int(bucket * every) + 1, int((bucket + 1) * every) + 1):
+            x, y = points[i]
+            area = abs(
+                (anchor_x - avg_x) * (y - anchor_y) - (anchor_x - x) * (avg_y - anchor_y)
+            )
+            if area > best_area:
+                best_area = area
+                best = i
+        kept.append(best)
+        anchor = best
+    kept.append(count - 1)
+    return kept
+
+
+def crossing_indexes(points: Sequence[Point], boundaries: Sequence[float]) -> set[int]:
+    """Return the indexes on both sides of every zone boundary crossing."""
+    bounds = sorted(boundaries)
+    indexes: set[int] = set()
+    previous_zone: int | None = None
+    for i, (_, value) in enumerate(points):
+        zone = bisect_right(bounds, value)
+        if previous_zone is not None and zone != previous_zone:
+            indexes.update((i - 1, i))
+        previous_zone = zone
+    return indexes
+
+
+def downsample(
+    points: Sequence[Point], threshold: int, boundaries: Sequence[float] = ()
+) -> list[Point]:
+    """Reduce points to about threshold (plus boundary crossings)."""
+    if len(points) <= threshold:
+        return list(points)
+    kept = set(lttb_indexes(points, threshold)) | crossing_indexes(points, boundaries)
+    return [points[i] for i in sorted(kept)]
+
+
+class GlucoseSeries:
+    """Rolling buffer of numeric readings with downsampled views per span.
+
+    Readings are appended as they arrive; readings older than max_hours are
+    dropped. A downsampled span is rebuilt once the newest reading is one
+    bucket width (span / max_points) past its last build, so short spans
+    follow every reading while a 7-day view keeps returning the same list
+    until a new bucket of readings has arrived.
+    """
+
+    def __init__(self, max_hours: int) -> None:
+        """Initialize an empty series."""
+        self._max_ms = max_hours * 3600 * 1000
+        self._points: list[Point] = []
+        # key -> (newest timestamp at build, downsampled points)
+        self._cache: dict[
+            tuple[int, int, tuple[float, ...]], tuple[int, list[list[float]]]
+        ] = {}
+
+    def __len__(self) -> int:
+        """Return the number of buffered readings."""
+        return len(self._points)
+
+    def add(self, timestamp_ms: int, value: float) -> None:
+        """Append a reading (out-of-order readings are ignored)."""
+        if self._points and timestamp_ms <= self._points[-1][0]:
+            return
+        self._points.append((timestamp_ms, value))
+        cutoff = timestamp_ms - self._max_ms
+        if self._points[0][0] < cutoff:
+            del self._points[: bisect_left(self._points, (cutoff,))]
+        for key in [
+            key for key, (built_ms, _) in self._cache.items()
+            if timestamp_ms - built_ms >= _bucket_ms(key[0], key[1])
+        ]:
+            del self._cache[key]
+
+    def points(
+        self, hours: int, max_points: int, boundaries: Sequence[float] = ()
+    ) -> list[list[float]]:
+        """Return [[timestamp_ms, value], ...] of the last hours, downsampled.
+
+        The span ends at the newest reading of its last build (see class
+        docstring), so the result only changes when a reading arrives.
+        """
+        if not self._points:
+            return []
+        key = (hours, max_points, tuple(boundaries))
+        if (cached := self._cache.get(key)) is None:
+            newest = self._points[-1][0]
+            start = newest - hours * 3600 * 1000
+            window = self._points[bisect_left(self._points, (start,)):]
+            cached = self._cache[key] = (
+                newest,
+                [[ts, value] for ts, value in downsample(window, max_points, boundaries)],
+            )
+        return cached[1]
+
+
+def _bucket_ms(hours: int, max_points: int) -> int:
+    """Return the time one downsampled point covers in a span."""
+    return hours * 3600 * 1000 // max(max_points, 1)
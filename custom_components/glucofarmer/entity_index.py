@@ -0,0 +1,83 @@
+"""Cached entity lookups for GlucoFarmer.
+
+The dashboard needs each subject's entity map on every rebuild and the
+config flow lists CGM sensor candidates whenever the profile form opens.
+Both used to scan the entity registry; on large installs that is thousands
+of entries per call. The index builds each lookup once and drops it when an
+entity registry update touches it.
+"""
+
+from __future__ import annotations
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+
+class EntityIndex:
+    """Per-entry entity maps and CGM sensor candidates, built on demand."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index and follow entity registry updates."""
+        self._hass = hass
+        self._subjects: dict[str, dict[str, str]] = {}
+        self._cgm_sensors: list[str] | None = None
+        self._unsub = hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_registry_update
+        )
+
+    @callback
+    def async_close(self) -> None:
+        """Stop following entity registry updates."""
+        self._unsub()
+
+    @callback
+    def subject_entities(self, entry_id: str) -> dict[str, str]:
+        """Map entity keys to entity_ids for a config entry (do not modify)."""
+        entities = self._subjects.get(entry_id)
+        if entities is None:
+            registry = er.async_get(self._hass)
+            prefix = f"{entry_id}_"
+            entities = self._subjects[entry_id] = {
+                entity.unique_id[len(prefix):]: entity.entity_id
+                for entity in er.async_entries_for_config_entry(registry, entry_id)
+                if entity.unique_id and entity.unique_id.startswith(prefix)
+            }
+        return entities
+
+    @callback
+    def cgm_sensors(self) -> list[str]:
+        """Return entity_ids of Dexcom (or glucose-named) sensors."""
+        if self._cgm_sensors is None:
+            registry = er.async_get(self._hass)
+            self._cgm_sensors = [
+                entity.entity_id
+                for entity in registry.entities.values()
+                if entity.domain == "sensor"
+                and (entity.platform == "dexcom" or "glucose" in entity.entity_id)
+            ]
+        return self._cgm_sensors
+
+    @callback
+    def _handle_registry_update(self, event: Event) -> None:
+        """Drop the lookups the created, removed or updated entity belongs to."""
+        entity_ids = {event.data["entity_id"], event.data.get("old_entity_id")}
+        entity_ids.discard(None)
+        if any(entity_id.startswith("sensor.") for entity_id in entity_ids):
+            self._cgm_sensors = None
+
+        entity = er.async_get(self._hass).async_get(event.data["entity_id"])
+        owner = entity.config_entry_id if entity is not None else None
+        for entry_id, entities in list(self._subjects.items()):
+            if entry_id == owner or not entity_ids.isdisjoint(entities.values()):
+                del self._subjects[entry_id]
+
+
+@callback
+def async_get_entity_index(hass: HomeAssistant) -> EntityIndex:
+    """Return the shared entity index (created on first use)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "entity_index" not in domain_data:
+        domain_data["entity_index"] = EntityIndex(hass)
+    return domain_data["entity_index"]
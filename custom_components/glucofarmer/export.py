@@ -0,0 +1,131 @@
+"""Streaming CSV export of glucose readings and events for GlucoFarmer."""
+
+from __future__ import annotations
+
+import csv
+from datetime import date, datetime, timedelta
+import gzip
+from pathlib import Path
+from typing import IO, Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.history import state_changes_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+import homeassistant.util.dt as dt_util
+
+from .store import EventRecord
+
+READINGS_HEADER = ["Timestamp", "Datum_Uhrzeit", "Glukose_mgdL"]
+# Same columns as import_events reads, so an export can be re-imported
+EVENTS_HEADER = [
+    "type", "subject_name", "amount", "timestamp",
+    "product", "category", "description", "note",
+]
+
+
+def reading_row(ts: datetime, value: float) -> list[str]:
+    """Return one readings CSV row.
+
+    Two timestamp columns:
+    - Timestamp: ISO 8601 with timezone offset (for automated processing)
+    - Datum_Uhrzeit: German date format without offset (for Excel)
+    """
+    local_ts = dt_util.as_local(ts)
+    return [
+        local_ts.isoformat(timespec="seconds"),
+        local_ts.strftime("%d.%m.%Y %H:%M:%S"),
+        str(int(round(value))),
+    ]
+
+
+def _open_csv(path: Path, compress: bool) -> IO[str]:
+    """Open an export file for writing (UTF-8 with BOM for Excel)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8-sig", newline="")
+    return path.open("w", encoding="utf-8-sig", newline="")
+
+
+def _write_rows(fh: IO[str], rows: list[list[str]]) -> None:
+    """Append rows to an open export file (executor)."""
+    csv.writer(fh, delimiter=";").writerows(rows)
+
+
+def _write_readings_day(
+    hass: HomeAssistant,
+    fh: IO[str],
+    entity_id: str,
+    start: datetime,
+    end: datetime,
+) -> int:
+    """Fetch one day of sensor history and append its numeric readings.
+
+    Runs in the recorder executor; only one day is held in memory.
+    """
+    states = state_changes_during_period(
+        hass, start, end, entity_id, include_start_time_state=False
+    ).get(entity_id, [])
+    rows = []
+    for state in states:
+        try:
+            value = float(state.state)
+        except (ValueError, TypeError):
+            continue
+        rows.append(reading_row(state.last_changed, value))
+    _write_rows(fh, rows)
+    return len(rows)
+
+
+def export_file_name(prefix: str, first: date, last: date, compress: bool) -> str:
+    """Return the file name of one export file."""
+    suffix = ".csv.gz" if compress else ".csv"
+    return f"{slugify(prefix)}_{first.isoformat()}_{last.isoformat()}{suffix}"
+
+
+async def async_export_readings(
+    hass: HomeAssistant,
+    path: Path,
+    entity_id: str,
+    first: date,
+    last: date,
+    compress: bool,
+) -> int:
+    """Stream the readings of first..last (inclusive) to path, day by day.
+
+    Returns the number of rows written.
+    """
+    fh = await hass.async_add_executor_job(_open_csv, path, compress)
+    rows = 0
+    try:
+        await hass.async_add_executor_job(_write_rows, fh, [READINGS_HEADER])
+        recorder_instance = get_instance(hass)
+        day = first
+        while day <= last:
+            day_start = dt_util.start_of_local_day(day)
+            day_end = dt_util.start_of_local_day(day + timedelta(days=1))
+            rows += await recorder_instance.async_add_executor_job(
+                _write_readings_day, hass, fh, entity_id, day_start, day_end
+            )
+            day += timedelta(days=1)
+    finally:
+        await hass.async_add_executor_job(fh.close)
+    return rows
+
+
+def _event_row(event: EventRecord) -> list[Any]:
+    """Return one events CSV row."""
+    return [
+        event.type, event.subject_name, event.amount, event.timestamp,
+        event.product or "", event.category or "",
+        event.description or "", event.note or "",
+    ]
+
+
+def write_events(path: Path, events: list[EventRecord], compress: bool) -> int:
+    """Write events to path (executor). Returns the number of rows."""
+    with _open_csv(path, compress) as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(EVENTS_HEADER)
+        writer.writerows(_event_row(e) for e in events)
+    return len(events)
@@ -0,0 +1,135 @@
+"""Bulk event import (service rows or CSV file) for GlucoFarmer."""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+import gzip
+from pathlib import Path
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+
+from .const import EVENT_TYPE_FEEDING, EVENT_TYPE_INSULIN
+from .store import EventRecord
+
+# Report at most this many row errors back to the caller
+_MAX_ERRORS = 10
+
+
+class ImportValidationError(Exception):
+    """Raised when import rows fail validation (nothing is imported)."""
+
+    def __init__(self, errors: list[str]) -> None:
+        """Initialize with the collected row errors."""
+        super().__init__("; ".join(errors[:_MAX_ERRORS]))
+        self.errors = errors
+
+
+def resolve_config_path(config_dir: str, path: str) -> Path:
+    """Resolve path relative to the config dir and reject anything outside it."""
+    root = Path(config_dir).resolve()
+    resolved = (root / path).resolve()
+    if not resolved.is_relative_to(root):
+        raise ImportValidationError([f"Path {path} is outside the config directory"])
+    return resolved
+
+
+def _read_csv(path: Path) -> list[dict[str, Any]]:
+    """Read rows from a comma- or semicolon-separated file with a header line.
+
+    Files ending in .gz (gzipped exports) are decompressed while reading.
+    """
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8-sig", newline="") as fh:
+        sample = fh.read(4096)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;")
+        except csv.Error:
+            dialect = csv.excel
+        return [
+            {k.strip().lower(): (v.strip() if v else v) for k, v in row.items() if k}
+            for row in csv.DictReader(fh, dialect=dialect)
+        ]
+
+
+def _normalize_timestamp(value: Any) -> str | None:
+    """Return the store's naive local ISO form, or None if value cannot be parsed.
+
+    Timestamps with an offset (or Z) are converted to local time first, so
+    they sort and bucket by day like the events logged by the services.
+    """
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).strip())
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = dt_util.as_local(value).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def build_import_records(
+    config_dir: str,
+    rows: list[dict[str, Any]] | None,
+    path: str | None,
+    known_subjects: set[str],
+) -> list[EventRecord]:
+    """Validate import rows and turn them into event records.
+
+    Runs in the executor (file I/O, parsing). Validation is all-or-nothing:
+    any invalid row raises ImportValidationError listing the row errors.
+    """
+    if path:
+        rows = _read_csv(resolve_config_path(config_dir, path))
+    rows = rows or []
+
+    records: list[EventRecord] = []
+    errors: list[str] = []
+    for line, row in enumerate(rows, start=1):
+        event_type = str(row.get("type") or "").strip().lower()
+        subject_name = str(row.get("subject_name") or "").strip()
+        prefix = f"Row {line}"
+
+        if event_type not in (EVENT_TYPE_INSULIN, EVENT_TYPE_FEEDING):
+            errors.append(f"{prefix}: type must be insulin or feeding")
+            continue
+        if subject_name not in known_subjects:
+            errors.append(f"{prefix}: unknown subject '{subject_name}'")
+            continue
+        try:
+            amount = float(str(row.get("amount", "")).replace(",", "."))
+        except ValueError:
+            errors.append(f"{prefix}: invalid amount '{row.get('amount')}'")
+            continue
+        if amount <= 0:
+            errors.append(f"{prefix}: amount must be positive")
+            continue
+        timestamp = _normalize_timestamp(row.get("timestamp"))
+        if timestamp is None:
+            errors.append(f"{prefix}: invalid timestamp '{row.get('timestamp')}'")
+            continue
+
+        if event_type == EVENT_TYPE_INSULIN:
+            product = row.get("product")
+            if not product:
+                errors.append(f"{prefix}: product is required for insulin")
+                continue
+            records.append(EventRecord.create(
+                EVENT_TYPE_INSULIN, subject_name, amount, timestamp,
+                product=str(product), note=row.get("note") or None,
+            ))
+        else:
+            category = row.get("category")
+            if not category:
+                errors.append(f"{prefix}: category is required for feeding")
+                continue
+            records.append(EventRecord.create(
+                EVENT_TYPE_FEEDING, subject_name, amount, timestamp,
+                category=str(category), description=row.get("description") or None,
+            ))
+
+    if errors:
+        raise ImportValidationError(errors)
+    return records
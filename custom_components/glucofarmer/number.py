@@ -22,7 +22,6 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import GlucoFarmerConfigEntry, GlucoFarmerCoordinator
-from .dashboard import async_update_dashboard
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -205,7 +204,7 @@ class GlucoFarmerNumberEntity(NumberEntity, RestoreEntity):
         if self.entity_description.entity_category == EntityCategory.CONFIG:
             await self._coordinator.async_save_thresholds()
             await self._coordinator.async_request_refresh()
-            await async_update_dashboard(self._coordinator.hass)
+            self._coordinator.schedule_dashboard_refresh()
 
 
 def _make_device_info(entry_id: str, subject_name: str) -> DeviceInfo:
@@ -0,0 +1,273 @@
+"""Persistent outbox for report emails.
+
+Rendered messages are queued in a Store and sent by a single worker: each
+run opens one authenticated SMTP session for all due messages. Failed
+messages are retried with exponential backoff and dropped once they are
+older than _MAX_AGE, so a relay outage at 00:05 does not lose the report.
+A message the relay rejects outright (5xx) is dropped on its own and does
+not hold up the rest of the queue.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import logging
+import smtplib
+import ssl
+import time
+from typing import Any
+import uuid
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTBOX_STORAGE_KEY = f"{DOMAIN}_outbox"
+
+# Retry delays: 1 min doubling up to 1 h; give up after a day
+_RETRY_BASE = 60.0
+_RETRY_MAX = 3600.0
+_MAX_AGE = 86400.0
+
+
+@dataclass(slots=True)
+class OutboxMessage:
+    """A rendered email waiting to be sent."""
+
+    id: str
+    subject: str
+    sender: str
+    recipients: list[str]
+    message: str
+    created: float
+    attempts: int = 0
+    next_attempt: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OutboxMessage:
+        """Create from stored dict."""
+        return cls(**data)
+
+
+def _smtp_session(smtp_config: dict) -> smtplib.SMTP:
+    """Open and authenticate an SMTP session."""
+    host = smtp_config["host"]
+    port = smtp_config["port"]
+    if smtp_config["encryption"] == "tls":
+        context = ssl.create_default_context()
+        server: smtplib.SMTP = smtplib.SMTP_SSL(host, port, context=context)
+    else:  # starttls
+        server = smtplib.SMTP(host, port)
+    try:
+        if smtp_config["encryption"] != "tls":
+            server.starttls()
+        server.login(smtp_config["username"], smtp_config["password"])
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _rejection_code(err: smtplib.SMTPException) -> int:
+    """SMTP reply code of a per-message rejection (lowest refused recipient)."""
+    if isinstance(err, smtplib.SMTPRecipientsRefused):
+        return min((code for code, _ in err.recipients.values()), default=0)
+    return getattr(err, "smtp_code", 0)
+
+
+def _send_all(
+    smtp_config: dict, messages: list[OutboxMessage]
+) -> tuple[list[str], dict[str, tuple[int, str]], str | None]:
+    """Send messages over one session (executor).
+
+    Returns the ids sent, the messages the relay rejected (id -> reply code
+    and error) and the connection or login error that stopped the run.
+    """
+    sent: list[str] = []
+    rejected: dict[str, tuple[int, str]] = {}
+    try:
+        with _smtp_session(smtp_config) as server:
+            for message in messages:
+                try:
+                    server.sendmail(message.sender, message.recipients, message.message)
+                except (
+                    smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused
+                ) as err:
+                    # Rejected by the relay (too large, bad recipient): the
+                    # session is still usable for the remaining messages
+                    rejected[message.id] = (_rejection_code(err), str(err))
+                    continue
+                sent.append(message.id)
+    except (smtplib.SMTPException, OSError) as err:
+        return sent, rejected, str(err) or type(err).__name__
+    return sent, rejected, None
+
+
+class MailOutbox:
+    """Queue of report emails, persisted until sent or expired."""
+
+    def __init__(
+        self, hass: HomeAssistant, smtp_config_fn: Callable[[], dict | None]
+    ) -> None:
+        """Initialize the outbox; smtp_config_fn returns the current settings."""
+        self._hass = hass
+        self._smtp_config_fn = smtp_config_fn
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, OUTBOX_STORAGE_KEY)
+        self._messages: list[OutboxMessage] = []
+        self._running = False
+        self._rerun = False
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self.last_error: str | None = None
+        self.last_error_at: str | None = None
+        self.last_sent_at: str | None = None
+
+    async def async_load(self) -> None:
+        """Load queued messages and resume sending them."""
+        stored = await self._store.async_load()
+        if stored:
+            self._messages = [OutboxMessage.from_dict(m) for m in stored.get("messages", [])]
+        if self._messages:
+            _LOGGER.info("Resuming %d queued report email(s)", len(self._messages))
+            self._kick()
+
+    async def async_close(self) -> None:
+        """Stop retrying (queued messages stay persisted)."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    async def _async_save(self) -> None:
+        await self._store.async_save({"messages": [asdict(m) for m in self._messages]})
+
+    async def async_enqueue(
+        self, subject: str, sender: str, recipients: list[str], messages: list[str]
+    ) -> None:
+        """Queue rendered messages (persisted first) and start sending."""
+        now = time.time()
+        self._messages.extend(
+            OutboxMessage(uuid.uuid4().hex, subject, sender, recipients, message, now)
+            for message in messages
+        )
+        await self._async_save()
+        self._kick()
+
+    @callback
+    def _kick(self) -> None:
+        self._hass.async_create_task(self._async_process())
+
+    @callback
+    def _scheduled_retry(self, _now: datetime) -> None:
+        self._unsub_retry = None
+        self._kick()
+
+    async def _async_process(self) -> None:
+        """Send due messages; only one run at a time (re-runs if kicked meanwhile)."""
+        if self._running:
+            self._rerun = True
+            return
+        self._running = True
+        try:
+            while True:
+                self._rerun = False
+                await self._async_send_due()
+                if not self._rerun:
+                    break
+        finally:
+            self._running = False
+            self._schedule_retry()
+
+    async def _async_send_due(self) -> None:
+        now = time.time()
+        expired = {m.id for m in self._messages if now - m.created > _MAX_AGE}
+        due: list[OutboxMessage] = []
+        for message in self._messages:
+            if message.id in expired:
+                _LOGGER.error(
+                    "Dropping report email '%s' after %d failed attempts",
+                    message.subject, message.attempts,
+                )
+            elif message.next_attempt <= now:
+                due.append(message)
+        if not due and not expired:
+            return
+
+        sent: list[str] = []
+        rejected: dict[str, tuple[int, str]] = {}
+        error: str | None = None
+        if due:
+            smtp_config = self._smtp_config_fn()
+            if smtp_config is None:
+                error = "SMTP is not configured"
+            else:
+                sent, rejected, error = await self._hass.async_add_executor_job(
+                    _send_all, smtp_config, due
+                )
+
+        # Permanent (5xx) rejections are not retried
+        dropped: set[str] = set()
+        for message in due:
+            if message.id not in rejected:
+                continue
+            code, reason = rejected[message.id]
+            if code >= 500:
+                dropped.add(message.id)
+                _LOGGER.error(
+                    "Dropping report email '%s' rejected by the relay: %s",
+                    message.subject, reason,
+                )
+
+        done = set(sent) | expired | dropped
+        self._messages = [m for m in self._messages if m.id not in done]
+        if sent:
+            self.last_sent_at = datetime.now().isoformat()
+            _LOGGER.info("Sent %d report email(s)", len(sent))
+        if rejected:
+            self.last_error = next(reason for _, reason in rejected.values())
+            self.last_error_at = datetime.now().isoformat()
+        if error is not None:
+            self.last_error = error
+            self.last_error_at = datetime.now().isoformat()
+        retry = [
+            m for m in due
+            if m.id not in done and (error is not None or m.id in rejected)
+        ]
+        for message in retry:
+            message.attempts += 1
+            delay = min(_RETRY_BASE * 2 ** (message.attempts - 1), _RETRY_MAX)
+            message.next_attempt = now + delay
+        if retry:
+            _LOGGER.warning(
+                "Report email delivery failed (%s); %d message(s) queued for retry",
+                error or self.last_error, len(retry),
+            )
+        await self._async_save()
+
+    @callback
+    def _schedule_retry(self) -> None:
+        """Wake up when the earliest queued message is due."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if self._messages:
+            delay = max(0.0, min(m.next_attempt for m in self._messages) - time.time())
+            self._unsub_retry = async_call_later(self._hass, delay, self._scheduled_retry)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Queue depth and delivery status (config entry diagnostics)."""
+        return {
+            "queue_depth": len(self._messages),
+            "oldest_queued": (
+                datetime.fromtimestamp(min(m.created for m in self._messages)).isoformat()
+                if self._messages else None
+            ),
+            "max_attempts": max((m.attempts for m in self._messages), default=0),
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+            "last_sent_at": self.last_sent_at,
+        }
@@ -0,0 +1,65 @@
+"""Cursor pagination and aggregation for the query_events service."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from typing import Any
+
+from .const import AGGREGATE_DAY, AGGREGATE_HOUR
+from .store import EventRecord
+
+# Timestamp prefix length per aggregation period ("YYYY-MM-DD" / "YYYY-MM-DDTHH")
+_PERIOD_WIDTH = {AGGREGATE_HOUR: 13, AGGREGATE_DAY: 10}
+
+
+def encode_cursor(event: EventRecord) -> str:
+    """Return an opaque cursor pointing just past the given event."""
+    raw = f"{event.timestamp}|{event.id:032x}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int] | None:
+    """Decode a cursor into its (timestamp, id) sort key, None if malformed."""
+    try:
+        timestamp, _, event_id = base64.urlsafe_b64decode(cursor).decode().partition("|")
+        return timestamp, int(event_id, 16)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def paginate(
+    events: list[EventRecord], limit: int
+) -> tuple[list[EventRecord], str | None]:
+    """Return one page and the next cursor from up to limit + 1 queried events.
+
+    The store query starts after the previous cursor and reads one event
+    more than the page, which tells whether another page follows. The
+    cursor is keyed on the last returned event rather than an offset, so
+    pages stay consistent while new events are logged in between calls.
+    """
+    page = events[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(events) > limit else None
+    return page, next_cursor
+
+
+def aggregate(events: list[EventRecord], period: str) -> list[dict[str, Any]]:
+    """Sum and count events per period, subject and type, in period order."""
+    width = _PERIOD_WIDTH[period]
+    buckets: dict[tuple[str, str, str], dict[str, Any]] = {}
+    for e in events:
+        key = (e.timestamp[:width], e.subject_name, e.type)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                "period": key[0],
+                "subject_name": e.subject_name,
+                "type": e.type,
+                "count": 0,
+                "sum": 0.0,
+            }
+        bucket["count"] += 1
+        bucket["sum"] += e.amount
+    for bucket in buckets.values():
+        bucket["sum"] = round(bucket["sum"], 2)
+    return [buckets[k] for k in sorted(buckets)]
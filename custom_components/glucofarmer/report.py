@@ -0,0 +1,516 @@
+"""Daily report statistics for GlucoFarmer.
+
+Each coordinator accumulates the current day's statistics from live readings
+(DayAccumulator), so at midnight the report only finalizes and formats them.
+Subjects without accumulated data (e.g. HA restarted during the day) fall
+back to the recorder; these are processed concurrently (bounded by
+_REPORT_CONCURRENCY) with the statistics computed in the executor. Sections
+are assembled in config entry order, so the text is deterministic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.history import state_changes_during_period
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, State
+
+from .const import (
+    CONF_GLUCOSE_SENSOR,
+    CONF_SUBJECT_NAME,
+    DEFAULT_CRITICAL_LOW_THRESHOLD,
+    DEFAULT_HIGH_THRESHOLD,
+    DEFAULT_LOW_THRESHOLD,
+    DEFAULT_VERY_HIGH_THRESHOLD,
+    DEFAULT_VERY_LOW_THRESHOLD,
+    DOMAIN,
+    EVENT_TYPE_FEEDING,
+    EVENT_TYPE_INSULIN,
+)
+from .store import EventRecord, GlucoFarmerStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum weight (minutes) for the last valid reading before a data gap.
+# Mirrors coordinator._GAP_CAP_MINUTES -- one Dexcom transmission cycle.
+_GAP_CAP_MINUTES = 5.0
+
+# Subjects fetched/computed at the same time (recorder queries are the bottleneck)
+_REPORT_CONCURRENCY = 4
+
+
+@dataclass(slots=True)
+class DayStats:
+    """Glucose statistics of one subject for one day."""
+
+    readings: list[tuple[datetime, float]]
+    glucose_min: int = 0
+    glucose_max: int = 0
+    glucose_median: float = 0.0
+    glucose_mean: float = 0.0
+    glucose_sd: float = 0.0
+    pct_crit_low: float = 0.0
+    pct_low: float = 0.0
+    # Share of pct_low below the very-low threshold (dashboard 6-zone split)
+    pct_very_low: float = 0.0
+    pct_in_range: float = 0.0
+    pct_high: float = 0.0
+    pct_very_high: float = 0.0
+    uncovered_min: int = 0
+    completeness: float = 0.0
+    # Unrounded minutes per zone (crit low, low, in range, high, very high),
+    # below very low and covered in total -- summed by the period rollups
+    zone_min: list[float] = field(default_factory=lambda: [0.0] * 5)
+    very_low_min: float = 0.0
+    covered_min: float = 0.0
+
+
+# Reading value: mg/dL, "low"/"high" (outside sensor range, mapped to a
+# threshold-based value at finalize time) or None (gap marker)
+type GlucoseValue = float | str | None
+
+
+def parse_glucose_state(state: str | None) -> GlucoseValue:
+    """Map a glucose sensor state to a reading value."""
+    try:
+        return float(state)  # type: ignore[arg-type]
+    except (ValueError, TypeError):
+        s = state.lower() if state else ""
+        if s in {"low", "niedrig"}:
+            return "low"
+        if s in {"high", "hoch"}:
+            return "high"
+        return None  # unknown/unavailable -- gap marker
+
+
+class DayAccumulator:
+    """Streaming time-weighted glucose statistics for one local day.
+
+    Readings are added in time order as they arrive. Each reading is weighted
+    by the time until the next one, capped at _GAP_CAP_MINUTES when the next
+    one is a gap marker; the last reading runs until day_end. Weights and
+    counts are kept per distinct value, so zones (which depend on thresholds)
+    and the median are exact and only resolved in finalize().
+    """
+
+    def __init__(self, day_start: datetime, day_end: datetime) -> None:
+        """Initialize an empty day."""
+        self.day = day_start.strftime("%Y-%m-%d")
+        self.day_start = day_start
+        self.day_end = day_end
+        self._weights: dict[float | str, float] = {}
+        self._counts: dict[float | str, int] = {}
+        self._readings: list[tuple[datetime, float | str]] = []
+        self._prev: tuple[datetime, GlucoseValue] | None = None
+
+    @property
+    def last_value(self) -> GlucoseValue:
+        """Value of the most recent reading (carried into the next day)."""
+        return self._prev[1] if self._prev is not None else None
+
+    def add(self, ts: datetime, value: GlucoseValue) -> None:
+        """Add the next reading (out-of-order readings are ignored)."""
+        if self._prev is not None:
+            prev_ts, prev_value = self._prev
+            if ts < prev_ts:
+                return
+            if prev_value is not None:
+                duration_min = (ts - prev_ts).total_seconds() / 60.0
+                self._close(prev_value, duration_min, value is None)
+        if value is not None:
+            self._counts[value] = self._counts.get(value, 0) + 1
+            self._readings.append((ts, value))
+        self._prev = (ts, value)
+
+    def _close(self, value: float | str, duration_min: float, capped: bool) -> None:
+        w = min(duration_min, _GAP_CAP_MINUTES) if capped else duration_min
+        self._weights[value] = self._weights.get(value, 0.0) + max(0.0, w)
+
+    def finalize(
+        self,
+        thresholds: tuple[float, float, float, float],
+        very_low: float | None = None,
+        until: datetime | None = None,
+    ) -> DayStats:
+        """Return the day's statistics.
+
+        The pending last reading runs to until (default day_end), so a day in
+        progress can be finalized up to now. very_low additionally splits the
+        low zone for pct_very_low.
+        """
+        crit_low, low, high, very_high = thresholds
+        end = until if until is not None else self.day_end
+        weights = dict(self._weights)
+        if self._prev is not None and self._prev[1] is not None:
+            remaining = (end - self._prev[0]).total_seconds() / 60.0
+            weights[self._prev[1]] = weights.get(self._prev[1], 0.0) + max(0.0, remaining)
+
+        def _num(value: float | str) -> float:
+            if value == "low":
+                return crit_low - 1
+            if value == "high":
+                return very_high + 1
+            return value  # type: ignore[return-value]
+
+        # Numeric readings only (for CSV, completeness, min/max/median)
+        result = DayStats(readings=[(ts, _num(v)) for ts, v in self._readings])
+        if not self._counts:
+            return result
+
+        # Unweighted stats (min, max, median -- time-weighting not critical here)
+        counts = sorted((_num(v), n) for v, n in self._counts.items())
+        result.glucose_min = int(round(counts[0][0]))
+        result.glucose_max = int(round(counts[-1][0]))
+        result.glucose_median = round(_median_from_counts(counts), 1)
+
+        # Time-weighted zone percentages, mean and SD
+        zone_weights = [0.0, 0.0, 0.0, 0.0, 0.0]
+        total_w = sum_wv = very_low_w = 0.0
+        for raw, w in weights.items():
+            value = _num(raw)
+            if value < crit_low:
+                zone_weights[0] += w
+            elif value < low:
+                zone_weights[1] += w
+                if very_low is not None and value < very_low:
+                    very_low_w += w
+            elif value <= high:
+                zone_weights[2] += w
+            elif value <= very_high:
+                zone_weights[3] += w
+            else:
+                zone_weights[4] += w
+            total_w += w
+            sum_wv += w * value
+
+        result.zone_min = zone_weights
+        result.very_low_min = very_low_w
+        result.covered_min = total_w
+        if total_w > 0:
+            result.pct_crit_low = round(zone_weights[0] / total_w * 100, 1)
+            result.pct_low = round(zone_weights[1] / total_w * 100, 1)
+            result.pct_very_low = round(very_low_w / total_w * 100, 1)
+            result.pct_in_range = round(zone_weights[2] / total_w * 100, 1)
+            result.pct_high = round(zone_weights[3] / total_w * 100, 1)
+            result.pct_very_high = round(zone_weights[4] / total_w * 100, 1)
+            weighted_mean = sum_wv / total_w
+            result.glucose_mean = round(weighted_mean, 1)
+            result.glucose_sd = round(
+                (sum(w * (_num(v) - weighted_mean) ** 2 for v, w in weights.items()) / total_w) ** 0.5,
+                1,
+            ) if len(self._readings) > 1 else 0.0
+
+        # Time-based data completeness
+        total_minutes = (end - self.day_start).total_seconds() / 60.0
+        result.uncovered_min = round(max(0.0, total_minutes - total_w))
+        result.completeness = (
+            round(total_w / total_minutes * 100, 1) if total_minutes > 0 else 0.0
+        )
+        return result
+
+
+def day_rollup(
+    stats: DayStats,
+    day_minutes: float,
+    insulin_total: float,
+    bes_total: float,
+    emergencies: int,
+    interventions: int,
+) -> dict[str, Any]:
+    """Return the persisted per-day aggregate of a subject (see rollups.py).
+
+    Zone minutes are stored unrounded so weekly and monthly sums stay exact.
+    """
+    return {
+        "minutes": round(day_minutes),
+        "covered_min": stats.covered_min if stats.readings else 0.0,
+        "zones_min": list(stats.zone_min),
+        "very_low_min": stats.very_low_min,
+        "readings": len(stats.readings),
+        "mean": stats.glucose_mean,
+        "median": stats.glucose_median,
+        "sd": stats.glucose_sd,
+        "min": stats.glucose_min,
+        "max": stats.glucose_max,
+        "insulin": round(insulin_total, 2),
+        "bes": round(bes_total, 2),
+        "emergencies": emergencies,
+        "interventions": interventions,
+    }
+
+
+def event_totals(events: list[EventRecord]) -> dict[str, Any]:
+    """Return the event part of a day rollup from the events of that day."""
+    return {
+        "insulin": round(sum(e.amount for e in events if e.type == EVENT_TYPE_INSULIN), 2),
+        "bes": round(sum(e.amount for e in events if e.type == EVENT_TYPE_FEEDING), 2),
+        "emergencies": sum(
+            e.category in ("emergency_single", "emergency_double") for e in events
+        ),
+        "interventions": sum(e.category == "intervention" for e in events),
+    }
+
+
+def stats_from_rollup(rollup: dict[str, Any]) -> DayStats:
+    """Rebuild the glucose statistics of a day from its rollup (no readings)."""
+    covered = rollup["covered_min"]
+    stats = DayStats(
+        readings=[],
+        glucose_min=rollup["min"],
+        glucose_max=rollup["max"],
+        glucose_median=rollup.get("median", 0.0),
+        glucose_mean=rollup["mean"],
+        glucose_sd=rollup.get("sd", 0.0),
+        uncovered_min=round(rollup["minutes"] - covered),
+        completeness=round(covered / rollup["minutes"] * 100, 1) if rollup["minutes"] else 0.0,
+        zone_min=list(rollup["zones_min"]),
+        very_low_min=rollup.get("very_low_min", 0.0),
+        covered_min=covered,
+    )
+    if covered > 0:
+        (
+            stats.pct_crit_low, stats.pct_low, stats.pct_in_range,
+            stats.pct_high, stats.pct_very_high,
+        ) = (round(m / covered * 100, 1) for m in rollup["zones_min"])
+        stats.pct_very_low = round(rollup.get("very_low_min", 0.0) / covered * 100, 1)
+    return stats
+
+
+def _median_from_counts(counts: list[tuple[float, int]]) -> float:
+    """Median of a sorted value histogram (same result as statistics.median)."""
+    n = sum(c for _, c in counts)
+    lo_idx, hi_idx = (n - 1) // 2, n // 2
+    lo = hi = None
+    seen = 0
+    for value, c in counts:
+        if lo is None and seen + c > lo_idx:
+            lo = value
+        if seen + c > hi_idx:
+            hi = value
+            break
+        seen += c
+    return (lo + hi) / 2  # type: ignore[operator]
+
+
+def compute_day_stats(
+    states: list[State],
+    day_start: datetime,
+    day_end: datetime,
+    thresholds: tuple[float, float, float, float],
+    very_low: float | None = None,
+) -> DayStats:
+    """Compute day statistics from recorder states in one pass (executor)."""
+    accumulator = DayAccumulator(day_start, day_end)
+    for state in states:
+        accumulator.add(state.last_changed, parse_glucose_state(state.state))
+    return accumulator.finalize(thresholds, very_low)
+
+
+def _entry_thresholds(entry: ConfigEntry) -> tuple[float, float, float, float]:
+    """Thresholds from the coordinator (if running) or the defaults."""
+    coordinator = getattr(entry, "runtime_data", None)
+    if coordinator is not None:
+        return (
+            coordinator.critical_low_threshold,
+            coordinator.low_threshold,
+            coordinator.high_threshold,
+            coordinator.very_high_threshold,
+        )
+    return (
+        DEFAULT_CRITICAL_LOW_THRESHOLD,
+        DEFAULT_LOW_THRESHOLD,
+        DEFAULT_HIGH_THRESHOLD,
+        DEFAULT_VERY_HIGH_THRESHOLD,
+    )
+
+
+async def _async_subject_section(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    store: GlucoFarmerStore,
+    day: str,
+    day_start: datetime,
+    day_end: datetime,
+    cached: dict[str, Any] | None = None,
+) -> tuple[list[str] | None, list[tuple[datetime, float]], dict[str, Any]]:
+    """Return the report lines, numeric readings and day rollup of one subject.
+
+    Glucose statistics come from the cached rollup if given (no readings),
+    else the coordinator's finished day, else the recorder. Event totals are
+    always read from the store. The lines are None without readings and
+    leave out the live lines added by render_daily_report.
+    """
+    subject_name = entry.data.get(CONF_SUBJECT_NAME, "Unknown")
+    glucose_sensor_id = entry.data.get(CONF_GLUCOSE_SENSOR, "")
+    thresholds = _entry_thresholds(entry)
+    crit_low, low, high, very_high = thresholds
+
+    coordinator = getattr(entry, "runtime_data", None)
+    very_low = (
+        coordinator.very_low_threshold
+        if coordinator is not None else DEFAULT_VERY_LOW_THRESHOLD
+    )
+    accumulator = (
+        coordinator.get_finished_day(day)
+        if coordinator is not None and cached is None else None
+    )
+    if cached is not None:
+        stats = stats_from_rollup(cached)
+    elif accumulator is not None:
+        stats = accumulator.finalize(thresholds, very_low)
+    else:
+        states: list[State] = []
+        recorder_instance = get_instance(hass)
+        if recorder_instance is not None and glucose_sensor_id:
+            states_dict = await recorder_instance.async_add_executor_job(
+                state_changes_during_period,
+                hass, day_start, day_end, glucose_sensor_id,
+            )
+            states = states_dict.get(glucose_sensor_id, [])
+        stats = await hass.async_add_executor_job(
+            compute_day_stats, states, day_start, day_end, thresholds, very_low
+        )
+
+    # Daily totals and notable events
+    all_day_events = await store.async_get_events_for_date(subject_name, day)
+    insulin_total = sum(e.amount for e in all_day_events if e.type == EVENT_TYPE_INSULIN)
+    bes_total = sum(e.amount for e in all_day_events if e.type == EVENT_TYPE_FEEDING)
+    emergencies = [
+        e for e in all_day_events
+        if e.category in ("emergency_single", "emergency_double")
+    ]
+    interventions = [e for e in all_day_events if e.category == "intervention"]
+    if cached is not None:
+        rollup = cached | event_totals(all_day_events)
+        has_readings = rollup.get("readings", rollup["covered_min"]) > 0
+    else:
+        rollup = day_rollup(
+            stats, (day_end - day_start).total_seconds() / 60.0,
+            insulin_total, bes_total, len(emergencies), len(interventions),
+        )
+        has_readings = bool(stats.readings)
+    if not has_readings:
+        return None, [], rollup
+
+    lines = [
+        f"  Thresholds: <{crit_low} critical | <{low} low | "
+        f"{low}-{high} target | >{high} high | >{very_high} very high",
+        f"  --- Yesterday ({day}) ---",
+        f"  Without valid data: {stats.uncovered_min} min",
+        f"  Min: {stats.glucose_min} mg/dL  |  Max: {stats.glucose_max} mg/dL",
+        f"  Mean: {stats.glucose_mean} mg/dL  |  Median: {stats.glucose_median} mg/dL  |  SD: {stats.glucose_sd}",
+        f"  Critical low (<{crit_low}): {stats.pct_crit_low}%",
+        f"  Low ({crit_low}-{low}): {stats.pct_low}%",
+        f"  In range ({low}-{high}): {stats.pct_in_range}%",
+        f"  High ({high}-{very_high}): {stats.pct_high}%",
+        f"  Very high (>{very_high}): {stats.pct_very_high}%",
+        f"  Data completeness: {stats.completeness}%",
+        f"  Total insulin: {insulin_total} IU",
+        f"  Total feeding: {bes_total} BE",
+    ]
+
+    if emergencies:
+        lines.append(f"  Emergency rations: {len(emergencies)}")
+    if interventions:
+        lines.append(f"  Interventions: {len(interventions)}")
+
+    lines.append("")
+    return lines, stats.readings, rollup
+
+
+def _current_lines(entry: ConfigEntry | None) -> list[str]:
+    """Return the live glucose lines of a subject (rendered at send time)."""
+    current_glucose: Any = "N/A"
+    current_trend = "N/A"
+    current_status = "N/A"
+    coordinator = getattr(entry, "runtime_data", None)
+    if coordinator is not None and coordinator.data is not None:
+        current_glucose = coordinator.data.glucose_value or "N/A"
+        current_trend = coordinator.data.glucose_trend or "N/A"
+        current_status = coordinator.data.glucose_status
+    return [
+        f"  Current glucose: {current_glucose} mg/dL ({current_trend})",
+        f"  Current status: {current_status}",
+    ]
+
+
+def render_daily_report(
+    hass: HomeAssistant, day: str, sections: dict[str, list[str] | None]
+) -> str:
+    """Join the subject sections into the report text.
+
+    The current glucose lines are taken from the coordinators now, so a
+    report built earlier (cached) is still sent with live values.
+    """
+    entries = {
+        entry.data.get(CONF_SUBJECT_NAME, "Unknown"): entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    lines = [
+        f"GlucoFarmer daily report - {day}",
+        "=" * 60,
+        "",
+    ]
+    for name, section in sections.items():
+        if section is None:
+            lines.extend([f"{name}: No readings recorded for {day}", ""])
+            continue
+        lines.append(f"--- {name} ---")
+        lines.extend(_current_lines(entries.get(name)))
+        lines.extend(section)
+    return "\n".join(lines)
+
+
+async def async_build_daily_report(
+    hass: HomeAssistant,
+    store: GlucoFarmerStore,
+    day: str,
+    day_start: datetime,
+    day_end: datetime,
+    subject_names: set[str] | None = None,
+    cached: dict[str, dict[str, Any]] | None = None,
+) -> tuple[
+    dict[str, list[str] | None],
+    dict[str, list[tuple[datetime, float]]],
+    dict[str, dict[str, Any]],
+]:
+    """Build the report sections, numeric readings and day rollups per subject.
+
+    subject_names limits the report to these subjects; cached maps subject
+    names to stored rollups of this day, used instead of recomputing. Turn
+    the sections into text with render_daily_report.
+    """
+    entries = [
+        entry for entry in hass.config_entries.async_entries(DOMAIN)
+        if subject_names is None
+        or entry.data.get(CONF_SUBJECT_NAME, "Unknown") in subject_names
+    ]
+    cached = cached or {}
+    semaphore = asyncio.Semaphore(_REPORT_CONCURRENCY)
+
+    async def _bounded(
+        entry: ConfigEntry,
+    ) -> tuple[list[str] | None, list[tuple[datetime, float]], dict[str, Any]]:
+        async with semaphore:
+            return await _async_subject_section(
+                hass, entry, store, day, day_start, day_end,
+                cached.get(entry.data.get(CONF_SUBJECT_NAME, "Unknown")),
+            )
+
+    sections = await asyncio.gather(*(_bounded(entry) for entry in entries))
+
+    subject_sections: dict[str, list[str] | None] = {}
+    subject_readings: dict[str, list[tuple[datetime, float]]] = {}
+    subject_rollups: dict[str, dict[str, Any]] = {}
+    for entry, (section, readings, rollup) in zip(entries, sections):
+        name = entry.data.get(CONF_SUBJECT_NAME, "Unknown")
+        subject_sections[name] = section
+        subject_readings[name] = readings
+        subject_rollups[name] = rollup
+    return subject_sections, subject_readings, subject_rollups
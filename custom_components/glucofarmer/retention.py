@@ -0,0 +1,124 @@
+"""Event retention: purge archived events and roll old events into yearly summaries."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_VERSION
+from .store import EventRecord, GlucoFarmerStore
+
+_LOGGER = logging.getLogger(__name__)
+
+SUMMARY_STORAGE_KEY = f"{DOMAIN}_yearly_summaries"
+
+
+@dataclass(slots=True)
+class CompactionStats:
+    """Result of one compaction run."""
+
+    events_purged: int = 0
+    events_summarized: int = 0
+    bytes_reclaimed: int = 0
+    duration_ms: float = 0.0
+    finished_at: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats as a plain dict (service response)."""
+        return asdict(self)
+
+
+def select_expired(
+    events: list[EventRecord], purge_before: str | None, summarize_before: str | None
+) -> tuple[list[EventRecord], list[EventRecord], int]:
+    """Split out events that retention removes.
+
+    Returns (archived events to purge, events to roll into summaries,
+    approximate persisted size of both in bytes). Archived events are
+    purged, never summarized. Runs in the executor.
+    """
+    purged: list[EventRecord] = []
+    summarized: list[EventRecord] = []
+    for e in events:
+        if e.archived:
+            if purge_before is not None and e.timestamp < purge_before:
+                purged.append(e)
+        elif summarize_before is not None and e.timestamp < summarize_before:
+            summarized.append(e)
+    size = sum(
+        len(json.dumps(e.to_dict(), separators=(",", ":"))) for e in purged + summarized
+    )
+    return purged, summarized, size
+
+
+class YearlySummaries:
+    """Persisted per subject/year/type count and sum of rolled-up events."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the summary store."""
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, SUMMARY_STORAGE_KEY)
+        self._data: dict[str, dict[str, dict[str, dict[str, float]]]] | None = None
+
+    async def async_load(self) -> dict[str, dict[str, dict[str, dict[str, float]]]]:
+        """Return {subject: {year: {type: {count, sum}}}}."""
+        if self._data is None:
+            stored = await self._store.async_load()
+            self._data = stored.get("subjects", {}) if stored else {}
+        return self._data
+
+    async def async_add(self, events: list[EventRecord]) -> None:
+        """Fold events into the summaries and save."""
+        data = await self.async_load()
+        for e in events:
+            bucket = (
+                data.setdefault(e.subject_name, {})
+                .setdefault(e.timestamp[:4], {})
+                .setdefault(e.type, {"count": 0, "sum": 0.0})
+            )
+            bucket["count"] += 1
+            bucket["sum"] = round(bucket["sum"] + e.amount, 2)
+        await self._store.async_save({"subjects": data})
+
+
+async def async_compact_events(
+    hass: HomeAssistant,
+    store: GlucoFarmerStore,
+    summaries: YearlySummaries,
+    purge_before: str | None,
+    summarize_before: str | None,
+) -> CompactionStats:
+    """Purge old archived events and roll old events into yearly summaries.
+
+    Summaries are saved before the events are removed, so an interrupted run
+    never loses an event without its summary.
+    """
+    started = time.monotonic()
+    stats = CompactionStats()
+    if purge_before is not None or summarize_before is not None:
+        candidates = await store.async_retention_candidates(purge_before, summarize_before)
+        purged, summarized, size = await hass.async_add_executor_job(
+            select_expired, candidates, purge_before, summarize_before
+        )
+        if summarized:
+            await summaries.async_add(summarized)
+        if purged or summarized:
+            await store.async_remove_events(purged + summarized)
+        stats.events_purged = len(purged)
+        stats.events_summarized = len(summarized)
+        stats.bytes_reclaimed = size
+
+    stats.duration_ms = round((time.monotonic() - started) * 1000, 1)
+    stats.finished_at = datetime.now().isoformat()
+    _LOGGER.info(
+        "Event compaction: %d archived purged, %d summarized, ~%d bytes in %.1f ms",
+        stats.events_purged, stats.events_summarized,
+        stats.bytes_reclaimed, stats.duration_ms,
+    )
+    return stats
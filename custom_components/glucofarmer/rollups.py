@@ -0,0 +1,262 @@
+"""Per-day report rollups and the weekly/monthly summaries built on them.
+
+The daily report stores a small aggregate per subject and day (covered and
+per-zone minutes, mean/min/max, insulin and BE totals). Weekly and monthly
+reports only sum these, so they never re-query weeks of recorder history.
+The event totals of a stored day are re-counted whenever the events of that
+day change (late imports, back-dated logs, deletions).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, REPORT_PERIOD_MONTH, REPORT_PERIOD_WEEK, STORAGE_VERSION
+from .report import event_totals
+from .store import GlucoFarmerStore, StoreChange
+
+ROLLUP_STORAGE_KEY = f"{DOMAIN}_daily_rollups"
+
+# Days of rollups kept: a full year plus the previous period for comparisons
+_ROLLUP_RETENTION_DAYS = 400
+
+# Zone order in a rollup's "zones_min" list
+_ZONE_CRIT_LOW, _ZONE_LOW, _ZONE_IN_RANGE, _ZONE_HIGH, _ZONE_VERY_HIGH = range(5)
+
+
+class DailyRollups:
+    """Persisted {subject: {day: rollup}} written by the daily report."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the rollup store."""
+        self._hass = hass
+        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, ROLLUP_STORAGE_KEY)
+        self._data: dict[str, dict[str, dict[str, Any]]] | None = None
+        # (subject, day) pairs whose event totals wait for a re-count
+        self._stale: set[tuple[str, str]] = set()
+
+    async def async_load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return {subject: {day: rollup}}."""
+        if self._data is None:
+            stored = await self._store.async_load()
+            self._data = stored.get("subjects", {}) if stored else {}
+        return self._data
+
+    async def async_set_day(self, day: str, rollups: dict[str, dict[str, Any]]) -> None:
+        """Store (or replace) the rollups of one day and drop expired days."""
+        await self.async_set_days({day: rollups})
+
+    async def async_set_days(self, days: dict[str, dict[str, dict[str, Any]]]) -> None:
+        """Store (or replace) {day: {subject: rollup}} in one save."""
+        if not days:
+            return
+        data = await self.async_load()
+        cutoff = (
+            date.fromisoformat(max(days)) - timedelta(days=_ROLLUP_RETENTION_DAYS)
+        ).isoformat()
+        for day, rollups in days.items():
+            for subject_name, rollup in rollups.items():
+                data.setdefault(subject_name, {})[day] = rollup
+        for subject_days in data.values():
+            for expired in [d for d in subject_days if d < cutoff]:
+                del subject_days[expired]
+        await self._store.async_save({"subjects": data})
+
+    @callback
+    def async_track_store(self, store: GlucoFarmerStore) -> CALLBACK_TYPE:
+        """Keep the event totals of stored days in step with the event store."""
+
+        @callback
+        def _store_changed(change: StoreChange) -> None:
+            queued = bool(self._stale)
+            self._stale.update((change.subject_name, day) for day in change.dates)
+            if not queued and self._stale:
+                self._hass.async_create_task(self._async_retotal(store))
+
+        return store.async_subscribe(_store_changed)
+
+    async def _async_retotal(self, store: GlucoFarmerStore) -> None:
+        """Re-count the event totals of the queued days that have a rollup."""
+        data = await self.async_load()
+        stale, self._stale = self._stale, set()
+        changed = False
+        for subject_name, day in stale:
+            rollup = data.get(subject_name, {}).get(day)
+            if rollup is None:
+                continue
+            events = await store.async_get_events_for_date(subject_name, day)
+            rollup.update(event_totals(events))
+            changed = True
+        if changed:
+            await self._store.async_save({"subjects": data})
+
+
+def get_daily_rollups(hass: HomeAssistant) -> DailyRollups:
+    """Return the shared daily rollup store (created on first use)."""
+    domain_data = hass.data[DOMAIN]
+    if "rollups" not in domain_data:
+        domain_data["rollups"] = DailyRollups(hass)
+    return domain_data["rollups"]
+
+
+@dataclass(slots=True)
+class PeriodSummary:
+    """Summed rollups of one subject over a period."""
+
+    days: int
+    days_with_data: int = 0
+    coverage: float = 0.0
+    pct_below: float = 0.0
+    pct_in_range: float = 0.0
+    pct_above: float = 0.0
+    glucose_mean: float | None = None
+    glucose_min: int | None = None
+    glucose_max: int | None = None
+    insulin_total: float = 0.0
+    bes_total: float = 0.0
+    emergencies: int = 0
+    interventions: int = 0
+
+    @property
+    def insulin_per_day(self) -> float:
+        """Average daily insulin over the days with a rollup."""
+        return round(self.insulin_total / self.days_with_data, 1) if self.days_with_data else 0.0
+
+    @property
+    def bes_per_day(self) -> float:
+        """Average daily BE over the days with a rollup."""
+        return round(self.bes_total / self.days_with_data, 1) if self.days_with_data else 0.0
+
+
+def period_bounds(period: str, today: date) -> tuple[date, date]:
+    """Return (first day, day after the last) of the last full period before today."""
+    if period == REPORT_PERIOD_WEEK:
+        end = today - timedelta(days=today.weekday())
+        return end - timedelta(days=7), end
+    if period == REPORT_PERIOD_MONTH:
+        end = today.replace(day=1)
+        return (end - timedelta(days=1)).replace(day=1), end
+    raise ValueError(f"Unknown report period: {period}")
+
+
+def summarize_period(
+    days: dict[str, dict[str, Any]], start: date, end: date
+) -> PeriodSummary:
+    """Sum the rollups of days start <= day < end."""
+    result = PeriodSummary(days=(end - start).days)
+    first, last = start.isoformat(), end.isoformat()
+    total_min = covered_min = weighted_sum = 0.0
+    zones = [0.0] * 5
+    for day, rollup in days.items():
+        if not first <= day < last:
+            continue
+        result.days_with_data += 1
+        total_min += rollup["minutes"]
+        result.insulin_total += rollup["insulin"]
+        result.bes_total += rollup["bes"]
+        result.emergencies += rollup.get("emergencies", 0)
+        result.interventions += rollup.get("interventions", 0)
+        covered = rollup["covered_min"]
+        if covered <= 0:
+            continue
+        covered_min += covered
+        weighted_sum += rollup["mean"] * covered
+        zones = [z + m for z, m in zip(zones, rollup["zones_min"])]
+        if result.glucose_min is None or rollup["min"] < result.glucose_min:
+            result.glucose_min = rollup["min"]
+        if result.glucose_max is None or rollup["max"] > result.glucose_max:
+            result.glucose_max = rollup["max"]
+
+    result.insulin_total = round(result.insulin_total, 1)
+    result.bes_total = round(result.bes_total, 1)
+    # Days without a rollup count as uncovered
+    period_min = total_min + (result.days - result.days_with_data) * 1440
+    if period_min > 0:
+        result.coverage = round(covered_min / period_min * 100, 1)
+    if covered_min > 0:
+        result.glucose_mean = round(weighted_sum / covered_min, 1)
+        result.pct_below = round((zones[_ZONE_CRIT_LOW] + zones[_ZONE_LOW]) / covered_min * 100, 1)
+        result.pct_in_range = round(zones[_ZONE_IN_RANGE] / covered_min * 100, 1)
+        result.pct_above = round((zones[_ZONE_HIGH] + zones[_ZONE_VERY_HIGH]) / covered_min * 100, 1)
+    return result
+
+
+def _delta(current: float | None, previous: float | None, has_previous: bool) -> str:
+    """Format the change versus the previous period, e.g. " (+4.1)"."""
+    if not has_previous or current is None or previous is None:
+        return ""
+    return f" ({current - previous:+.1f})"
+
+
+def build_period_report(
+    period: str,
+    start: date,
+    end: date,
+    subject_names: list[str],
+    rollups: dict[str, dict[str, dict[str, Any]]],
+) -> tuple[str, str]:
+    """Build the summary text and a per-day CSV for one period.
+
+    Figures in parentheses are the change versus the previous period.
+    """
+    prev_start, prev_end = period_bounds(period, start)
+    last_day = end - timedelta(days=1)
+    label = "weekly" if period == REPORT_PERIOD_WEEK else "monthly"
+    lines = [
+        f"GlucoFarmer {label} report - {start.isoformat()} to {last_day.isoformat()}",
+        "=" * 60,
+        f"Changes in parentheses: versus {prev_start.isoformat()} to "
+        f"{(prev_end - timedelta(days=1)).isoformat()}",
+        "",
+    ]
+    csv_lines = ["Subject;Date;Coverage_pct;In_range_pct;Mean_mgdL;Insulin_IU;Feeding_BE"]
+
+    for subject_name in subject_names:
+        days = rollups.get(subject_name, {})
+        cur = summarize_period(days, start, end)
+        prev = summarize_period(days, prev_start, prev_end)
+        has_prev = prev.days_with_data > 0
+        lines.append(f"--- {subject_name} ---")
+        if not cur.days_with_data:
+            lines.extend(["  No report data for this period", ""])
+            continue
+        lines.extend([
+            f"  Days with data: {cur.days_with_data}/{cur.days}  |  "
+            f"Coverage: {cur.coverage}%{_delta(cur.coverage, prev.coverage, has_prev)}",
+            f"  In range: {cur.pct_in_range}%{_delta(cur.pct_in_range, prev.pct_in_range, has_prev)}  |  "
+            f"Below: {cur.pct_below}%{_delta(cur.pct_below, prev.pct_below, has_prev)}  |  "
+            f"Above: {cur.pct_above}%{_delta(cur.pct_above, prev.pct_above, has_prev)}",
+            f"  Mean: {cur.glucose_mean if cur.glucose_mean is not None else 'N/A'} mg/dL"
+            f"{_delta(cur.glucose_mean, prev.glucose_mean, has_prev)}  |  "
+            f"Min: {cur.glucose_min if cur.glucose_min is not None else 'N/A'}  |  "
+            f"Max: {cur.glucose_max if cur.glucose_max is not None else 'N/A'}",
+            f"  Total insulin: {cur.insulin_total} IU  |  {cur.insulin_per_day} IU/day"
+            f"{_delta(cur.insulin_per_day, prev.insulin_per_day, has_prev)}",
+            f"  Total feeding: {cur.bes_total} BE  |  {cur.bes_per_day} BE/day"
+            f"{_delta(cur.bes_per_day, prev.bes_per_day, has_prev)}",
+        ])
+        if cur.emergencies:
+            lines.append(f"  Emergency rations: {cur.emergencies}")
+        if cur.interventions:
+            lines.append(f"  Interventions: {cur.interventions}")
+        lines.append("")
+
+        for day in sorted(d for d in days if start.isoformat() <= d < end.isoformat()):
+            rollup = days[day]
+            in_range = (
+                round(rollup["zones_min"][_ZONE_IN_RANGE] / rollup["covered_min"] * 100, 1)
+                if rollup["covered_min"] > 0 else ""
+            )
+            coverage = round(rollup["covered_min"] / rollup["minutes"] * 100, 1)
+            mean = rollup["mean"] if rollup["covered_min"] > 0 else ""
+            csv_lines.append(
+                f"{subject_name};{day};{coverage};{in_range};{mean};"
+                f"{rollup['insulin']};{rollup['bes']}"
+            )
+
+    return "\n".join(lines), "\n".join(csv_lines)
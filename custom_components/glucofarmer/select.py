@@ -10,6 +10,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from .const import (
+    CHART_TIMERANGE_DAY_OPTIONS,
     CONF_INSULIN_TYPES,
     CONF_MEALS,
     CONF_SUBJECT_NAME,
@@ -20,7 +21,7 @@ from .coordinator import GlucoFarmerConfigEntry, GlucoFarmerCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-CHART_TIMERANGE_OPTIONS = ["3h", "6h", "12h", "24h"]
+CHART_TIMERANGE_OPTIONS = ["3h", "6h", "12h", "24h", *CHART_TIMERANGE_DAY_OPTIONS]
 
 
 async def async_setup_entry(
@@ -124,15 +125,7 @@ class GlucoFarmerMealSelect(SelectEntity):
     def _compute_be(self, meal_name: str) -> float:
         if meal_name == "Any":
             return 0.0
-        meals = self._entry.options.get(CONF_MEALS, [])
-        meal = next((m for m in meals if m["name"] == meal_name), None)
-        if meal is None:
-            return 0.0
-        if "amount" in meal:
-            return float(meal["amount"])
-        if "be_per_kg" in meal:
-            return round(float(meal["be_per_kg"]) * self._coordinator.weight_kg, 2)
-        return 0.0
+        return self._coordinator.compute_meal_be(meal_name) or 0.0
 
 
 class GlucoFarmerInsulinTypeSelect(SelectEntity):
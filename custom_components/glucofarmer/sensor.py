@@ -12,15 +12,17 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE, UnitOfTime
+from homeassistant.const import MATCH_ALL, PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    CHART_SPAN_HOURS,
     CONF_SUBJECT_NAME,
     DOMAIN,
+    RECENT_EVENTS_SHOWN,
     STATUS_CRITICAL_LOW,
     STATUS_HIGH,
     STATUS_LOW,
@@ -181,6 +183,11 @@ SENSOR_DESCRIPTIONS: tuple[GlucoFarmerSensorEntityDescription, ...] = (
         state_class=SensorStateClass.TOTAL,
         value_fn=lambda data: data.daily_bes_total,
     ),
+    GlucoFarmerSensorEntityDescription(
+        key="status_line",
+        translation_key="status_line",
+        value_fn=lambda data: data.status_line,
+    ),
 )
 
 
@@ -201,6 +208,9 @@ async def async_setup_entry(
     entities.append(
         GlucoFarmerEventsSensor(coordinator, subject_name, entry.entry_id)
     )
+    entities.append(
+        GlucoFarmerChartSensor(coordinator, subject_name, entry.entry_id)
+    )
     async_add_entities(entities)
 
 
@@ -278,28 +288,85 @@ class GlucoFarmerEventsSensor(
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return formatted events list (newest first, max 10) for markdown display."""
+        """Return the newest events, as a list and as one label per entry_<n>.
+
+        The entry_<n> labels are shown by attribute rows on the dashboard.
+        """
         if self.coordinator.data is None:
             return {"events": []}
         events = sorted(
             self.coordinator.data.today_events,
-            key=lambda e: e.get("timestamp", ""),
+            key=lambda e: e.timestamp,
             reverse=True,
-        )[:10]
+        )[:RECENT_EVENTS_SHOWN]
         formatted = []
         for e in events:
-            ts = e.get("timestamp", "")
+            ts = e.timestamp
             time_str = ts[11:16] if len(ts) >= 16 else ts  # HH:MM
-            if e.get("type") == "feeding":
+            if e.type == "feeding":
                 formatted.append({
                     "type": "feeding",
-                    "label": f"🍎 {time_str}  {e.get('amount', 0)} BE  ({e.get('category', '')})",
-                    "id": e.get("id", ""),
+                    "label": f"🍎 {time_str}  {e.amount} BE  ({e.category or ''})",
+                    "id": e.event_id,
                 })
             else:
                 formatted.append({
                     "type": "insulin",
-                    "label": f"💉 {time_str}  {e.get('amount', 0)} IU  ({e.get('product', '')})",
-                    "id": e.get("id", ""),
+                    "label": f"💉 {time_str}  {e.amount} IU  ({e.product or ''})",
+                    "id": e.event_id,
                 })
-        return {"events": formatted}
+        return {"events": formatted} | {
+            f"entry_{n}": e["label"] for n, e in enumerate(formatted, start=1)
+        }
+
+
+class GlucoFarmerChartSensor(
+    CoordinatorEntity[GlucoFarmerCoordinator], SensorEntity
+):
+    """Sensor serving downsampled glucose series for the dashboard charts.
+
+    The state is the number of buffered readings (not the glucose value, so
+    the recorder keeps no second glucose history); attribute points_<span>
+    holds [[timestamp_ms, mg/dL], ...] for each span in CHART_SPAN_HOURS and
+    daily the per-day statistics, read by apexcharts-card data_generators
+    instead of raw recorder history. Long spans and daily only change when
+    rebuilt, so state updates to the frontend leave them out otherwise.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "glucose_chart"
+    # Series are rebuilt from the recorder on startup; never record them
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(
+        self,
+        coordinator: GlucoFarmerCoordinator,
+        subject_name: str,
+        entry_id: str,
+    ) -> None:
+        """Initialize the chart sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry_id}_glucose_chart"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            name=subject_name,
+            manufacturer="GlucoFarmer",
+            model="Subject CGM Monitor",
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of readings the chart series are built from."""
+        return self.coordinator.chart_readings
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the downsampled series per span and the per-day statistics."""
+        attributes: dict[str, Any] = {
+            f"points_{span}": self.coordinator.chart_points(span)
+            for span in CHART_SPAN_HOURS
+        }
+        attributes["daily"] = (
+            self.coordinator.data.daily_stats if self.coordinator.data is not None else []
+        )
+        return attributes
@@ -2,44 +2,500 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, insort
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
+from operator import attrgetter
+import sys
 from typing import Any
 import uuid
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
 
 from .const import (
-    DOMAIN,
+    DEFAULT_SAVE_DELAY,
     EVENT_TYPE_FEEDING,
     EVENT_TYPE_INSULIN,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
     STORAGE_KEY,
     STORAGE_VERSION,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Upper bound for open-ended timestamp ranges (ISO strings compare lexically)
+MAX_TIMESTAMP = "9999-12-31T23:59:59"
+
+_timestamp = attrgetter("timestamp")
+
+# StoreChange kinds
+CHANGE_ADDED = "added"
+CHANGE_ARCHIVED = "archived"
+CHANGE_REMOVED = "removed"
+
+
+def _intern(value: str | None) -> str | None:
+    """Intern repeated strings so all records share one object per value."""
+    return sys.intern(value) if value is not None else None
+
+
+def parse_event_id(event_id: str) -> int | None:
+    """Convert a UUID string (as exposed to users) to its 128-bit int form."""
+    try:
+        return uuid.UUID(event_id).int
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+@dataclass(slots=True)
+class EventRecord:
+    """Compact in-memory representation of one insulin or feeding event.
+
+    Subject, type, product and category are interned and the UUID is held as
+    a 128-bit int. Records are converted to plain dicts only at the Store JSON
+    boundary (to_dict/from_dict) and when rendered into entity attributes.
+    """
+
+    id: int
+    type: str
+    subject_name: str
+    amount: float
+    timestamp: str
+    created_at: str
+    product: str | None = None
+    category: str | None = None
+    description: str | None = None
+    note: str | None = None
+    archived: bool = False
+
+    @property
+    def event_id(self) -> str:
+        """Return the event ID in its canonical UUID string form."""
+        return str(uuid.UUID(int=self.id))
+
+    @classmethod
+    def create(
+        cls,
+        event_type: str,
+        subject_name: str,
+        amount: float,
+        timestamp: str | None = None,
+        *,
+        product: str | None = None,
+        category: str | None = None,
+        description: str | None = None,
+        note: str | None = None,
+    ) -> EventRecord:
+        """Create a new record with a fresh ID and interned strings."""
+        now = datetime.now().isoformat()
+        return cls(
+            id=uuid.uuid4().int,
+            type=sys.intern(event_type),
+            subject_name=sys.intern(subject_name),
+            amount=amount,
+            timestamp=timestamp or now,
+            created_at=now,
+            product=_intern(product),
+            category=_intern(category),
+            description=description,
+            note=note,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EventRecord:
+        """Build a record from its persisted dict form."""
+        return cls(
+            id=uuid.UUID(data["id"]).int,
+            type=sys.intern(data["type"]),
+            subject_name=sys.intern(data["subject_name"]),
+            amount=data.get("amount", 0),
+            timestamp=data["timestamp"],
+            created_at=data.get("created_at", data["timestamp"]),
+            product=_intern(data.get("product")),
+            category=_intern(data.get("category")),
+            description=data.get("description"),
+            note=data.get("note"),
+            archived=bool(data.get("archived", False)),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the persisted dict form (same shape as before records existed)."""
+        data: dict[str, Any] = {
+            "id": self.event_id,
+            "type": self.type,
+            "subject_name": self.subject_name,
+        }
+        if self.type == EVENT_TYPE_INSULIN:
+            data["product"] = self.product
+            data["amount"] = self.amount
+        else:
+            data["amount"] = self.amount
+            data["category"] = self.category
+            data["description"] = self.description
+        data["timestamp"] = self.timestamp
+        data["created_at"] = self.created_at
+        if self.type == EVENT_TYPE_INSULIN:
+            data["note"] = self.note
+        if self.archived:
+            data["archived"] = True
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class StoreChange:
+    """One subject's share of a store mutation, as published to subscribers.
+
+    dates are the local dates (YYYY-MM-DD) of the affected event timestamps,
+    so a backdated event crossing midnight reports yesterday, not today.
+    """
+
+    kind: str
+    subject_name: str
+    dates: frozenset[str]
+    event_types: frozenset[str]
+
+
+class EventBackend:
+    """Persistence backend behind GlucoFarmerStore.
+
+    The store keeps the events of each loaded subject in memory and serves
+    the synchronous getters from there. A backend whose ``complete`` flag is
+    False only loads a recent window (``hot_since`` onwards) and answers
+    range queries and deletes for older events itself.
+    """
+
+    complete = True
+    hot_since = ""
+
+    async def async_load(self) -> None:
+        """Open the backend (one-time migrations go here)."""
+
+    async def async_load_subject(self, subject_name: str) -> list[EventRecord]:
+        """Return the events of one subject to hold in memory."""
+        raise NotImplementedError
+
+    async def async_release_subject(self, subject_name: str) -> None:
+        """Drop per-subject resources once its entry is unloaded."""
+
+    async def async_save(self, changed: list[EventRecord]) -> None:
+        """Persist new or modified events (may be deferred, see save_delay)."""
+        raise NotImplementedError
+
+    async def async_archive(self, event_id: int) -> EventRecord | None:
+        """Soft-delete an event that is not held in memory; return it if found."""
+        return None
+
+    async def async_expired(
+        self, purge_before: str | None, summarize_before: str | None
+    ) -> list[EventRecord]:
+        """Return retention candidates that are not held in memory.
+
+        Archived events older than purge_before and live events older than
+        summarize_before. Complete backends hold everything in memory.
+        """
+        return []
+
+    async def async_remove(self, events: list[EventRecord]) -> None:
+        """Permanently delete events (retention only; users archive)."""
+        raise NotImplementedError
+
+    async def async_query(
+        self,
+        subject_name: str | None,
+        start: str,
+        end: str,
+        event_type: str | None = None,
+        category: str | None = None,
+        product: str | None = None,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """Return non-archived events with start <= timestamp < end.
+
+        Ordered by (timestamp, id); only events sorting after the after key,
+        at most limit of them.
+        """
+        return []
+
+    async def async_close(self) -> None:
+        """Release backend resources."""
+
+
+class JsonEventBackend(EventBackend):
+    """Default backend: one HA Store JSON file (shard) per subject.
+
+    Saving rewrites only the shard of the subject that changed. The original
+    STORAGE_KEY file is kept as a manifest mapping subject -> shard key; a
+    legacy file that still holds all events is split into shards on load.
+    The manifest also records which backend holds the current events, so a
+    switch back from SQLite copies the events logged meanwhile.
+
+    With a save delay, writes go through Store.async_delay_save: mutations
+    within the delay coalesce into one write per shard, and HA flushes
+    pending delayed saves on its final write at shutdown.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        events_fn: Callable[[str], list[EventRecord]],
+        save_delay: float = 0,
+    ) -> None:
+        """Initialize the backend."""
+        self._hass = hass
+        self._save_delay = save_delay
+        self._manifest = Store[dict[str, Any]](hass, STORAGE_VERSION, STORAGE_KEY)
+        self._keys: dict[str, str] = {}
+        # Backend that holds the current events (None: manifest predates it)
+        self.synced_backend: str | None = None
+        # Shard Stores are kept after a subject is released: a reload must
+        # see a still-pending delayed save rather than the stale file
+        self._shards: dict[str, Store[dict[str, Any]]] = {}
+        self._events_fn = events_fn
+
+    def _shard(self, subject_name: str) -> tuple[Store[dict[str, Any]], bool]:
+        """Return the shard Store for a subject and whether its key is new."""
+        is_new = subject_name not in self._keys
+        if is_new:
+            key = base = f"{STORAGE_KEY}.{slugify(subject_name) or 'subject'}"
+            suffix = 2
+            while key in self._keys.values():
+                key = f"{base}_{suffix}"
+                suffix += 1
+            self._keys[subject_name] = key
+        store = self._shards.get(subject_name)
+        if store is None:
+            store = self._shards[subject_name] = Store[dict[str, Any]](
+                self._hass, STORAGE_VERSION, self._keys[subject_name]
+            )
+        return store, is_new
+
+    async def _async_save_manifest(self) -> None:
+        await self._manifest.async_save(
+            {"shards": dict(self._keys), "backend": self.synced_backend}
+        )
+
+    async def async_mark_synced(self, backend: str) -> None:
+        """Record that backend now holds the current events."""
+        self.synced_backend = backend
+        await self._async_save_manifest()
+
+    async def async_read_manifest(self) -> dict[str, Any]:
+        """Read the manifest (shard keys and synced backend) and return it."""
+        data = await self._manifest.async_load() or {}
+        self._keys = dict(data.get("shards", {}))
+        self.synced_backend = data.get("backend")
+        return data
+
+    async def async_load(self) -> None:
+        """Read the manifest; take the events over from SQLite if it was active.
+
+        A legacy file that still holds all events is split into shards once.
+        """
+        data = await self.async_read_manifest()
+        if legacy := data.get("events"):
+            by_subject: dict[str, list[dict[str, Any]]] = {}
+            for raw in legacy:
+                by_subject.setdefault(raw["subject_name"], []).append(raw)
+            # Shards first, manifest last: an interrupted split is simply redone
+            for subject_name, events in by_subject.items():
+                store, _ = self._shard(subject_name)
+                await store.async_save({"events": events})
+            await self._async_save_manifest()
+            self._shards.clear()
+            _LOGGER.info(
+                "Split %d events into %d per-subject shards", len(legacy), len(by_subject)
+            )
+
+        if self.synced_backend == STORAGE_BACKEND_SQLITE:
+            from .store_sqlite import SqliteEventBackend  # avoid circular import at module level
+
+            records = await SqliteEventBackend(self._hass).async_read_all()
+            await self.async_replace_all(records)
+            _LOGGER.info("Copied %d events back from the SQLite database", len(records))
+        if self.synced_backend != STORAGE_BACKEND_JSON:
+            await self.async_mark_synced(STORAGE_BACKEND_JSON)
+
+    async def async_remove(self, events: list[EventRecord]) -> None:
+        """Rewrite the shards the events were removed from."""
+        await self.async_save(events)
+
+    async def async_load_subject(self, subject_name: str) -> list[EventRecord]:
+        """Load one subject's shard."""
+        if subject_name not in self._keys:
+            return []
+        store, _ = self._shard(subject_name)
+        data = await store.async_load()
+        raw = data.get("events", []) if data is not None else []
+        return [EventRecord.from_dict(e) for e in raw]
+
+    async def async_load_all(self) -> list[EventRecord]:
+        """Load every shard (used when migrating to another backend)."""
+        events: list[EventRecord] = []
+        for subject_name in list(self._keys):
+            events.extend(await self.async_load_subject(subject_name))
+            self._shards.pop(subject_name, None)
+        return events
+
+    async def async_replace_all(self, events: list[EventRecord]) -> None:
+        """Rewrite every shard with events (backend switch; nothing loaded yet)."""
+        by_subject: dict[str, list[EventRecord]] = {name: [] for name in self._keys}
+        for event in events:
+            by_subject.setdefault(event.subject_name, []).append(event)
+        # Shards first, manifest last: an interrupted copy is simply redone
+        for subject_name, subject_events in by_subject.items():
+            store, _ = self._shard(subject_name)
+            subject_events.sort(key=_timestamp)
+            await store.async_save({"events": [e.to_dict() for e in subject_events]})
+        await self._async_save_manifest()
+        self._shards.clear()
+
+    async def async_save(self, changed: list[EventRecord]) -> None:
+        """Rewrite (or schedule a rewrite of) every shard touched by the change."""
+        manifest_changed = False
+        for subject_name in {e.subject_name for e in changed}:
+            store, is_new = self._shard(subject_name)
+            manifest_changed |= is_new
+            # Bind the live list now: the data is serialized when the delayed
+            # save fires, even if the subject was released in the meantime
+            events = self._events_fn(subject_name)
+            if self._save_delay > 0:
+                store.async_delay_save(
+                    lambda events=events: {"events": [e.to_dict() for e in events]},
+                    self._save_delay,
+                )
+            else:
+                await store.async_save({"events": [e.to_dict() for e in events]})
+        if manifest_changed:
+            # New shards are rare -- write the manifest right away
+            await self._async_save_manifest()
+
 
 class GlucoFarmerStore:
     """Manage persistent storage for insulin and feeding events."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        """Initialize the store."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        backend: str = STORAGE_BACKEND_JSON,
+        save_delay: float = DEFAULT_SAVE_DELAY,
+    ) -> None:
+        """Initialize the store.
+
+        Mutations update memory immediately; persistence is write-behind with
+        save_delay seconds of coalescing (0 = write before returning).
+        """
         self._hass = hass
-        self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, STORAGE_KEY)
-        self._events: list[dict[str, Any]] = []
+        self._by_id: dict[int, EventRecord] = {}
+        # Loaded subjects (shards), each list sorted by timestamp
+        self._by_subject: dict[str, list[EventRecord]] = {}
+        # Subjects of set-up entries; others are only loaded for a write
+        self._held: set[str] = set()
+        self._listeners: list[Callable[[StoreChange], None]] = []
         self._loaded = False
+        if backend == STORAGE_BACKEND_SQLITE:
+            from .store_sqlite import SqliteEventBackend  # avoid circular import at module level
+            self._backend: EventBackend = SqliteEventBackend(hass, save_delay)
+        else:
+            self._backend = JsonEventBackend(
+                hass, lambda subject: self._by_subject.get(subject, []), save_delay
+            )
 
     async def async_load(self) -> None:
-        """Load data from storage."""
-        data = await self._store.async_load()
-        self._events = data.get("events", []) if data is not None else []
+        """Open storage. Subjects are loaded separately (async_load_subject)."""
+        await self._backend.async_load()
         self._loaded = True
 
-    async def _async_save(self) -> None:
+    async def async_load_subject(self, subject_name: str) -> None:
+        """Load a subject's events and hold them until the entry is released."""
+        self._held.add(subject_name)
+        await self._async_ensure_loaded(subject_name)
+
+    async def _async_ensure_loaded(self, subject_name: str) -> None:
+        """Load a subject's events into memory (no-op if already loaded)."""
+        if not self._loaded:
+            await self.async_load()
+        if subject_name in self._by_subject:
+            return
+        events = await self._backend.async_load_subject(subject_name)
+        events.sort(key=_timestamp)
+        self._by_subject[subject_name] = events
+        for event in events:
+            self._by_id[event.id] = event
+
+    async def async_release_subject(self, subject_name: str) -> None:
+        """Drop a subject's events from memory (its entry was unloaded)."""
+        self._held.discard(subject_name)
+        for event in self._by_subject.pop(subject_name, []):
+            self._by_id.pop(event.id, None)
+        await self._backend.async_release_subject(subject_name)
+
+    async def _async_release_unheld(self, subject_names: set[str]) -> None:
+        """Release subjects that were only loaded for a write (e.g. disabled entries).
+
+        Pending delayed saves keep their own reference to the event list.
+        """
+        for subject_name in subject_names - self._held:
+            await self.async_release_subject(subject_name)
+
+    async def async_close(self) -> None:
+        """Flush pending writes and close the backend (last entry unloads)."""
+        await self._backend.async_close()
+
+    async def _async_save(self, changed: list[EventRecord]) -> None:
         """Save data to storage."""
-        await self._store.async_save({"events": self._events})
+        await self._backend.async_save(changed)
+
+    @callback
+    def async_subscribe(
+        self, listener: Callable[[StoreChange], None]
+    ) -> CALLBACK_TYPE:
+        """Call listener with one StoreChange per affected subject after each mutation."""
+        self._listeners.append(listener)
+
+        @callback
+        def _unsubscribe() -> None:
+            self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    @callback
+    def _notify(self, kind: str, events: list[EventRecord]) -> None:
+        """Publish a mutation (memory is already updated; the save may be pending)."""
+        if not self._listeners or not events:
+            return
+        by_subject: dict[str, list[EventRecord]] = {}
+        for event in events:
+            by_subject.setdefault(event.subject_name, []).append(event)
+        for subject_name, subject_events in by_subject.items():
+            change = StoreChange(
+                kind,
+                subject_name,
+                frozenset(e.timestamp[:10] for e in subject_events),
+                frozenset(e.type for e in subject_events),
+            )
+            for listener in list(self._listeners):
+                listener(change)
+
+    def _append(self, event: EventRecord) -> None:
+        self._by_id[event.id] = event
+        insort(self._by_subject[event.subject_name], event, key=_timestamp)
+
+    def _subject_range(
+        self, subject_name: str, start_iso: str, end_iso: str
+    ) -> list[EventRecord]:
+        """Slice of a subject's index with start <= timestamp < end."""
+        events = self._by_subject.get(subject_name)
+        if not events:
+            return []
+        lo = bisect_left(events, start_iso, key=_timestamp)
+        hi = bisect_left(events, end_iso, lo=lo, key=_timestamp)
+        return events[lo:hi]
 
     # ---- Events (insulin, feeding) ----
 
@@ -52,25 +508,22 @@ class GlucoFarmerStore:
         note: str | None = None,
     ) -> str:
         """Log an insulin event and return the event ID."""
-        if not self._loaded:
-            await self.async_load()
+        await self._async_ensure_loaded(subject_name)
 
-        event_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
-        event = {
-            "id": event_id,
-            "type": EVENT_TYPE_INSULIN,
-            "subject_name": subject_name,
-            "product": product,
-            "amount": amount,
-            "timestamp": timestamp or now,
-            "created_at": now,
-            "note": note,
-        }
-        self._events.append(event)
-        await self._async_save()
-        _LOGGER.debug("Logged insulin event %s for %s", event_id, subject_name)
-        return event_id
+        event = EventRecord.create(
+            EVENT_TYPE_INSULIN,
+            subject_name,
+            amount,
+            timestamp,
+            product=product,
+            note=note,
+        )
+        self._append(event)
+        self._notify(CHANGE_ADDED, [event])
+        await self._async_save([event])
+        await self._async_release_unheld({subject_name})
+        _LOGGER.debug("Logged insulin event %s for %s", event.event_id, subject_name)
+        return event.event_id
 
     async def async_log_feeding(
         self,
@@ -81,38 +534,176 @@ class GlucoFarmerStore:
         timestamp: str | None = None,
     ) -> str:
         """Log a feeding event and return the event ID."""
-        if not self._loaded:
-            await self.async_load()
+        await self._async_ensure_loaded(subject_name)
 
-        event_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
-        event = {
-            "id": event_id,
-            "type": EVENT_TYPE_FEEDING,
-            "subject_name": subject_name,
-            "amount": amount,
-            "category": category,
-            "description": description,
-            "timestamp": timestamp or now,
-            "created_at": now,
-        }
-        self._events.append(event)
-        await self._async_save()
-        _LOGGER.debug("Logged feeding event %s for %s", event_id, subject_name)
-        return event_id
+        event = EventRecord.create(
+            EVENT_TYPE_FEEDING,
+            subject_name,
+            amount,
+            timestamp,
+            category=category,
+            description=description,
+        )
+        self._append(event)
+        self._notify(CHANGE_ADDED, [event])
+        await self._async_save([event])
+        await self._async_release_unheld({subject_name})
+        _LOGGER.debug("Logged feeding event %s for %s", event.event_id, subject_name)
+        return event.event_id
+
+    async def async_add_events(self, events: list[EventRecord]) -> None:
+        """Insert a batch of events and persist once."""
+        subject_names = {e.subject_name for e in events}
+        for subject_name in subject_names:
+            await self._async_ensure_loaded(subject_name)
+        if not events:
+            return
+
+        for event in events:
+            self._append(event)
+        self._notify(CHANGE_ADDED, events)
+        await self._async_save(events)
+        await self._async_release_unheld(subject_names)
+        _LOGGER.debug("Added %d events in one batch", len(events))
 
     async def async_delete_event(self, event_id: str) -> bool:
         """Archive an event by ID (soft-delete). Returns True if found."""
         if not self._loaded:
             await self.async_load()
 
-        for event in self._events:
-            if event["id"] == event_id and not event.get("archived"):
-                event["archived"] = True
-                await self._async_save()
-                _LOGGER.debug("Archived event %s", event_id)
-                return True
-        return False
+        key = parse_event_id(event_id)
+        if key is None:
+            return False
+        event = self._by_id.get(key)
+        if event is None:
+            # Older than the in-memory window -- let the backend handle it
+            archived = await self._backend.async_archive(key)
+            if archived is None:
+                return False
+            self._notify(CHANGE_ARCHIVED, [archived])
+            _LOGGER.debug("Archived event %s", event_id)
+            return True
+        if event.archived:
+            return False
+        event.archived = True
+        self._notify(CHANGE_ARCHIVED, [event])
+        await self._async_save([event])
+        _LOGGER.debug("Archived event %s", event_id)
+        return True
+
+    async def async_retention_candidates(
+        self, purge_before: str | None, summarize_before: str | None
+    ) -> list[EventRecord]:
+        """Return every event retention has to look at (see retention.py)."""
+        if not self._loaded:
+            await self.async_load()
+        loaded = [e for events in self._by_subject.values() for e in events]
+        cold = await self._backend.async_expired(purge_before, summarize_before)
+        return loaded + [e for e in cold if e.id not in self._by_id]
+
+    async def async_remove_events(self, events: list[EventRecord]) -> None:
+        """Permanently delete events from memory and storage (retention)."""
+        if not events:
+            return
+        ids = {e.id for e in events}
+        for subject_name in {e.subject_name for e in events}:
+            loaded = self._by_subject.get(subject_name)
+            if loaded is not None:
+                # In place: pending delayed saves hold a reference to this list
+                loaded[:] = [e for e in loaded if e.id not in ids]
+        for event_id in ids:
+            self._by_id.pop(event_id, None)
+        self._notify(CHANGE_REMOVED, events)
+        await self._backend.async_remove(events)
+
+    async def async_query_events(
+        self,
+        subject_names: list[str] | None = None,
+        start: str = "",
+        end: str = MAX_TIMESTAMP,
+        event_type: str | None = None,
+        category: str | None = None,
+        product: str | None = None,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """Query non-archived events with start <= timestamp < end.
+
+        Results are ordered by (timestamp, id). after is a (timestamp, id)
+        key to continue from and limit caps the result, so a page never
+        reads more than limit events per subject. Served from the
+        per-subject index when the range lies inside the loaded window,
+        otherwise from the backend. subject_names=None matches all subjects.
+        """
+        if not self._loaded:
+            await self.async_load()
+
+        if not self._backend.complete and start < self._backend.hot_since:
+            result = []
+            for name in [None] if subject_names is None else subject_names:
+                result.extend(await self._backend.async_query(
+                    name, start, end, event_type, category, product, after, limit
+                ))
+        else:
+            result = []
+            for name in self._by_subject if subject_names is None else subject_names:
+                result.extend(self._subject_page(
+                    name, start, end, event_type, category, product, after, limit
+                ))
+        result.sort(key=lambda e: (e.timestamp, e.id))
+        return result if limit is None else result[:limit]
+
+    def _subject_page(
+        self,
+        subject_name: str,
+        start: str,
+        end: str,
+        event_type: str | None,
+        category: str | None,
+        product: str | None,
+        after: tuple[str, int] | None,
+        limit: int | None,
+    ) -> list[EventRecord]:
+        """Matching in-memory events of one subject, see async_query_events.
+
+        The index is sorted by timestamp only, so events sharing the
+        timestamp of the limit-th match are all taken before stopping.
+        """
+        if after is not None:
+            start = max(start, after[0])
+        events = self._by_subject.get(subject_name, [])
+        lo = bisect_left(events, start, key=_timestamp)
+        hi = bisect_left(events, end, lo=lo, key=_timestamp)
+        page: list[EventRecord] = []
+        for i in range(lo, hi):  # no slice copy: a page stops early
+            e = events[i]
+            if limit is not None and len(page) >= limit and e.timestamp > page[-1].timestamp:
+                break
+            if (
+                e.archived
+                or (event_type is not None and e.type != event_type)
+                or (category is not None and e.category != category)
+                or (product is not None and e.product != product)
+                or (after is not None and (e.timestamp, e.id) <= after)
+            ):
+                continue
+            page.append(e)
+        return page
+
+    async def async_get_events_in_range(
+        self,
+        subject_name: str | None,
+        start: datetime,
+        end: datetime,
+        event_type: str | None = None,
+    ) -> list[EventRecord]:
+        """Get non-archived events with start <= timestamp < end, oldest first."""
+        return await self.async_query_events(
+            [subject_name] if subject_name is not None else None,
+            start.isoformat(),
+            end.isoformat(),
+            event_type,
+        )
 
     @callback
     def get_events_for_subject(
@@ -120,37 +711,49 @@ class GlucoFarmerStore:
         subject_name: str,
         event_type: str | None = None,
         since: datetime | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> list[EventRecord]:
         """Get events for a specific subject, optionally filtered."""
-        result = [
-            e for e in self._events
-            if e["subject_name"] == subject_name and not e.get("archived")
+        since_iso = since.isoformat() if since is not None else ""
+        return [
+            e for e in self._subject_range(subject_name, since_iso, MAX_TIMESTAMP)
+            if not e.archived and (event_type is None or e.type == event_type)
         ]
-        if event_type is not None:
-            result = [e for e in result if e["type"] == event_type]
-        if since is not None:
-            since_iso = since.isoformat()
-            result = [e for e in result if e["timestamp"] >= since_iso]
-        return result
 
     @callback
     def get_events_for_date(
         self, subject_name: str, date_str: str, event_type: str | None = None
-    ) -> list[dict[str, Any]]:
-        """Get events for a specific date (YYYY-MM-DD)."""
-        prefix = f"{date_str}T"
-        result = [
-            e for e in self._events
-            if e["subject_name"] == subject_name and e["timestamp"].startswith(prefix)
+    ) -> list[EventRecord]:
+        """Get non-archived events for a specific date (YYYY-MM-DD).
+
+        Matches async_query_events, so a day's totals do not depend on whether
+        it is still held in memory.
+        """
+        # All "<date>T..." timestamps sort between "<date>T" and "<date>U"
+        return [
+            e for e in self._subject_range(subject_name, f"{date_str}T", f"{date_str}U")
+            if not e.archived and (event_type is None or e.type == event_type)
         ]
-        if event_type is not None:
-            result = [e for e in result if e["type"] == event_type]
-        return result
+
+    async def async_get_events_for_date(
+        self, subject_name: str, date_str: str
+    ) -> list[EventRecord]:
+        """Get events for a date, from the backend if it lies before the loaded window.
+
+        Subjects without a set-up entry are loaded for the lookup only.
+        """
+        if self._backend.complete or f"{date_str}T" >= self._backend.hot_since:
+            if subject_name in self._by_subject:
+                return self.get_events_for_date(subject_name, date_str)
+            await self._async_ensure_loaded(subject_name)
+            events = self.get_events_for_date(subject_name, date_str)
+            await self._async_release_unheld({subject_name})
+            return events
+        return await self.async_query_events([subject_name], f"{date_str}T", f"{date_str}U")
 
     @callback
     def get_today_events(
         self, subject_name: str, event_type: str | None = None
-    ) -> list[dict[str, Any]]:
+    ) -> list[EventRecord]:
         """Get today's events for a subject."""
         today = datetime.now().strftime("%Y-%m-%d")
         return self.get_events_for_date(subject_name, today, event_type)
@@ -161,12 +764,14 @@ class GlucoFarmerStore:
         subject_name: str,
         hours: int = 24,
         event_type: str | None = None,
-    ) -> list[dict[str, Any]]:
+    ) -> list[EventRecord]:
         """Get events for a subject from the last N hours (rolling window)."""
         cutoff = datetime.now() - timedelta(hours=hours)
         return self.get_events_for_subject(subject_name, event_type=event_type, since=cutoff)
 
     @callback
     def get_all_events(self) -> list[dict[str, Any]]:
-        """Get all events."""
-        return list(self._events)
+        """Get all loaded events (as dicts, e.g. for diagnostics or export)."""
+        return [
+            e.to_dict() for events in self._by_subject.values() for e in events
+        ]
@@ -0,0 +1,418 @@
+"""SQLite event backend for GlucoFarmer.
+
+Intended for large herds with years of history, where rewriting one JSON
+blob on every mutation (and holding it all in memory) no longer scales.
+Only the last _HOT_DAYS days are loaded into memory; older ranges are
+queried on demand. All database work runs in the executor. Changed rows
+are buffered and upserted in one transaction after the save delay.
+
+Switching backends copies the events over on the next start: the JSON
+manifest records which backend holds the current events, and the newly
+active backend replaces its copy with that backend's events.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+import sqlite3
+import sys
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, STORAGE_BACKEND_JSON, STORAGE_BACKEND_SQLITE
+from .store import EventBackend, EventRecord, JsonEventBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+_DB_FILE = f"{DOMAIN}_events.db"
+
+# Days of history kept in memory for the synchronous getters (today, yesterday)
+_HOT_DAYS = 7
+
+# Retry delay (seconds) after a failed flush; buffered rows are kept
+_FLUSH_RETRY = 30.0
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS events (
+        id BLOB PRIMARY KEY,
+        type TEXT NOT NULL,
+        subject_name TEXT NOT NULL,
+        amount REAL NOT NULL,
+        ts TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        product TEXT,
+        category TEXT,
+        description TEXT,
+        note TEXT,
+        archived INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_events_subject_ts ON events (subject_name, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_events_type_ts ON events (type, ts)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+# Statements are constant strings with parameters so sqlite3's statement
+# cache keeps them prepared for the lifetime of the connection.
+_COLUMNS = (
+    "id, type, subject_name, amount, ts, created_at, "
+    "product, category, description, note, archived"
+)
+_SQL_UPSERT = f"INSERT OR REPLACE INTO events ({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?,?)"
+_SQL_SELECT_SUBJECT_SINCE = (
+    f"SELECT {_COLUMNS} FROM events WHERE subject_name = ? AND ts >= ? ORDER BY ts"
+)
+_SQL_SELECT_LIVE_ID = f"SELECT {_COLUMNS} FROM events WHERE id = ? AND archived = 0"
+_SQL_ARCHIVE = "UPDATE events SET archived = 1 WHERE id = ? AND archived = 0"
+# Range queries end in the optional category/product filters (NULL matches
+# all), the (ts, id) keyset cursor of query_events and a LIMIT (-1 for none)
+_SQL_RANGE_TAIL = (
+    " AND archived = 0 AND (? IS NULL OR category = ?) AND (? IS NULL OR product = ?)"
+    " AND (ts > ? OR (ts = ? AND id > ?)) ORDER BY ts, id LIMIT ?"
+)
+_SQL_RANGE_ALL = (
+    f"SELECT {_COLUMNS} FROM events WHERE ts >= ? AND ts < ?{_SQL_RANGE_TAIL}"
+)
+_SQL_RANGE_SUBJECT = (
+    f"SELECT {_COLUMNS} FROM events "
+    f"WHERE subject_name = ? AND ts >= ? AND ts < ?{_SQL_RANGE_TAIL}"
+)
+_SQL_RANGE_TYPE = (
+    f"SELECT {_COLUMNS} FROM events "
+    f"WHERE type = ? AND ts >= ? AND ts < ?{_SQL_RANGE_TAIL}"
+)
+_SQL_RANGE_SUBJECT_TYPE = (
+    f"SELECT {_COLUMNS} FROM events "
+    f"WHERE subject_name = ? AND ts >= ? AND ts < ? AND type = ?{_SQL_RANGE_TAIL}"
+)
+_SQL_EXPIRED_ARCHIVED = f"SELECT {_COLUMNS} FROM events WHERE archived = 1 AND ts < ?"
+_SQL_EXPIRED_LIVE = f"SELECT {_COLUMNS} FROM events WHERE archived = 0 AND ts < ?"
+_SQL_SELECT_ALL = f"SELECT {_COLUMNS} FROM events"
+_SQL_DELETE = "DELETE FROM events WHERE id = ?"
+_SQL_DELETE_ALL = "DELETE FROM events"
+_SQL_GET_META = "SELECT value FROM meta WHERE key = ?"
+_SQL_SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+_META_MIGRATED = "migrated_from_json"
+
+
+def _to_row(event: EventRecord) -> tuple[Any, ...]:
+    return (
+        event.id.to_bytes(16, "big"),
+        event.type,
+        event.subject_name,
+        event.amount,
+        event.timestamp,
+        event.created_at,
+        event.product,
+        event.category,
+        event.description,
+        event.note,
+        int(event.archived),
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> EventRecord:
+    return EventRecord(
+        id=int.from_bytes(row[0], "big"),
+        type=sys.intern(row[1]),
+        subject_name=sys.intern(row[2]),
+        amount=row[3],
+        timestamp=row[4],
+        created_at=row[5],
+        product=sys.intern(row[6]) if row[6] is not None else None,
+        category=sys.intern(row[7]) if row[7] is not None else None,
+        description=row[8],
+        note=row[9],
+        archived=bool(row[10]),
+    )
+
+
+class SqliteEventBackend(EventBackend):
+    """Event backend on a local SQLite file (WAL mode, indexed by subject/type + ts)."""
+
+    complete = False
+
+    def __init__(self, hass: HomeAssistant, save_delay: float = 0) -> None:
+        """Initialize the backend."""
+        self._hass = hass
+        self._path = hass.config.path(STORAGE_DIR, _DB_FILE)
+        self._conn: sqlite3.Connection | None = None
+        # One connection shared by executor threads -- serialize access
+        self._lock = threading.Lock()
+        self._save_delay = save_delay
+        # Write-behind buffer: rows changed since the last flush, by event id
+        self._pending: dict[int, EventRecord] = {}
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_final_write: CALLBACK_TYPE | None = None
+
+    def _open(self) -> bool:
+        """Open the database and create the schema. Returns True if migrated."""
+        conn = sqlite3.connect(
+            self._path, check_same_thread=False, cached_statements=64
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        self._conn = conn
+        return conn.execute(_SQL_GET_META, (_META_MIGRATED,)).fetchone() is not None
+
+    def _replace_all(self, events: list[EventRecord]) -> None:
+        """Replace the table with the JSON store's events in one transaction."""
+        assert self._conn is not None
+        with self._lock, self._conn:
+            self._conn.execute(_SQL_DELETE_ALL)
+            self._conn.executemany(_SQL_UPSERT, [_to_row(e) for e in events])
+            self._conn.execute(
+                _SQL_SET_META, (_META_MIGRATED, datetime.now().isoformat())
+            )
+
+    def _select_all(self) -> list[EventRecord]:
+        assert self._conn is not None
+        with self._lock:
+            rows = self._conn.execute(_SQL_SELECT_ALL).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def _select_since(self, subject_name: str, since: str) -> list[EventRecord]:
+        assert self._conn is not None
+        with self._lock:
+            rows = self._conn.execute(
+                _SQL_SELECT_SUBJECT_SINCE, (subject_name, since)
+            ).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def _upsert(self, events: list[EventRecord]) -> None:
+        assert self._conn is not None
+        with self._lock, self._conn:
+            self._conn.executemany(_SQL_UPSERT, [_to_row(e) for e in events])
+
+    def _archive(self, event_id: int) -> EventRecord | None:
+        assert self._conn is not None
+        key = event_id.to_bytes(16, "big")
+        with self._lock, self._conn:
+            row = self._conn.execute(_SQL_SELECT_LIVE_ID, (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(_SQL_ARCHIVE, (key,))
+        event = _from_row(row)
+        event.archived = True
+        return event
+
+    def _query(
+        self,
+        subject_name: str | None,
+        start: str,
+        end: str,
+        event_type: str | None,
+        category: str | None,
+        product: str | None,
+        after: tuple[str, int] | None,
+        limit: int | None,
+    ) -> list[EventRecord]:
+        assert self._conn is not None
+        if after is None:
+            after_ts, after_id = "", b""
+        else:
+            # The cursor also narrows the index range
+            after_ts, after_id = after[0], after[1].to_bytes(16, "big")
+            start = max(start, after_ts)
+        tail = (
+            category, category, product, product,
+            after_ts, after_ts, after_id, limit if limit is not None else -1,
+        )
+        if subject_name is not None and event_type is not None:
+            sql, params = _SQL_RANGE_SUBJECT_TYPE, (subject_name, start, end, event_type)
+        elif subject_name is not None:
+            sql, params = _SQL_RANGE_SUBJECT, (subject_name, start, end)
+        elif event_type is not None:
+            sql, params = _SQL_RANGE_TYPE, (event_type, start, end)
+        else:
+            sql, params = _SQL_RANGE_ALL, (start, end)
+        with self._lock:
+            rows = self._conn.execute(sql, params + tail).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def _expired(
+        self, purge_before: str | None, summarize_before: str | None
+    ) -> list[EventRecord]:
+        assert self._conn is not None
+        rows: list[tuple[Any, ...]] = []
+        with self._lock:
+            if purge_before is not None:
+                rows += self._conn.execute(_SQL_EXPIRED_ARCHIVED, (purge_before,)).fetchall()
+            if summarize_before is not None:
+                rows += self._conn.execute(_SQL_EXPIRED_LIVE, (summarize_before,)).fetchall()
+        return [_from_row(r) for r in rows]
+
+    def _delete(self, events: list[EventRecord]) -> None:
+        assert self._conn is not None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                _SQL_DELETE, [(e.id.to_bytes(16, "big"),) for e in events]
+            )
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def async_load(self) -> None:
+        """Open the database; take the events over from JSON if it was active.
+
+        Databases from before the manifest recorded the active backend count
+        as current once migrated.
+        """
+        migrated = await self._hass.async_add_executor_job(self._open)
+        json_backend = JsonEventBackend(self._hass, lambda _subject: [])
+        await json_backend.async_read_manifest()
+        if json_backend.synced_backend == STORAGE_BACKEND_JSON or (
+            json_backend.synced_backend is None and not migrated
+        ):
+            await json_backend.async_load()
+            events = await json_backend.async_load_all()
+            await self._hass.async_add_executor_job(self._replace_all, events)
+            _LOGGER.info(
+                "Migrated %d events from JSON store to %s", len(events), self._path
+            )
+        if json_backend.synced_backend != STORAGE_BACKEND_SQLITE:
+            await json_backend.async_mark_synced(STORAGE_BACKEND_SQLITE)
+
+        self.hot_since = (datetime.now() - timedelta(days=_HOT_DAYS)).isoformat()
+        self._unsub_final_write = self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    async def async_read_all(self) -> list[EventRecord]:
+        """Return every row without loading the backend (switching back to JSON)."""
+        await self._hass.async_add_executor_job(self._open)
+        try:
+            return await self._hass.async_add_executor_job(self._select_all)
+        finally:
+            await self._hass.async_add_executor_job(self._close)
+
+    async def async_load_subject(self, subject_name: str) -> list[EventRecord]:
+        """Load the hot window of one subject (buffered rows included)."""
+        await self._async_flush()
+        events = await self._hass.async_add_executor_job(
+            self._select_since, subject_name, self.hot_since
+        )
+        # Rows still buffered because the flush failed
+        pending = [
+            e for e in self._pending.values()
+            if e.subject_name == subject_name and e.timestamp >= self.hot_since
+        ]
+        if not pending:
+            return events
+        merged = {e.id: e for e in events}
+        merged.update((e.id, e) for e in pending)
+        return sorted(merged.values(), key=lambda e: e.timestamp)
+
+    async def async_release_subject(self, subject_name: str) -> None:
+        """Flush buffered rows so a reload of the entry reads them back."""
+        await self._async_flush()
+
+    async def async_save(self, changed: list[EventRecord]) -> None:
+        """Buffer the changed rows; flush now or after the save delay."""
+        for event in changed:
+            self._pending[event.id] = event
+        if self._save_delay <= 0:
+            await self._async_flush()
+        elif self._pending:
+            self._schedule_flush(self._save_delay)
+
+    @callback
+    def _schedule_flush(self, delay: float) -> None:
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, delay, self._scheduled_flush
+            )
+
+    @callback
+    def _scheduled_flush(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        self._hass.async_create_task(self._async_flush())
+
+    async def _async_flush(self) -> None:
+        """Upsert all buffered rows in one transaction."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if not self._pending:
+            return
+        changed = list(self._pending.values())
+        self._pending.clear()
+        try:
+            await self._hass.async_add_executor_job(self._upsert, changed)
+        except (sqlite3.Error, OSError) as err:
+            # Keep the rows (newer versions buffered meanwhile win) and retry
+            for event in changed:
+                self._pending.setdefault(event.id, event)
+            self._schedule_flush(max(self._save_delay, _FLUSH_RETRY))
+            _LOGGER.warning(
+                "Saving %d event(s) to %s failed (%s); retrying in the background",
+                len(changed), self._path, err,
+            )
+
+    async def _async_final_write(self, _event: Event) -> None:
+        self._unsub_final_write = None
+        await self._async_flush()
+
+    async def async_archive(self, event_id: int) -> EventRecord | None:
+        """Soft-delete an event outside the in-memory window; return it if found."""
+        await self._async_flush()
+        return await self._hass.async_add_executor_job(self._archive, event_id)
+
+    async def async_expired(
+        self, purge_before: str | None, summarize_before: str | None
+    ) -> list[EventRecord]:
+        """Retention candidates from the whole table (buffered rows flushed first)."""
+        await self._async_flush()
+        return await self._hass.async_add_executor_job(
+            self._expired, purge_before, summarize_before
+        )
+
+    async def async_remove(self, events: list[EventRecord]) -> None:
+        """Delete rows in one transaction."""
+        await self._async_flush()
+        await self._hass.async_add_executor_job(self._delete, events)
+
+    async def async_query(
+        self,
+        subject_name: str | None,
+        start: str,
+        end: str,
+        event_type: str | None = None,
+        category: str | None = None,
+        product: str | None = None,
+        after: tuple[str, int] | None = None,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """Indexed range query (buffered rows are flushed first)."""
+        await self._async_flush()
+        return await self._hass.async_add_executor_job(
+            self._query, subject_name, start, end, event_type,
+            category, product, after, limit,
+        )
+
+    async def async_close(self) -> None:
+        """Flush buffered rows and close the connection."""
+        if self._unsub_final_write is not None:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+        await self._async_flush()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+            _LOGGER.error(
+                "Closing %s with %d unsaved event(s)", self._path, len(self._pending)
+            )
+        await self._hass.async_add_executor_job(self._close)
+
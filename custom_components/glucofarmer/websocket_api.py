@@ -0,0 +1,288 @@
+"""WebSocket API for GlucoFarmer.
+
+glucofarmer/subscribe pushes one snapshot per subject and afterwards only
+the fields that changed, as the coordinators update. glucofarmer/history
+returns a subject's glucose readings as compact columns. Custom cards and
+external tools can stream subject data this way instead of following
+dozens of sensor entities per subject.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.history import state_changes_during_period
+from homeassistant.config_entries import (
+    SIGNAL_CONFIG_ENTRY_CHANGED,
+    ConfigEntry,
+    ConfigEntryChange,
+    ConfigEntryState,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN, HISTORY_MAX_DAYS
+from .coordinator import GlucoFarmerCoordinator
+from .downsample import downsample
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the GlucoFarmer WebSocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_history)
+
+
+def _coordinators(hass: HomeAssistant) -> dict[str, GlucoFarmerCoordinator]:
+    """Return the running coordinators by subject name."""
+    result: dict[str, GlucoFarmerCoordinator] = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        coordinator: GlucoFarmerCoordinator | None = getattr(entry, "runtime_data", None)
+        if coordinator is not None:
+            result[coordinator.subject_name] = coordinator
+    return result
+
+
+def _snapshot(coordinator: GlucoFarmerCoordinator) -> dict[str, Any]:
+    """Return the streamed fields of a subject."""
+    data = coordinator.data
+    if data is None:
+        return {}
+    return {
+        "glucose": data.glucose_value,
+        "trend": data.glucose_trend,
+        "status": data.glucose_status,
+        "last_reading": (
+            data.last_reading_time.isoformat() if data.last_reading_time else None
+        ),
+        "link": data.link_status,
+        "zones_pct": [
+            data.time_critical_low_pct, data.time_very_low_pct, data.time_low_pct,
+            data.time_in_range_pct, data.time_high_pct, data.time_very_high_pct,
+        ],
+        "coverage_today": (
+            round(data.covered_minutes_today / data.total_minutes_today * 100, 1)
+            if data.total_minutes_today else 0.0
+        ),
+        "insulin_today": data.daily_insulin_total,
+        "bes_today": data.daily_bes_total,
+        "alarms": coordinator.active_alarms(),
+        "zone_minutes": [round(m, 1) for m in coordinator.today_zone_minutes()],
+    }
+
+
+def _delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Return the changed fields of current versus previous.
+
+    Today's zone minutes only grow, so they are sent as zone_minutes_delta;
+    after midnight (or a threshold change) they are sent in full again.
+    """
+    changes = {
+        key: value
+        for key, value in current.items()
+        if key != "zone_minutes" and previous.get(key) != value
+    }
+    old = previous.get("zone_minutes")
+    new = current.get("zone_minutes")
+    if new is not None and new != old:
+        increments = (
+            [round(n - o, 1) for n, o in zip(new, old)] if old is not None else None
+        )
+        if increments is None or min(increments) < 0:
+            changes["zone_minutes"] = new
+        elif any(increments):
+            changes["zone_minutes_delta"] = increments
+    return changes
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "glucofarmer/subscribe",
+        vol.Optional("subjects"): [str],
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream subject snapshots, then deltas as the coordinators update.
+
+    Event messages are {"subject", "snapshot": {...}} once per subject and
+    then {"subject", "delta": {...}} with only the changed fields. An
+    unloaded subject sends {"subject", "removed": true}; a subject set up
+    later (or reloaded, e.g. after an options change) sends a fresh snapshot
+    from its new coordinator.
+    """
+    coordinators = _coordinators(hass)
+    wanted = msg.get("subjects")
+    if wanted is not None:
+        if unknown := sorted(set(wanted) - set(coordinators)):
+            connection.send_error(
+                msg["id"], websocket_api.ERR_NOT_FOUND,
+                f"Unknown subjects: {', '.join(unknown)}",
+            )
+            return
+        coordinators = {name: coordinators[name] for name in wanted}
+
+    last_sent: dict[str, dict[str, Any]] = {}
+    # Coordinator followed per config entry and its listener removal
+    attached: dict[str, tuple[GlucoFarmerCoordinator, CALLBACK_TYPE]] = {}
+
+    def _listener(coordinator: GlucoFarmerCoordinator) -> CALLBACK_TYPE:
+        @callback
+        def _updated() -> None:
+            current = _snapshot(coordinator)
+            changes = _delta(last_sent.get(coordinator.subject_name, {}), current)
+            if not changes:
+                return
+            last_sent[coordinator.subject_name] = current
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"subject": coordinator.subject_name, "delta": changes}
+                )
+            )
+
+        return _updated
+
+    @callback
+    def _attach(coordinator: GlucoFarmerCoordinator) -> None:
+        name = coordinator.subject_name
+        snapshot = last_sent[name] = _snapshot(coordinator)
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"subject": name, "snapshot": snapshot})
+        )
+        attached[coordinator.config_entry.entry_id] = (
+            coordinator, coordinator.async_add_listener(_listener(coordinator))
+        )
+
+    @callback
+    def _entry_changed(change: ConfigEntryChange, entry: ConfigEntry) -> None:
+        if entry.domain != DOMAIN:
+            return
+        coordinator: GlucoFarmerCoordinator | None = getattr(entry, "runtime_data", None)
+        loaded = (
+            change is not ConfigEntryChange.REMOVED
+            and entry.state is ConfigEntryState.LOADED
+            and coordinator is not None
+        )
+        current = attached.get(entry.entry_id)
+        if current is not None:
+            if loaded and current[0] is coordinator:
+                return  # e.g. an options update before the reload
+            del attached[entry.entry_id]
+            current[1]()
+            if not loaded:
+                last_sent.pop(current[0].subject_name, None)
+                connection.send_message(
+                    websocket_api.event_message(
+                        msg["id"], {"subject": current[0].subject_name, "removed": True}
+                    )
+                )
+        if loaded and (wanted is None or coordinator.subject_name in wanted):
+            _attach(coordinator)
+
+    unsub_entries = async_dispatcher_connect(
+        hass, SIGNAL_CONFIG_ENTRY_CHANGED, _entry_changed
+    )
+
+    @callback
+    def _unsubscribe() -> None:
+        unsub_entries()
+        for _coordinator, unsub in attached.values():
+            unsub()
+        attached.clear()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+
+    for coordinator in coordinators.values():
+        _attach(coordinator)
+
+
+def _fetch_readings(
+    hass: HomeAssistant, entity_id: str, start: datetime, end: datetime
+) -> list[tuple[int, float]]:
+    """Return the numeric readings of a sensor as (ms, value) (recorder executor)."""
+    states = state_changes_during_period(
+        hass, start, end, entity_id, include_start_time_state=False
+    ).get(entity_id, [])
+    points: list[tuple[int, float]] = []
+    for state in states:
+        try:
+            value = float(state.state)
+        except (ValueError, TypeError):
+            continue
+        points.append((int(state.last_changed.timestamp() * 1000), value))
+    return points
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "glucofarmer/history",
+        vol.Required("subject"): str,
+        vol.Required("start"): str,
+        vol.Optional("end"): str,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=10, max=10000)),
+    }
+)
+@websocket_api.async_response
+async def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return glucose readings as {"subject", "t": [ms, ...], "v": [mg/dL, ...]}.
+
+    With max_points the series is downsampled (LTTB, zone boundary
+    crossings kept).
+    """
+    coordinator = _coordinators(hass).get(msg["subject"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown subject: {msg['subject']}"
+        )
+        return
+    start = dt_util.parse_datetime(msg["start"])
+    end = dt_util.parse_datetime(msg["end"]) if "end" in msg else dt_util.utcnow()
+    if start is None or end is None:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid start or end")
+        return
+    start, end = dt_util.as_utc(start), dt_util.as_utc(end)
+    if end <= start or end - start > timedelta(days=HISTORY_MAX_DAYS):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_INVALID_FORMAT,
+            f"end must be after start and at most {HISTORY_MAX_DAYS} days later",
+        )
+        return
+
+    points = await get_instance(hass).async_add_executor_job(
+        _fetch_readings, hass, coordinator.glucose_sensor_id, start, end
+    )
+    if "max_points" in msg:
+        points = downsample(
+            points,
+            msg["max_points"],
+            (
+                coordinator.critical_low_threshold,
+                coordinator.very_low_threshold,
+                coordinator.low_threshold,
+                coordinator.high_threshold,
+                coordinator.very_high_threshold,
+            ),
+        )
+    connection.send_result(
+        msg["id"],
+        {
+            "subject": msg["subject"],
+            "t": [ts for ts, _ in points],
+            "v": [value for _, value in points],
+        },
+    )
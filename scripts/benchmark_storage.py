@@ -0,0 +1,148 @@
+"""Compare the JSON and SQLite event backends on a synthetic herd.
+
+Run from the repository root in a Home Assistant development environment:
+
+    python -m scripts.benchmark_storage [--events 200000] [--subjects 200]
+
+The SQLite side uses the schema, statements and row mapping of
+store_sqlite.py. The JSON side writes like HA's Store (json.dumps, then an
+atomic os.replace), once for the whole herd in one file and once for a
+single per-subject shard. Measured: saving one new event, a one-month range
+query for one subject, the on-disk size and the JSON to SQLite migration.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import json
+import os
+from pathlib import Path
+import random
+import sqlite3
+import tempfile
+import time
+
+from custom_components.glucofarmer.const import EVENT_TYPE_FEEDING, EVENT_TYPE_INSULIN
+from custom_components.glucofarmer.store import EventRecord
+from custom_components.glucofarmer.store_sqlite import (
+    _SCHEMA,
+    _SQL_RANGE_SUBJECT,
+    _SQL_UPSERT,
+    _to_row,
+)
+
+_START = datetime(2022, 1, 1)
+
+
+def _make_events(count: int, subjects: int) -> list[EventRecord]:
+    """Spread count events evenly over subjects and about three years."""
+    rng = random.Random(42)
+    span = 3 * 365 * 24 * 3600
+    events: list[EventRecord] = []
+    for i in range(count):
+        timestamp = (_START + timedelta(seconds=rng.randrange(span))).isoformat()
+        subject = f"Subject-{i % subjects:03d}"
+        if rng.random() < 0.5:
+            events.append(EventRecord.create(
+                EVENT_TYPE_INSULIN, subject, round(rng.uniform(1, 10), 1),
+                timestamp, product="short-acting",
+            ))
+        else:
+            events.append(EventRecord.create(
+                EVENT_TYPE_FEEDING, subject, round(rng.uniform(1, 5), 1),
+                timestamp, category="breakfast",
+            ))
+    return events
+
+
+def _write_json(path: Path, events: list[EventRecord]) -> None:
+    """Write like Store.async_save: serialize, write a temp file, replace."""
+    data = json.dumps({"version": 1, "data": {"events": [e.to_dict() for e in events]}})
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(data, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _timed(label: str, func: Callable[[], None], repeat: int = 5) -> None:
+    """Print the best of repeat runs in milliseconds."""
+    best = min(_run(func) for _ in range(repeat))
+    print(f"{label:<46} {best * 1000:10.2f} ms")
+
+
+def _run(func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print one line per measurement."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--subjects", type=int, default=200)
+    args = parser.parse_args()
+
+    events = _make_events(args.events, args.subjects)
+    subject = events[0].subject_name
+    shard = sorted(
+        (e for e in events if e.subject_name == subject), key=lambda e: e.timestamp
+    )
+    month_start, month_end = "2023-06-01T00:00:00", "2023-07-01T00:00:00"
+    print(f"{len(events)} events, {args.subjects} subjects ({len(shard)} per shard)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        herd_file = Path(tmp, "glucofarmer_events")
+        shard_file = Path(tmp, "glucofarmer_events.subject")
+        db_file = Path(tmp, "glucofarmer_events.db")
+
+        conn = sqlite3.connect(db_file, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+        def migrate() -> None:
+            with conn:
+                conn.execute("DELETE FROM events")
+                conn.executemany(_SQL_UPSERT, [_to_row(e) for e in events])
+
+        _timed("migrate all rows to SQLite", migrate, repeat=1)
+        _write_json(herd_file, events)
+        _write_json(shard_file, shard)
+
+        new_event = EventRecord.create(EVENT_TYPE_FEEDING, subject, 2.0, category="reward")
+
+        def save_sqlite() -> None:
+            with conn:
+                conn.executemany(_SQL_UPSERT, [_to_row(new_event)])
+
+        _timed("save one event: JSON, whole herd in one file", lambda: _write_json(herd_file, events))
+        _timed("save one event: JSON, per-subject shard", lambda: _write_json(shard_file, shard))
+        _timed("save one event: SQLite upsert", save_sqlite)
+
+        def query_sqlite() -> None:
+            conn.execute(
+                _SQL_RANGE_SUBJECT,
+                (subject, month_start, month_end, None, None, None, None, "", "", b"", -1),
+            ).fetchall()
+
+        def scan_memory() -> None:
+            [
+                e for e in events
+                if e.subject_name == subject and month_start <= e.timestamp < month_end
+            ]
+
+        _timed("1-month range, one subject: SQLite", query_sqlite)
+        _timed("1-month range, one subject: in-memory scan", scan_memory)
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+        for label, path in (("JSON herd file", herd_file), ("SQLite database", db_file)):
+            print(f"{'size: ' + label:<46} {path.stat().st_size / 1e6:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()